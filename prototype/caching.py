@@ -0,0 +1,134 @@
+"""
+Caching Utilities
+
+Thread-safe in-memory LRU cache with optional time-to-live and hit-rate
+statistics, plus input fingerprinting used to key reasoning results so that
+questions differing only in whitespace share an entry. Case is kept: the
+extractor reads capitalization (event names, "Task A" vs "task a"), so
+questions differing in case may get different answers.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+import hashlib
+import re
+import threading
+import time
+
+
+_MISSING = object()
+
+
+def normalize_question(text: str) -> str:
+    """Canonical form of a question: whitespace collapsed, case kept"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def fingerprint(text: str) -> str:
+    """SHA-256 fingerprint of a normalized question"""
+    return hashlib.sha256(normalize_question(text).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with optional TTL.
+
+    Entries beyond `max_entries` evict the least recently used entry;
+    entries older than `ttl_seconds` are dropped when next looked up.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Capacity before least-recently-used eviction
+            ttl_seconds: Entry lifetime (None = no expiry)
+            clock: Time source, in seconds
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up `key`, refreshing its recency; counts a hit or a miss"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and self._expired(entry[0]):
+                del self._entries[key]
+                self.expirations += 1
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or replace `key`, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove `key`; returns whether it was present"""
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and self.clock() - stored_at > self.ttl_seconds
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Presence check without touching recency or statistics"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            return entry is not _MISSING and not self._expired(entry[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("LRU Cache - Example")
+    print("=" * 80)
+
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.put(fingerprint("How long was the stay?"), "4 days")
+    cache.put(fingerprint("What is the order?"), "A before B")
+    print(f"\nEquivalent spelling hit: {cache.get(fingerprint('  How long was the   stay? '))}")
+    cache.put(fingerprint("Did they overlap?"), "yes")  # evicts "What is the order?"
+    print(f"Evicted entry: {cache.get(fingerprint('What is the order?'))}")
+    print(f"Stats: {cache.stats()}")
+
+    print("\n" + "=" * 80)
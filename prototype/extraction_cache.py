@@ -0,0 +1,286 @@
+"""
+Persistent Extraction Cache
+
+Two-tier, content-addressed cache of LLMResponse objects, so an identical
+(text, level, backend version) input is extracted by the LLM only once:
+- tier 1: in-memory LRU (caching.LRUCache) of decoded responses
+- tier 2: SQLite table of zlib-compressed compact JSON (LLMResponse.to_dict),
+  shared across processes and runs
+
+Keys are SHA-256 hashes of the whitespace-normalized text, the extraction
+level and the backend version (case is preserved: a real model may answer
+differently cased input differently). CachedLLMBackend puts the cache in
+front of any LLMBackend and keys by that backend's own backend_version, so
+different backends can share one cache file without seeing each other's
+answers; the cache's `backend_version` is only the fallback for backends
+that report none. Entries expire after `ttl_seconds`; a new backend version
+makes older entries unreachable and invalidate_versions() deletes them.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from caching import LRUCache
+from llm_interface import ExtractionLevel, LLMBackend, LLMResponse, backend_version_of
+
+
+def extraction_key(text: str, level: ExtractionLevel, backend_version: str) -> str:
+    """Content address of one extraction request"""
+    normalized = re.sub(r"\s+", " ", text).strip()
+    material = f"{backend_version}\x00{level.value}\x00{normalized}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def encode_response(response: LLMResponse) -> bytes:
+    """Compact serialization: zlib-compressed JSON without whitespace"""
+    return zlib.compress(json.dumps(response.to_dict(), separators=(",", ":")).encode("utf-8"))
+
+
+def decode_response(blob: bytes) -> LLMResponse:
+    return LLMResponse.from_dict(json.loads(zlib.decompress(blob)))
+
+
+class ExtractionCache:
+    """Two-tier (memory + SQLite) LLMResponse cache"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS extractions (
+            key TEXT PRIMARY KEY,
+            backend_version TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            value BLOB NOT NULL
+        )
+    """
+
+    def __init__(self, path: Optional[str] = None, backend_version: str = "default",
+                 memory_entries: int = 4096, ttl_seconds: Optional[float] = None):
+        """
+        Initialize cache.
+
+        Args:
+            path: SQLite database file for the persistent tier (None = memory only)
+            backend_version: Version used in keys when get()/put() are not
+                given one (e.g. for a backend without a backend_version)
+            memory_entries: Capacity of the in-memory tier
+            ttl_seconds: Entry lifetime in both tiers (None = no expiry)
+        """
+        self.path = path
+        self.backend_version = backend_version
+        self.ttl_seconds = ttl_seconds
+        self.memory = LRUCache(max_entries=memory_entries, ttl_seconds=ttl_seconds)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        if path is not None:
+            with self._db() as db:
+                db.execute(self._SCHEMA)
+
+    def key(self, text: str, level: ExtractionLevel, backend_version: Optional[str] = None) -> str:
+        return extraction_key(text, level, backend_version or self.backend_version)
+
+    def get(self, text: str, level: ExtractionLevel,
+            backend_version: Optional[str] = None) -> Optional[LLMResponse]:
+        """Cached response for (text, level) from `backend_version` (default: the cache's), or None"""
+        key = self.key(text, level, backend_version)
+        response = self.memory.get(key)
+        if response is not None:
+            self._count("memory_hits")
+            return response
+
+        if self.path is not None:
+            row = self._db().execute(
+                "SELECT created_at, value FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not self._expired(row[0]):
+                response = decode_response(row[1])
+                self.memory.put(key, response)
+                self._count("disk_hits")
+                return response
+
+        self._count("misses")
+        return None
+
+    def put(self, text: str, level: ExtractionLevel, response: LLMResponse,
+            backend_version: Optional[str] = None):
+        """Store a response of `backend_version` (default: the cache's) in both tiers"""
+        backend_version = backend_version or self.backend_version
+        key = self.key(text, level, backend_version)
+        self.memory.put(key, response)
+        if self.path is not None:
+            with self._db() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO extractions (key, backend_version, created_at, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, backend_version, time.time(), encode_response(response))
+                )
+        self._count("writes")
+
+    def invalidate_versions(self, keep: Optional[Sequence[str]] = None) -> int:
+        """
+        Delete persisted entries of all but the current backend versions.
+
+        Args:
+            keep: Versions whose entries stay (default: the cache's backend_version)
+
+        Returns:
+            Number of rows removed
+        """
+        if self.path is None:
+            return 0
+        keep = list(keep) if keep is not None else [self.backend_version]
+        with self._db() as db:
+            cursor = db.execute(
+                f"DELETE FROM extractions WHERE backend_version NOT IN ({', '.join('?' * len(keep))})", keep
+            )
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete persisted entries older than the TTL; returns rows removed"""
+        if self.path is None or self.ttl_seconds is None:
+            return 0
+        with self._db() as db:
+            cursor = db.execute("DELETE FROM extractions WHERE created_at < ?",
+                                (time.time() - self.ttl_seconds,))
+        return cursor.rowcount
+
+    def clear(self):
+        self.memory.clear()
+        if self.path is not None:
+            with self._db() as db:
+                db.execute("DELETE FROM extractions")
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            stats = {
+                "lookups": lookups,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory)
+            }
+        if self.path is not None:
+            stats["disk_entries"] = self._db().execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return stats
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _db(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shared across threads)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+
+class CachedLLMBackend:
+    """LLMBackend that answers from an ExtractionCache before asking `backend`"""
+
+    def __init__(self, backend: LLMBackend, cache: ExtractionCache):
+        self.backend = backend
+        self.cache = cache
+
+    @property
+    def backend_version(self) -> str:
+        """The wrapped backend's identity; the cache's backend_version if it has none"""
+        return backend_version_of(self.backend) or self.cache.backend_version
+
+    def extract_temporal_info(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        version = self.backend_version
+        response = self.cache.get(text, level, version)
+        if response is None:
+            response = self.backend.extract_temporal_info(text, level)
+            self.cache.put(text, level, response, version)
+        return response
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        """Only cache misses (deduplicated) are sent to the backend, as one batch"""
+        version = self.backend_version
+        results: List[Optional[LLMResponse]] = [self.cache.get(text, level, version) for text in texts]
+        missing: Dict[str, List[int]] = {}
+        for i, (text, response) in enumerate(zip(texts, results)):
+            if response is None:
+                missing.setdefault(text, []).append(i)
+        if missing:
+            for text, response in zip(missing, self.backend.extract_batch(list(missing), level)):
+                self.cache.put(text, level, response, version)
+                for i in missing[text]:
+                    results[i] = response
+        return results
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        version = self.backend_version
+        response = self.cache.get(text, level, version)
+        if response is None:
+            response = await self.backend.aextract(text, level)
+            self.cache.put(text, level, response, version)
+        return response
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from llm_interface import MockLLM
+
+    print("=" * 80)
+    print("Persistent Extraction Cache - Example")
+    print("=" * 80)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="extraction_cache_"), "extractions.sqlite")
+    text = "The patient was admitted, received medication treatment and was discharged. What is the order of events?"
+
+    # First run: miss, extracted and persisted
+    cache = ExtractionCache(path)
+    backend = CachedLLMBackend(MockLLM(seed=0), cache)
+    backend.extract_temporal_info(text, ExtractionLevel.LEVEL_2_ORDERING)
+    backend.extract_temporal_info("  " + text.replace(" ", "   "), ExtractionLevel.LEVEL_2_ORDERING)
+    print(f"\nFirst run: {cache.stats()}")
+    cache.close()
+
+    # Second run (e.g. another process): served from disk
+    cache = ExtractionCache(path)
+    response = CachedLLMBackend(MockLLM(seed=0), cache).extract_temporal_info(text, ExtractionLevel.LEVEL_2_ORDERING)
+    print(f"Second run: {cache.stats()}")
+    print(f"Answer: {response.raw_answer}")
+    cache.close()
+
+    # A different backend sharing the file never sees those answers...
+    cache = ExtractionCache(path)
+    backend = CachedLLMBackend(MockLLM(seed=1), cache)
+    backend.extract_temporal_info(text, ExtractionLevel.LEVEL_2_ORDERING)
+    print(f"Other backend: {cache.stats()}")
+    # ...and once it replaces the old one, the old entries can be dropped
+    print(f"Invalidated {cache.invalidate_versions(keep=[backend.backend_version])} entries of other versions")
+    cache.close()
+
+    print("\n" + "=" * 80)
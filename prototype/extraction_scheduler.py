@@ -0,0 +1,271 @@
+"""
+Micro-Batching Extraction Scheduler
+
+Sits in front of an LLMBackend and turns many concurrent single-text
+extraction calls into a few batched extract_batch() calls:
+- requests are queued per extraction level and dispatched as a micro-batch
+  once `max_batch_size` texts are waiting or the oldest has waited
+  `max_wait_ms`, whichever comes first
+- identical (text, level) requests already queued or in flight share one
+  result (single-flight), so duplicates never reach the backend; every
+  caller still gets its own future, so cancelling one (e.g. an aextract()
+  task) does not cancel the others
+- up to `max_concurrent_batches` batches run on the backend at once; the
+  next batch is only formed once one of them finishes, so the backlog
+  waits in the scheduler's queues (and keeps filling batches) rather than
+  in the executor
+
+The scheduler is itself an LLMBackend, so it drops into
+HybridTemporalReasoner(llm_backend=...) unchanged. stats() reports queue
+depth, batch sizes, queue wait times and coalesced requests.
+"""
+
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import threading
+import time
+
+from llm_interface import ExtractionLevel, LLMBackend, LLMResponse, MockLLM, backend_version_of
+from streaming_stats import LatencyHistogram, RunningStats
+
+
+class _PendingRequest:
+    __slots__ = ("text", "level", "futures", "enqueued_ns")
+
+    def __init__(self, text: str, level: ExtractionLevel, enqueued_ns: int):
+        self.text = text
+        self.level = level
+        self.futures: List[Future] = []  # one per caller
+        self.enqueued_ns = enqueued_ns
+
+
+class BatchingExtractionScheduler:
+    """Coalescing, micro-batching LLMBackend wrapper"""
+
+    def __init__(self, backend: LLMBackend, max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, max_concurrent_batches: int = 4):
+        """
+        Initialize scheduler and start its dispatcher thread.
+
+        Args:
+            backend: Backend receiving the batched extract_batch() calls
+            max_batch_size: Texts per batch that trigger an immediate dispatch
+            max_wait_ms: Longest a request waits for its batch to fill
+            max_concurrent_batches: Batches running on the backend at once
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ns = int(max_wait_ms * 1e6)
+
+        self._pending: Dict[ExtractionLevel, Deque[_PendingRequest]] = {}
+        self._in_flight: Dict[Tuple[str, ExtractionLevel], _PendingRequest] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._batch_slots = threading.BoundedSemaphore(max_concurrent_batches)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches,
+                                            thread_name_prefix="extraction-batch")
+
+        # Metrics, guarded by _condition
+        self.submitted = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_queue_depth = 0
+        self._queue_depth = 0
+        self.batch_sizes = RunningStats()
+        self.wait_times = LatencyHistogram()
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop,
+                                            name="extraction-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    @property
+    def backend_version(self) -> Optional[str]:
+        """Batching does not change answers: the wrapped backend's identity"""
+        return backend_version_of(self.backend)
+
+    # ------------------------------------------------------------------
+    # LLMBackend interface
+    # ------------------------------------------------------------------
+
+    def submit(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> "Future[LLMResponse]":
+        """Queue one extraction; identical in-flight requests share one backend call"""
+        key = (text, level)
+        future: "Future[LLMResponse]" = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            self.submitted += 1
+            request = self._in_flight.get(key)
+            if request is not None:
+                self.coalesced += 1
+                request.futures.append(future)
+                return future
+
+            request = self._in_flight[key] = _PendingRequest(text, level, time.perf_counter_ns())
+            request.futures.append(future)
+            self._pending.setdefault(level, deque()).append(request)
+            self._queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue_depth)
+            self._condition.notify()
+        return future
+
+    def extract_temporal_info(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        return self.submit(text, level).result()
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        futures = [self.submit(text, level) for text in texts]
+        return [future.result() for future in futures]
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        return await asyncio.wrap_future(self.submit(text, level))
+
+    # ------------------------------------------------------------------
+    # Dispatching
+    # ------------------------------------------------------------------
+
+    def _dispatch_loop(self):
+        while True:
+            self._batch_slots.acquire()  # released when the batch finishes
+            with self._condition:
+                while True:
+                    level, next_deadline = self._ready_level(time.perf_counter_ns())
+                    if level is not None:
+                        batch = self._take_batch(level)
+                        break
+                    if self._closed and not self._queue_depth:
+                        self._batch_slots.release()
+                        return
+                    timeout = None if next_deadline is None else max(next_deadline - time.perf_counter_ns(), 0) / 1e9
+                    self._condition.wait(timeout)
+            self._executor.submit(self._run_batch, level, batch)
+
+    def _ready_level(self, now_ns: int) -> Tuple[Optional[ExtractionLevel], Optional[int]]:
+        """A level whose batch is due (full, expired or closing), else the earliest deadline"""
+        next_deadline = None
+        for level, queue in self._pending.items():
+            if not queue:
+                continue
+            deadline = queue[0].enqueued_ns + self.max_wait_ns
+            if len(queue) >= self.max_batch_size or deadline <= now_ns or self._closed:
+                return level, None
+            if next_deadline is None or deadline < next_deadline:
+                next_deadline = deadline
+        return None, next_deadline
+
+    def _take_batch(self, level: ExtractionLevel) -> List[_PendingRequest]:
+        queue = self._pending[level]
+        batch = [queue.popleft() for _ in range(min(self.max_batch_size, len(queue)))]
+        now_ns = time.perf_counter_ns()
+        self._queue_depth -= len(batch)
+        self.batches += 1
+        self.batch_sizes.add(len(batch))
+        for request in batch:
+            self.wait_times.add(now_ns - request.enqueued_ns)
+        return batch
+
+    def _run_batch(self, level: ExtractionLevel, batch: List[_PendingRequest]):
+        try:
+            responses = self.backend.extract_batch([request.text for request in batch], level)
+            if len(responses) != len(batch):
+                raise RuntimeError(f"Backend returned {len(responses)} responses for {len(batch)} texts")
+        except Exception as e:
+            with self._condition:
+                self.failed_batches += 1
+            self._finish(batch, None, e)
+        else:
+            self._finish(batch, responses, None)
+        finally:
+            self._batch_slots.release()
+
+    def _finish(self, batch: List[_PendingRequest], responses: Optional[List[LLMResponse]],
+                error: Optional[BaseException]):
+        with self._condition:
+            for request in batch:
+                self._in_flight.pop((request.text, request.level), None)
+        # No future can join a request once it left _in_flight
+        for i, request in enumerate(batch):
+            for future in request.futures:
+                if future.done():
+                    continue  # cancelled by its caller
+                try:
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(responses[i])
+                except InvalidStateError:
+                    pass  # cancelled since the check
+
+    # ------------------------------------------------------------------
+    # Lifecycle and metrics
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """Dispatch everything still queued, wait for it, and stop"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchingExtractionScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def stats(self) -> dict:
+        with self._condition:
+            sizes = self.batch_sizes
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": len(self._in_flight),
+                "mean_batch_size": sizes.mean,
+                "max_batch_size": sizes.max if sizes.count else 0,
+                "wait": self.wait_times.to_dict()
+            }
+
+
+if __name__ == "__main__":
+    from llm_server import HTTPLLMBackend, LLMServer
+
+    print("=" * 80)
+    print("Micro-Batching Extraction Scheduler - Example")
+    print("=" * 80)
+
+    questions = [
+        "The patient was admitted, received medication treatment and was discharged. What is the order of events?",
+        "First, the team prepared the presentation. Then, they held the meeting. Finally, they sent the email. What is the order?",
+        "The meeting lasted 2 hours, followed by a 30 minute break, then a 1 hour workshop. How long did it take in total?",
+    ]
+    texts = [f"{questions[i % 3]} (case {i % 40})" for i in range(200)]
+
+    with LLMServer(MockLLM(), latency=0.02) as server:
+        backend = HTTPLLMBackend(server.url)
+        with BatchingExtractionScheduler(backend, max_batch_size=32, max_wait_ms=5) as scheduler:
+            async def extract_all():
+                return await asyncio.gather(*(scheduler.aextract(t, ExtractionLevel.LEVEL_2_ORDERING) for t in texts))
+
+            started = time.perf_counter()
+            responses = asyncio.run(extract_all())
+            elapsed = time.perf_counter() - started
+            stats = scheduler.stats()
+        backend.close()
+
+        print(f"\n{len(responses)} extractions in {elapsed:.2f}s, "
+              f"{server.requests_served} server requests")
+        print(f"Batches: {stats['batches']} (mean size {stats['mean_batch_size']:.1f}), "
+              f"coalesced duplicates: {stats['coalesced']}, max queue depth: {stats['max_queue_depth']}")
+        print(f"Queue wait p50/p99: {stats['wait']['p50_ms']:.2f} / {stats['wait']['p99_ms']:.2f} ms")
+
+    print("\n" + "=" * 80)
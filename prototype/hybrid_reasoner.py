@@ -5,17 +5,45 @@ Combines LLM-based extraction with symbolic Allen's Interval Algebra reasoning
 to provide accurate, verifiable temporal reasoning with provenance tracking.
 """
 
-from typing import Dict, List, Tuple, Optional, Set
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Tuple, Optional, Set, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, replace
+from enum import Enum
+import asyncio
+import contextvars
+import functools
+import itertools
 import re
 import json
+import threading
+import time
 
 from temporal_core import (
     AllenAlgebra, AllenRelation, TimeInterval,
-    TemporalConstraintSolver, parse_relative_time
+    TemporalConstraintSolver, IncrementalConstraintSolver, parse_relative_time,
+    relation_from_name
 )
-from llm_interface import MockLLM, ExtractionLevel, LLMResponse, TemporalEvent, TemporalRelation
-from provenance import ProvenanceTracker, ReasoningStep
+from llm_interface import (
+    MockLLM, LLMBackend, StreamingLLMBackend, ExtractionLevel, LLMResponse,
+    TemporalEvent, TemporalRelation, backend_version_of
+)
+from structured_output import StreamingResponseParser, StreamItem
+from entity_resolution import EntityResolver
+from solver_pool import SolverPool
+from provenance import ProvenanceTracker, ReasoningStep, LazyExplanation, LazyPayload
+from caching import LRUCache, fingerprint
+
+
+# Part of every result-cache key; bump when a pipeline change alters answers
+PIPELINE_VERSION = "3"
+
+
+class InconsistencyPolicy(Enum):
+    """What reason_stream() does once streamed relations provably contradict each other"""
+    CONTINUE = "continue"   # decode the whole response anyway
+    CANCEL = "cancel"       # stop the generation; the answer reports the inconsistency
+    REPROMPT = "reprompt"   # stop and request a new sample (up to max_reprompts times)
 
 
 @dataclass
@@ -30,7 +58,7 @@ class HybridResult:
     symbolic_confidence: float
     used_symbolic: bool
     conflicts_detected: List[str]
-    explanation: str
+    explanation: Union[str, LazyExplanation]  # Rendered on first read
     provenance_id: str
 
 
@@ -44,17 +72,41 @@ class HybridTemporalReasoner:
     5. Tracks full provenance for explainability
     """
 
-    def __init__(self, llm_accuracy: str = "medium"):
+    def __init__(self, llm_accuracy: str = "medium", provenance: Optional[ProvenanceTracker] = None,
+                 result_cache: Optional[LRUCache] = None, llm_backend: Optional[LLMBackend] = None,
+                 solver_pool: Optional[SolverPool] = None, backend_version: Optional[str] = None):
         """
         Initialize hybrid reasoner.
 
         Args:
             llm_accuracy: "high", "medium", or "low" - affects LLM error rate
+            provenance: Preconfigured provenance tracker (e.g. with payload
+                deduplication); a default tracker is created if None
+            result_cache: Cache of results for repeated questions, keyed by
+                question fingerprint, level, pipeline version and backend
+                version; caching is disabled if None
+            llm_backend: LLM used for extraction (e.g. llm_server.HTTPLLMBackend);
+                defaults to MockLLM(llm_accuracy)
+            solver_pool: Worker processes to propagate constraints in; large
+                networks are otherwise solved in the calling thread
+            backend_version: Identity of the LLM backend's answers in result
+                cache keys (default: the backend's own backend_version);
+                required with a result_cache if the backend reports none
         """
-        self.llm = MockLLM(accuracy_level=llm_accuracy)
+        self.llm_accuracy = llm_accuracy
+        self.result_cache = result_cache
+        self.llm = llm_backend if llm_backend is not None else MockLLM(accuracy_level=llm_accuracy)
+        self.backend_version = backend_version or backend_version_of(self.llm)
+        if result_cache is not None and self.backend_version is None:
+            raise ValueError(f"{type(self.llm).__name__} reports no backend_version; "
+                             "pass backend_version to use a result_cache")
+        self.solver_pool = solver_pool
         self.algebra = AllenAlgebra()
-        self.provenance = ProvenanceTracker()
+        self.provenance = provenance if provenance is not None else ProvenanceTracker()
+        self._task_ids = itertools.count(1)
         self.task_counter = 0
+        self.stream_counts = {"streams": 0, "tokens": 0, "cancelled": 0, "reprompted": 0}
+        self._stream_lock = threading.Lock()
 
     def reason(self, question: str, level: ExtractionLevel = None) -> HybridResult:
         """
@@ -67,30 +119,326 @@ class HybridTemporalReasoner:
         Returns:
             HybridResult with answer and provenance
         """
+        return self._reason(question, level)
+
+    def _reason(self, question: str, level: Optional[ExtractionLevel],
+                solver_pool: Optional[SolverPool] = None) -> HybridResult:
+        level, task_id, cache_key, cached = self._prepare(question, level)
+        if cached is not None:
+            with self.provenance.task(task_id, question):
+                return self._reuse_cached_result(cached, cache_key, task_id)
+
+        # Start provenance tracking in a per-call recording context, so
+        # concurrent reason() calls on one reasoner keep separate chains
+        with self.provenance.task(task_id, question):
+            return self._run_pipeline(question, level, task_id, cache_key,
+                                      solver_pool=solver_pool)
+
+    async def areason(self, question: str, level: ExtractionLevel = None) -> HybridResult:
+        """
+        Asynchronous reason(): awaits the backend's aextract(), so many
+        questions can wait on the LLM concurrently (e.g. via asyncio.gather)
+        while the event loop runs the symbolic stages of those already answered.
+        """
+        return await self._areason(question, level)
+
+    async def _areason(self, question: str, level: Optional[ExtractionLevel],
+                       solver_pool: Optional[SolverPool] = None) -> HybridResult:
+        level, task_id, cache_key, cached = self._prepare(question, level)
+        # Each asyncio task has its own context, so the active chain follows it across awaits
+        with self.provenance.task(task_id, question):
+            if cached is not None:
+                return self._reuse_cached_result(cached, cache_key, task_id)
+            started_ns = time.perf_counter_ns()
+            try:
+                llm_response = await self.llm.aextract(question, level)
+            except Exception as e:
+                return self._error_result(question, task_id, e)
+            if solver_pool is None:
+                return self._run_pipeline(question, level, task_id, cache_key,
+                                          llm_response=llm_response, extraction_started_ns=started_ns)
+            # Off the event loop: the thread waits on the solver process
+            # (run in a copy of this context, so the active chain follows)
+            run = functools.partial(
+                contextvars.copy_context().run, self._run_pipeline, question, level, task_id,
+                cache_key, llm_response=llm_response, extraction_started_ns=started_ns,
+                solver_pool=solver_pool
+            )
+            return await asyncio.get_running_loop().run_in_executor(None, run)
+
+    def reason_many(self, questions: Iterable[str], concurrency: int = 8,
+                    level: ExtractionLevel = None,
+                    solver_processes: int = 0) -> Iterator[HybridResult]:
+        """
+        reason() over many questions, pipelined: `concurrency` questions are
+        in flight at once, so the LLM extraction of one question overlaps the
+        symbolic stages of others. With solver_processes, constraint
+        propagation runs in a pool of worker processes instead of contending
+        for the GIL. Questions are read lazily, at most 2 * concurrency ahead
+        of the results.
+
+        Args:
+            questions: Questions to answer (any iterable, e.g. a file's lines)
+            concurrency: Questions processed at once
+            level: Target extraction level for all questions (auto-detected
+                per question if None)
+            solver_processes: Worker processes of a solver pool started for
+                this batch; 0 (the default) uses the reasoner's solver_pool,
+                or solves in the calling threads if it has none
+
+        Returns:
+            Iterator of results in completion order; each result's
+            provenance_id names its chain
+        """
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reason-many") as threads, \
+                self._batch_solver_pool(solver_processes) as solver_pool:
+            pending = set()
+            for question in questions:
+                pending.add(threads.submit(self._reason, question, level, solver_pool))
+                if len(pending) >= 2 * concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    async def areason_many(self, questions: Iterable[str], concurrency: int = 32,
+                           level: ExtractionLevel = None,
+                           solver_processes: int = 0) -> AsyncIterator[HybridResult]:
+        """
+        Asynchronous reason_many(): up to `concurrency` questions await the
+        backend's aextract() at once. The symbolic stages of answered ones
+        run on the event loop, or on threads backed by the solver process
+        pool if there is one; a batch pool is started and stopped off the loop.
+
+        Returns:
+            Async iterator of results in completion order
+        """
+        async with self._abatch_solver_pool(solver_processes) as solver_pool:
+            pending = set()
+            for question in questions:
+                pending.add(asyncio.ensure_future(self._areason(question, level, solver_pool)))
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            for task in asyncio.as_completed(pending):
+                yield await task
+
+    @contextmanager
+    def _batch_solver_pool(self, processes: int) -> Iterator[Optional[SolverPool]]:
+        """The reasoner's solver pool, or one kept warm for the duration of a batch"""
+        if self.solver_pool is not None or not processes:
+            yield self.solver_pool
+            return
+        with SolverPool(processes) as pool:
+            yield pool
+
+    @asynccontextmanager
+    async def _abatch_solver_pool(self, processes: int) -> AsyncIterator[Optional[SolverPool]]:
+        """_batch_solver_pool() whose pool starts and stops in a thread, off the event loop"""
+        if self.solver_pool is not None or not processes:
+            yield self.solver_pool
+            return
+        loop = asyncio.get_running_loop()
+        pool = await loop.run_in_executor(None, SolverPool, processes)
+        try:
+            yield pool
+        finally:
+            await loop.run_in_executor(None, pool.close)
+
+    def reason_stream(self, question: str, level: ExtractionLevel = None,
+                      on_inconsistency: InconsistencyPolicy = InconsistencyPolicy.CANCEL,
+                      max_reprompts: int = 1) -> HybridResult:
+        """
+        reason() over a streaming backend: each event and relation is added
+        to an IncrementalConstraintSolver as soon as the model has emitted
+        it, so conversion and propagation overlap the model's decoding, and
+        a contradiction is known the moment its relation arrives instead of
+        in the verification step. Backends without stream_extract() fall
+        back to reason().
+
+        Args:
+            question: Natural language temporal reasoning question
+            level: Target extraction level (auto-detected if None)
+            on_inconsistency: Whether a provably inconsistent generation is
+                decoded to the end, cancelled, or cancelled and re-sampled
+            max_reprompts: New samples requested under REPROMPT before the
+                generation is cancelled
+
+        Returns:
+            HybridResult with answer and provenance
+        """
+        if not isinstance(self.llm, StreamingLLMBackend):
+            return self.reason(question, level)
+
+        level, task_id, cache_key, cached = self._prepare(question, level)
+        with self.provenance.task(task_id, question):
+            if cached is not None:
+                return self._reuse_cached_result(cached, cache_key, task_id)
+            started_ns = time.perf_counter_ns()
+            try:
+                llm_response, solver, resolver, conversion_started_ns = self._stream_extraction(
+                    question, level, on_inconsistency, max_reprompts
+                )
+            except Exception as e:
+                return self._error_result(question, task_id, e)
+            return self._run_pipeline(question, level, task_id, cache_key,
+                                      llm_response=llm_response, extraction_started_ns=started_ns,
+                                      solver=solver, resolver=resolver,
+                                      conversion_started_ns=conversion_started_ns)
+
+    def _stream_extraction(self, question: str, level: ExtractionLevel,
+                           on_inconsistency: InconsistencyPolicy = InconsistencyPolicy.CANCEL,
+                           max_reprompts: int = 1
+                           ) -> Tuple[LLMResponse, IncrementalConstraintSolver, EntityResolver, int]:
+        """Consume the backend's token stream, converting and propagating items as they complete"""
+        reprompts = 0
+        tokens = 0
+        while True:
+            parser = StreamingResponseParser()
+            solver = IncrementalConstraintSolver()
+            resolver = EntityResolver()
+            waiting: List[TemporalRelation] = []  # relations streamed before their events
+            conversion_started_ns = None
+            stopped = False
+            stream = self.llm.stream_extract(question, level)
+            try:
+                for token in stream:
+                    tokens += 1
+                    for item in parser.feed(token):
+                        if conversion_started_ns is None:
+                            conversion_started_ns = time.perf_counter_ns()
+                        self._add_to_solver(solver, resolver, item, waiting)
+                    if parser.complete:
+                        break
+                    if not solver.consistent and on_inconsistency is not InconsistencyPolicy.CONTINUE:
+                        stopped = True
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+            if conversion_started_ns is None:
+                conversion_started_ns = time.perf_counter_ns()
+            if not stopped:
+                # Events of these never arrived; they are dropped as in reason()
+                for relation in waiting:
+                    self._add_to_solver(solver, resolver, relation)
+
+            if stopped and on_inconsistency is InconsistencyPolicy.REPROMPT and reprompts < max_reprompts:
+                reprompts += 1
+                continue
+            break
+
+        self._count_stream(tokens, cancelled=stopped, reprompts=reprompts)
+        stream_info = {"tokens": tokens, "cancelled": stopped, "reprompts": reprompts}
+        if not stopped:
+            response = parser.finish(level)
+            if reprompts:
+                response.metadata = dict(response.metadata or {}, stream=stream_info)
+            return response, solver, resolver, conversion_started_ns
+
+        event1, event2, relations = solver.conflict
+        contradiction = f"{event1} {'/'.join(sorted(r.value for r in relations))} {event2}"
+        stream_info["conflict"] = contradiction
+        response = LLMResponse(
+            events=list(parser.events),
+            relations=list(parser.relations),
+            raw_answer=f"Extraction stopped: '{contradiction}' contradicts the relations extracted before it.",
+            extraction_level=level,
+            metadata={"confidence": 0.0, "stream": stream_info}
+        )
+        return response, solver, resolver, conversion_started_ns
+
+    def _count_stream(self, tokens: int, cancelled: bool, reprompts: int):
+        with self._stream_lock:
+            self.stream_counts["streams"] += 1
+            self.stream_counts["tokens"] += tokens
+            self.stream_counts["cancelled"] += int(cancelled)
+            self.stream_counts["reprompted"] += reprompts
+
+    def stream_stats(self) -> dict:
+        """reason_stream() counters: streams, tokens received, cancellations, re-prompts"""
+        with self._stream_lock:
+            return dict(self.stream_counts)
+
+    def _prepare(self, question: str, level: Optional[ExtractionLevel]):
+        """Resolve the level, allocate a task ID and look up the result cache"""
         # Auto-detect level if not specified
         if level is None:
             level = self._detect_reasoning_level(question)
 
-        # Generate unique task ID
-        self.task_counter += 1
-        task_id = f"task_{self.task_counter:04d}"
-
-        # Start provenance tracking
-        self.provenance.start_task(task_id, question)
-
+        # Generate unique task ID (itertools.count is safe across threads)
+        task_number = next(self._task_ids)
+        self.task_counter = max(self.task_counter, task_number)
+        task_id = f"task_{task_number:04d}"
+
+        cache_key = cached = None
+        if self.result_cache is not None:
+            cache_key = self._cache_key(question, level)
+            cached = self.result_cache.get(cache_key)
+        return level, task_id, cache_key, cached
+
+    def _cache_key(self, question: str, level: ExtractionLevel) -> str:
+        return f"{fingerprint(question)}:{level.value}:{PIPELINE_VERSION}:{self.backend_version}"
+
+    def _reuse_cached_result(self, cached: Tuple[HybridResult, str, str],
+                             cache_key: str, task_id: str) -> HybridResult:
+        """Answer from the result cache, linking the new chain to the source chain"""
+        result, source_task_id, source_step_id = cached
+        self.provenance.record_cache_reuse(
+            source_task_id=source_task_id,
+            source_step_ids=[source_step_id],
+            answer=result.verified_answer,
+            confidence=result.confidence,
+            cache_key=cache_key,
+            started_ns=time.perf_counter_ns()
+        )
+        self.provenance.end_task(task_id, result.verified_answer, success=True)
+        return replace(result, provenance_id=task_id)
+
+    def cache_stats(self) -> dict:
+        """Result-cache statistics (hit rate, evictions, ...); empty if caching is off"""
+        return self.result_cache.stats() if self.result_cache is not None else {}
+
+    def _run_pipeline(self, question: str, level: ExtractionLevel, task_id: str,
+                      cache_key: Optional[str] = None,
+                      llm_response: Optional[LLMResponse] = None,
+                      extraction_started_ns: Optional[int] = None,
+                      solver: Optional[TemporalConstraintSolver] = None,
+                      resolver: Optional[EntityResolver] = None,
+                      conversion_started_ns: Optional[int] = None,
+                      solver_pool: Optional[SolverPool] = None) -> HybridResult:
+        """
+        Run the five reasoning stages inside an active provenance task.
+        A prefetched `llm_response` (from areason) skips the LLM call; a
+        `solver` (and its `resolver`) already built from it (by
+        reason_stream) skips conversion. Propagation runs on
+        `solver_pool` if given.
+        """
         try:
             # Step 1: LLM Extraction
-            llm_response = self._llm_extraction_step(question, level)
+            llm_response, extraction_step_id = self._llm_extraction_step(
+                question, level, llm_response, extraction_started_ns
+            )
 
             # Step 2: Convert to symbolic representation
-            solver, conversion_step_id = self._symbolic_conversion_step(llm_response)
+            solver, conversion_step_id = self._symbolic_conversion_step(
+                llm_response, parent_ids=[extraction_step_id],
+                solver=solver, resolver=resolver, started_ns=conversion_started_ns
+            )
 
             # Step 3: Symbolic reasoning and verification
-            symbolic_result = self._symbolic_reasoning_step(solver, question, level)
+            symbolic_result, solving_step_id = self._symbolic_reasoning_step(
+                solver, question, level, parent_ids=[conversion_step_id],
+                solver_pool=solver_pool
+            )
 
             # Step 4: Compare and verify
-            verified_answer, conflicts = self._verification_step(
-                llm_response, symbolic_result, question, level
+            verified_answer, conflicts, final_step_id = self._verification_step(
+                llm_response, symbolic_result, question, level,
+                parent_ids=[extraction_step_id, solving_step_id]
             )
 
             # Step 5: Generate final answer with confidence
@@ -102,27 +450,31 @@ class HybridTemporalReasoner:
             # Complete provenance
             self.provenance.end_task(task_id, final_result.verified_answer, success=True)
 
+            if cache_key is not None:
+                self.result_cache.put(cache_key, (final_result, task_id, final_step_id))
+
             return final_result
 
         except Exception as e:
-            # Record error in provenance
-            error_msg = f"Error in reasoning: {str(e)}"
-            self.provenance.end_task(task_id, "", success=False, error_message=error_msg)
-
-            # Return error result
-            return HybridResult(
-                question=question,
-                llm_answer="Error occurred",
-                symbolic_answer=None,
-                verified_answer=f"Could not determine answer: {error_msg}",
-                confidence=0.0,
-                llm_confidence=0.0,
-                symbolic_confidence=0.0,
-                used_symbolic=False,
-                conflicts_detected=[error_msg],
-                explanation=error_msg,
-                provenance_id=task_id
-            )
+            return self._error_result(question, task_id, e)
+
+    def _error_result(self, question: str, task_id: str, error: Exception) -> HybridResult:
+        """Record a failed task in provenance and build its result"""
+        error_msg = f"Error in reasoning: {str(error)}"
+        self.provenance.end_task(task_id, "", success=False, error_message=error_msg)
+        return HybridResult(
+            question=question,
+            llm_answer="Error occurred",
+            symbolic_answer=None,
+            verified_answer=f"Could not determine answer: {error_msg}",
+            confidence=0.0,
+            llm_confidence=0.0,
+            symbolic_confidence=0.0,
+            used_symbolic=False,
+            conflicts_detected=[error_msg],
+            explanation=error_msg,
+            provenance_id=task_id
+        )
 
     def _detect_reasoning_level(self, question: str) -> ExtractionLevel:
         """Detect the required reasoning level from the question"""
@@ -139,12 +491,18 @@ class HybridTemporalReasoner:
         # Level 1: Extraction
         return ExtractionLevel.LEVEL_1_EXTRACTION
 
-    def _llm_extraction_step(self, question: str, level: ExtractionLevel) -> LLMResponse:
-        """Step 1: Extract temporal information using LLM"""
-        llm_response = self.llm.extract_temporal_info(question, level)
-
-        # Record in provenance
-        events_data = [
+    def _llm_extraction_step(self, question: str, level: ExtractionLevel,
+                             llm_response: Optional[LLMResponse] = None,
+                             started_ns: Optional[int] = None) -> Tuple[LLMResponse, str]:
+        """Step 1: Extract temporal information using LLM (unless already extracted)"""
+        if llm_response is None:
+            started_ns = time.perf_counter_ns()
+            llm_response = self.llm.extract_temporal_info(question, level)
+
+        # Record in provenance; payloads are only built if the capture policy keeps them
+        events = llm_response.events
+        relations = llm_response.relations
+        events_data = LazyPayload(lambda: [
             {
                 "name": e.name,
                 "description": e.description,
@@ -152,66 +510,122 @@ class HybridTemporalReasoner:
                 "end_time": e.end_time,
                 "duration": e.duration
             }
-            for e in llm_response.events
-        ]
+            for e in events
+        ], size=len(events))
 
-        relations_data = [
+        relations_data = LazyPayload(lambda: [
             {
                 "event1": r.event1,
                 "event2": r.event2,
                 "relation": r.relation,
                 "confidence": r.confidence
             }
-            for r in llm_response.relations
-        ]
+            for r in relations
+        ], size=len(relations))
+
+        metadata = {
+            "level": level.value,
+            "domain": llm_response.metadata.get("domain") if llm_response.metadata else None,
+            "raw_answer": llm_response.raw_answer
+        }
+        if llm_response.metadata and "stream" in llm_response.metadata:
+            metadata["stream"] = llm_response.metadata["stream"]  # early termination, re-prompts
 
-        self.provenance.record_llm_extraction(
+        step_id = self.provenance.record_llm_extraction(
             query=question,
             events=events_data,
             relations=relations_data,
             confidence=llm_response.metadata.get("confidence", 0.8) if llm_response.metadata else 0.8,
-            metadata={
-                "level": level.value,
-                "raw_answer": llm_response.raw_answer
-            }
+            metadata=metadata,
+            started_ns=started_ns
         )
 
-        return llm_response
-
-    def _symbolic_conversion_step(self, llm_response: LLMResponse) -> Tuple[TemporalConstraintSolver, str]:
-        """Step 2: Convert LLM output to symbolic constraints"""
-        solver = TemporalConstraintSolver()
+        return llm_response, step_id
 
-        # Add intervals
-        for event in llm_response.events:
-            interval = self._convert_event_to_interval(event)
-            solver.add_interval(interval)
+    def _symbolic_conversion_step(self, llm_response: LLMResponse,
+                                  parent_ids: List[str] = None,
+                                  solver: Optional[TemporalConstraintSolver] = None,
+                                  resolver: Optional[EntityResolver] = None,
+                                  started_ns: Optional[int] = None) -> Tuple[TemporalConstraintSolver, str]:
+        """
+        Step 2: Convert LLM output to symbolic constraints (unless converted
+        while streaming). Event mentions are resolved to one interval per
+        entity first; relations between unknown events are dropped.
+        """
+        if solver is None:
+            started_ns = time.perf_counter_ns()
+            solver = TemporalConstraintSolver()
+            resolver = EntityResolver()
 
-        # Add constraints
-        for relation in llm_response.relations:
-            allen_relation = self._convert_to_allen_relation(relation.relation)
-            if allen_relation:
-                solver.add_single_relation(relation.event1, relation.event2, allen_relation)
+            # Add intervals, then constraints
+            for event in llm_response.events:
+                self._add_to_solver(solver, resolver, event)
+            for relation in llm_response.relations:
+                self._add_to_solver(solver, resolver, relation)
 
         # Record in provenance
         step_id = self.provenance.record_symbolic_constraint(
             constraint_desc=f"Converted {len(llm_response.relations)} LLM relations to Allen's algebra",
             constraint_data={
                 "num_intervals": len(solver.intervals),
-                "num_constraints": len(solver.constraints)
+                "num_constraints": len(solver.constraints),
+                "resolution": resolver.stats.to_dict() if resolver is not None else None
             },
-            confidence=1.0
+            parent_ids=parent_ids,
+            confidence=1.0,
+            started_ns=started_ns
         )
 
         return solver, step_id
 
+    def _add_to_solver(self, solver: TemporalConstraintSolver, resolver: EntityResolver, item: StreamItem,
+                       waiting: Optional[List[TemporalRelation]] = None):
+        """
+        Convert one extracted event (to the interval of its entity) or
+        relation (to a constraint between canonical intervals).
+
+        With `waiting` (streaming), a relation whose events have not arrived
+        yet is held there and added once they do, instead of being dropped.
+        """
+        if isinstance(item, TemporalEvent):
+            solver.add_interval(self._convert_event_to_interval(resolver.add_event(item)))
+            if waiting:
+                held = list(waiting)
+                waiting.clear()
+                for relation in held:
+                    self._add_to_solver(solver, resolver, relation, waiting)
+            return
+        if waiting is not None and (resolver.resolve(item.event1) is None or resolver.resolve(item.event2) is None):
+            waiting.append(item)
+            return
+        relation = resolver.resolve_relation(item)
+        if relation is None:
+            return
+        allen_relation = self._convert_to_allen_relation(relation.relation)
+        if allen_relation:
+            solver.add_single_relation(relation.event1, relation.event2, allen_relation)
+
     def _symbolic_reasoning_step(self, solver: TemporalConstraintSolver,
-                                 question: str, level: ExtractionLevel) -> Dict:
+                                 question: str, level: ExtractionLevel,
+                                 parent_ids: List[str] = None,
+                                 solver_pool: Optional[SolverPool] = None) -> Tuple[Dict, str]:
         """Step 3: Perform symbolic reasoning"""
         # Check consistency
-        is_consistent = solver.propagate_constraints()
+        started_ns = time.perf_counter_ns()
+        solver_pool = solver_pool or self.solver_pool
+        if solver_pool is not None and not isinstance(solver, IncrementalConstraintSolver):
+            is_consistent, solver.constraints = solver_pool.solve(solver.constraints)
+        else:
+            is_consistent = solver.propagate_constraints()
+        propagation_step_id = self.provenance.record_symbolic_propagation(
+            num_constraints=len(solver.constraints),
+            consistent=is_consistent,
+            parent_ids=parent_ids,
+            started_ns=started_ns
+        )
 
         # Compute interval values if possible
+        started_ns = time.perf_counter_ns()
         if is_consistent:
             intervals = solver.compute_interval_values()
         else:
@@ -229,17 +643,21 @@ class HybridTemporalReasoner:
         }
 
         # Record in provenance
-        self.provenance.record_symbolic_solving(
+        step_id = self.provenance.record_symbolic_solving(
             problem_desc=f"Symbolic temporal reasoning (level {level.value})",
             solution=result,
-            success=is_consistent
+            parent_ids=[propagation_step_id],
+            success=is_consistent,
+            started_ns=started_ns
         )
 
-        return result
+        return result, step_id
 
     def _verification_step(self, llm_response: LLMResponse, symbolic_result: Dict,
-                          question: str, level: ExtractionLevel) -> Tuple[str, List[str]]:
-        """Step 4: Verify LLM answer against symbolic reasoning"""
+                          question: str, level: ExtractionLevel,
+                          parent_ids: List[str] = None) -> Tuple[str, List[str], str]:
+        """Step 4: Verify LLM answer against symbolic reasoning; also returns the last step ID"""
+        started_ns = time.perf_counter_ns()
         conflicts = []
 
         # Check for inconsistencies
@@ -259,35 +677,43 @@ class HybridTemporalReasoner:
 
         # Record verification
         verified = len(conflicts) == 0
-        self.provenance.record_verification(
+        verification_step_id = self.provenance.record_verification(
             verification_desc="Compare LLM and symbolic answers",
             verified=verified,
             details={
                 "llm_answer": llm_answer,
                 "symbolic_answer": symbolic_answer,
                 "conflicts": conflicts
-            }
+            },
+            parent_ids=parent_ids,
+            started_ns=started_ns
         )
 
         # Determine verified answer
+        final_step_id = verification_step_id
+        started_ns = time.perf_counter_ns()
         if verified:
             verified_answer = symbolic_answer if symbolic_result["consistent"] else llm_answer
         else:
             # Prefer symbolic if consistent
             if symbolic_result["consistent"]:
                 verified_answer = symbolic_answer
-                self.provenance.record_conflict_resolution(
+                final_step_id = self.provenance.record_conflict_resolution(
                     conflict_desc="Resolved using symbolic reasoning (more reliable)",
-                    resolution={"chosen": "symbolic", "reason": "Symbolic constraints are consistent"}
+                    resolution={"chosen": "symbolic", "reason": "Symbolic constraints are consistent"},
+                    parent_ids=[verification_step_id],
+                    started_ns=started_ns
                 )
             else:
                 verified_answer = llm_answer
-                self.provenance.record_conflict_resolution(
+                final_step_id = self.provenance.record_conflict_resolution(
                     conflict_desc="Using LLM answer (symbolic inconsistent)",
-                    resolution={"chosen": "llm", "reason": "Symbolic constraints inconsistent"}
+                    resolution={"chosen": "llm", "reason": "Symbolic constraints inconsistent"},
+                    parent_ids=[verification_step_id],
+                    started_ns=started_ns
                 )
 
-        return verified_answer, conflicts
+        return verified_answer, conflicts, final_step_id
 
     def _generate_final_answer(self, question: str, llm_response: LLMResponse,
                                symbolic_result: Dict, verified_answer: str,
@@ -308,8 +734,8 @@ class HybridTemporalReasoner:
         # Determine if symbolic reasoning was used
         used_symbolic = symbolic_result["consistent"]
 
-        # Generate explanation
-        explanation = self.provenance.generate_explanation(task_id)
+        # Explanation is rendered only if the caller reads it
+        explanation = self.provenance.explain_lazily(task_id)
 
         return HybridResult(
             question=question,
@@ -390,29 +816,7 @@ class HybridTemporalReasoner:
 
     def _convert_to_allen_relation(self, relation_str: str) -> Optional[AllenRelation]:
         """Convert LLM relation string to Allen relation"""
-        relation_str = relation_str.lower().strip()
-
-        mapping = {
-            "before": AllenRelation.BEFORE,
-            "after": AllenRelation.AFTER,
-            "meets": AllenRelation.MEETS,
-            "met-by": AllenRelation.MET_BY,
-            "met_by": AllenRelation.MET_BY,
-            "overlaps": AllenRelation.OVERLAPS,
-            "overlapped-by": AllenRelation.OVERLAPPED_BY,
-            "overlapped_by": AllenRelation.OVERLAPPED_BY,
-            "during": AllenRelation.DURING,
-            "contains": AllenRelation.CONTAINS,
-            "starts": AllenRelation.STARTS,
-            "started-by": AllenRelation.STARTED_BY,
-            "started_by": AllenRelation.STARTED_BY,
-            "finishes": AllenRelation.FINISHES,
-            "finished-by": AllenRelation.FINISHED_BY,
-            "finished_by": AllenRelation.FINISHED_BY,
-            "equals": AllenRelation.EQUALS,
-        }
-
-        return mapping.get(relation_str)
+        return relation_from_name(relation_str)
 
     def _compute_symbolic_answer(self, solver: TemporalConstraintSolver,
                                  question: str, level: ExtractionLevel,
@@ -461,7 +865,10 @@ class HybridTemporalReasoner:
         hybrid_result = self.reason(question)
 
         # Get pure LLM result
-        pure_llm_answer = self.llm.query(question)
+        if isinstance(self.llm, MockLLM):
+            pure_llm_answer = self.llm.query(question)
+        else:
+            pure_llm_answer = self.llm.extract_temporal_info(question, self._detect_reasoning_level(question)).raw_answer
 
         # Compare
         comparison = {
@@ -524,4 +931,72 @@ if __name__ == "__main__":
     print(f"Hybrid Confidence: {comparison['hybrid_confidence']:.2f}")
     print(f"Improvement: {comparison['improvement']}")
 
+    # Test case 4: Result cache for repeated questions
+    print("\n\nTest 4: Result Cache")
+    print("-" * 80)
+    cached_reasoner = HybridTemporalReasoner(llm_accuracy="medium", result_cache=LRUCache(max_entries=256))
+    for question in [question1, "  " + question1.replace(", ", ",  "), question2, question1]:
+        cached_reasoner.reason(question)
+    print(f"Cache: {cached_reasoner.cache_stats()}")
+    print(cached_reasoner.provenance.generate_explanation("task_0002"))
+
+    # Test case 5: Remote LLM backend with many extractions in flight
+    print("\n\nTest 5: Async Reasoning over an HTTP Backend")
+    print("-" * 80)
+    import asyncio
+    from llm_server import LLMServer, HTTPLLMBackend
+
+    with LLMServer(latency=0.05) as server:
+        backend = HTTPLLMBackend(server.url)
+        remote_reasoner = HybridTemporalReasoner(llm_backend=backend)
+
+        async def reason_all(questions):
+            return await asyncio.gather(*(remote_reasoner.areason(q) for q in questions))
+
+        started = time.perf_counter()
+        results = asyncio.run(reason_all([question1, question2, question3] * 5))
+        print(f"{len(results)} questions in {time.perf_counter() - started:.2f}s "
+              f"(server latency 0.05s per extraction)")
+        print(f"First answer: {results[0].verified_answer}")
+        backend.close()
+
+    # Test case 6: Streaming extraction, converted while the model decodes
+    print("\n\nTest 6: Streaming Structured Output")
+    print("-" * 80)
+    from llm_interface import LatencyModel
+
+    slow_llm = MockLLM(seed=1, latency=LatencyModel(per_token_seconds=0.0005))
+    streaming_reasoner = HybridTemporalReasoner(llm_backend=slow_llm)
+    started = time.perf_counter()
+    streamed = streaming_reasoner.reason_stream(question2)
+    print(f"Streamed answer in {time.perf_counter() - started:.2f}s: {streamed.verified_answer}")
+    print(f"Same as batch pipeline: {streamed.verified_answer == streaming_reasoner.reason(question2).verified_answer}")
+
+    # Test case 7: A contradiction stops the generation early
+    print("\n\nTest 7: Constraint-Guided Early Termination")
+    print("-" * 80)
+    question7 = ("The project has task design, task coding and task testing: design before coding "
+                 "and coding before testing and testing before design by the deadline. What is the order?")
+    cycle_llm = MockLLM(seed=1)
+    early_reasoner = HybridTemporalReasoner(llm_backend=cycle_llm)
+    stopped = early_reasoner.reason_stream(question7, on_inconsistency=InconsistencyPolicy.CANCEL)
+    print(f"Answer: {stopped.verified_answer}")
+    print(f"Stream: {early_reasoner.stream_stats()}, decode: {cycle_llm.decode_stats()}")
+
+    print("\n\nTest 8: Batch Reasoning")
+    print("-" * 80)
+    batch = [question1, question2, question3] * 20
+    slow_llm = MockLLM(seed=1, latency=LatencyModel(base_seconds=0.02))
+    batch_reasoner = HybridTemporalReasoner(llm_backend=slow_llm)
+    start = time.perf_counter()
+    for q in batch[:10]:
+        batch_reasoner.reason(q)
+    per_call = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    results = list(batch_reasoner.reason_many(batch, concurrency=8))
+    elapsed = time.perf_counter() - start
+    print(f"reason() loop: {per_call * len(batch) * 1000:.0f} ms (estimated), "
+          f"reason_many(): {elapsed * 1000:.0f} ms for {len(results)} questions")
+    print(f"First completed: {results[0].provenance_id}")
+
     print("\n" + "=" * 80)
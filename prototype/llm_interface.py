@@ -5,10 +5,14 @@ Simulates LLM behavior for extracting temporal information from natural language
 Provides realistic responses with intentional errors to demonstrate hybrid system benefits.
 """
 
+import asyncio
 import json
+import random
 import re
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple, Optional, Sequence, Protocol, runtime_checkable
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 
@@ -57,6 +61,222 @@ class LLMResponse:
             "metadata": self.metadata or {}
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "LLMResponse":
+        """Reconstruct a response from its dictionary form (see to_dict)"""
+        return cls(
+            events=[TemporalEvent(**e) for e in data.get("events", [])],
+            relations=[TemporalRelation(**r) for r in data.get("relations", [])],
+            raw_answer=data.get("raw_answer", ""),
+            extraction_level=ExtractionLevel(data["extraction_level"]),
+            metadata=data.get("metadata") or {}
+        )
+
+
+# Accuracy level -> probability of a wrong calculation answer
+ACCURACY_ERROR_RATES = {
+    "high": 0.1,
+    "medium": 0.3,
+    "low": 0.5
+}
+
+# Relation an injected error reports instead of the extracted one
+_CONVERSE_RELATIONS = {
+    "before": "after", "after": "before",
+    "meets": "met_by", "met_by": "meets",
+    "overlaps": "overlapped_by", "overlapped_by": "overlaps",
+    "during": "contains", "contains": "during",
+    "starts": "started_by", "started_by": "starts",
+    "finishes": "finished_by", "finished_by": "finishes",
+}
+
+
+@dataclass
+class ErrorModel:
+    """
+    Probability that MockLLM answers a request wrongly, per template
+    ("medical_timeline", "duration_calculation", ..., "generic") and level.
+
+    Lookup order: (template, level), (template, None), then default_rate.
+    An error is a wrong total for calculations and a reversed relation for
+    extractions that produced relations.
+    """
+    rates: Dict[Tuple[str, Optional[ExtractionLevel]], float] = field(default_factory=dict)
+    default_rate: float = 0.0
+
+    def rate(self, template: str, level: ExtractionLevel) -> float:
+        rate = self.rates.get((template, level))
+        if rate is None:
+            rate = self.rates.get((template, None), self.default_rate)
+        return rate
+
+    def key(self) -> str:
+        """Stable description of the rates, for backend identities"""
+        rates = sorted((template, str(level.value) if level else "*", rate)
+                       for (template, level), rate in self.rates.items())
+        return ",".join(f"{t}/{l}={r}" for t, l, r in rates) + f";default={self.default_rate}"
+
+    @classmethod
+    def for_accuracy(cls, accuracy_level: str) -> "ErrorModel":
+        """The classic model: only level-3 duration calculations go wrong"""
+        rate = ACCURACY_ERROR_RATES.get(accuracy_level, 0.3)
+        return cls(rates={("duration_calculation", ExtractionLevel.LEVEL_3_CALCULATION): rate})
+
+
+@dataclass
+class LatencyModel:
+    """
+    Simulated model-server response time.
+
+    Each request takes base_seconds + per_char_seconds * len(text) plus a
+    uniform jitter in [0, jitter_seconds] before the first output token
+    (a batch pays base and jitter once), then per_token_seconds for every
+    generated token. All zero (the default) means answers are immediate.
+    """
+    base_seconds: float = 0.0
+    per_char_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    per_token_seconds: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.base_seconds or self.per_char_seconds or self.jitter_seconds)
+
+    def delay(self, total_chars: int, rng: random.Random) -> float:
+        jitter = rng.uniform(0.0, self.jitter_seconds) if self.jitter_seconds else 0.0
+        return self.base_seconds + self.per_char_seconds * total_chars + jitter
+
+
+class TextView:
+    """
+    Pre-processed view of one input text, shared by the dispatcher and the
+    template handlers so the text is lowercased and tokenized only once.
+    """
+
+    __slots__ = ("text", "lower", "_words")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self._words: Optional[List[str]] = None
+
+    @property
+    def words(self) -> List[str]:
+        """Whitespace-separated tokens of the lowercased text"""
+        if self._words is None:
+            self._words = self.lower.split()
+        return self._words
+
+
+class TemplateDispatcher:
+    """
+    Compiled matcher selecting the first response template whose pattern
+    occurs in a text.
+
+    Template patterns are alternations of keyword sequences
+    ("patient.*admitted.*discharged|surgery.*recovery"). Every alternative of
+    every template is flattened, in priority order, into one list of keyword
+    tuples searched with str.find, so a text is rejected or dispatched by C
+    substring search instead of one regex per template backtracking through
+    each `.*`. Patterns using any other regex syntax are precompiled instead.
+    Matching follows re.search semantics: keywords in order, on one line.
+    """
+
+    _REGEX_SYNTAX = frozenset("\\.^$*+?{}[]|()")
+
+    def __init__(self, templates: Dict[str, dict]):
+        self._alternatives: List[Tuple[str, Tuple[str, ...], Optional["re.Pattern"]]] = []
+        for name, template in templates.items():
+            pattern = template["pattern"]
+            sequences = [tuple(alternative.split(".*")) for alternative in pattern.split("|")]
+            if all(keyword and not self._REGEX_SYNTAX.intersection(keyword)
+                   for keywords in sequences for keyword in keywords):
+                self._alternatives.extend((name, keywords, None) for keywords in sequences)
+            else:
+                self._alternatives.append((name, (), re.compile(pattern)))
+
+    def match(self, view: TextView) -> Optional[str]:
+        """Name of the first matching template, in template order, or None"""
+        text = view.lower
+        multiline = "\n" in text
+        for name, keywords, regex in self._alternatives:
+            if regex is not None:
+                if regex.search(text):
+                    return name
+                continue
+            position = text.find(keywords[0])
+            if position < 0:
+                continue
+            if len(keywords) == 1:
+                return name
+            if multiline:
+                if any(self._has_sequence(line, keywords) for line in text.split("\n")):
+                    return name
+            elif self._has_sequence(text, keywords, position):
+                return name
+        return None
+
+    @staticmethod
+    def _has_sequence(text: str, keywords: Tuple[str, ...], position: int = 0) -> bool:
+        for keyword in keywords:
+            position = text.find(keyword, position)
+            if position < 0:
+                return False
+            position += len(keyword)
+        return True
+
+
+_TASK_PATTERN = re.compile(r"(task|meeting|milestone|deadline)\s+(\w+)")
+_FIRST_PATTERN = re.compile(r"first[,\s]+([^,\.]+)")
+_THEN_PATTERN = re.compile(r"then[,\s]+([^,\.]+)")
+_FINALLY_PATTERN = re.compile(r"finally[,\s]+([^,\.]+)")
+_TIME_PATTERN = re.compile(r"(\d+)\s*(hour|minute|day|week|month)s?")
+_CAPITALIZED_PATTERN = re.compile(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)")
+
+
+# Characters of JSON output per simulated token
+MOCK_TOKEN_CHARS = 4
+
+
+@runtime_checkable
+class LLMBackend(Protocol):
+    """
+    Interface the hybrid reasoner uses to talk to an LLM.
+
+    Implementations: MockLLM (in-process), llm_server.HTTPLLMBackend (remote).
+    aextract lets callers keep many extraction requests in flight at once.
+
+    Backends may also expose a `backend_version` string identifying what
+    their answers depend on (model, configuration, endpoint); result caches
+    key on it (see backend_version_of).
+    """
+
+    def extract_temporal_info(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        """Extract temporal information from one text"""
+        ...
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        """Extract temporal information from several texts, in order"""
+        ...
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        """Asynchronous extract_temporal_info"""
+        ...
+
+
+def backend_version_of(backend: object) -> Optional[str]:
+    """A backend's `backend_version`, or None if it does not report one"""
+    return getattr(backend, "backend_version", None)
+
+
+@runtime_checkable
+class StreamingLLMBackend(Protocol):
+    """LLMBackend that can also stream its JSON output as it is generated"""
+
+    def stream_extract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> Iterator[str]:
+        """Output tokens of the extraction document (see structured_output)"""
+        ...
+
 
 class MockLLM:
     """
@@ -64,23 +284,38 @@ class MockLLM:
     Includes realistic patterns of success and failure for different complexity levels.
     """
 
-    def __init__(self, accuracy_level: str = "medium"):
+    def __init__(self, accuracy_level: str = "medium", seed: Optional[int] = None,
+                 error_model: Optional[ErrorModel] = None,
+                 latency: Optional[LatencyModel] = None):
         """
         Initialize mock LLM with different accuracy levels.
 
         Args:
             accuracy_level: "high", "medium", or "low" - affects error rate
+            seed: Seed of this instance's random generators (None = unseeded).
+                With a seed, the same sequence of calls injects the same
+                errors and latencies on every run
+            error_model: Error probabilities per template and level
+                (default: ErrorModel.for_accuracy(accuracy_level))
+            latency: Simulated response time (default: none)
         """
         self.accuracy_level = accuracy_level
-        self.error_rates = {
-            "high": 0.1,
-            "medium": 0.3,
-            "low": 0.5
-        }
-        self.current_error_rate = self.error_rates.get(accuracy_level, 0.3)
+        self.error_model = error_model if error_model is not None else ErrorModel.for_accuracy(accuracy_level)
+        self.latency = latency if latency is not None else LatencyModel()
+
+        # Separate streams, so enabling latency does not change which answers are wrong
+        self.seed = seed
+        self._error_rng = random.Random(None if seed is None else f"{seed}:errors")
+        self._latency_rng = random.Random(None if seed is None else f"{seed}:latency")
+        self._rng_lock = threading.Lock()
+
+        # Streaming decode accounting, guarded by _rng_lock
+        self.tokens_streamed = 0
+        self.tokens_cancelled = 0
 
         # Pre-defined responses for common temporal reasoning problems
         self.response_templates = self._initialize_templates()
+        self._dispatcher = TemplateDispatcher(self.response_templates)
 
     def _initialize_templates(self) -> Dict[str, dict]:
         """Initialize response templates for common problem types"""
@@ -118,41 +353,132 @@ class MockLLM:
         Returns:
             LLMResponse with extracted events and relations
         """
-        text_lower = text.lower()
+        if self.latency.enabled:
+            time.sleep(self._sample_latency(len(text)))
+        response = self._respond(text, level)
+        if self.latency.per_token_seconds:
+            time.sleep(self._decode_seconds(response))
+        return response
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        """Extract temporal information from several texts, in order"""
+        if self.latency.enabled:
+            time.sleep(self._sample_latency(sum(len(text) for text in texts)))
+        responses = [self._respond(text, level) for text in texts]
+        if self.latency.per_token_seconds:
+            time.sleep(sum(self._decode_seconds(response) for response in responses))
+        return responses
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        """Asynchronous extract_temporal_info; simulated latency does not block the event loop"""
+        if self.latency.enabled:
+            await asyncio.sleep(self._sample_latency(len(text)))
+        response = self._respond(text, level)
+        if self.latency.per_token_seconds:
+            await asyncio.sleep(self._decode_seconds(response))
+        return response
+
+    def stream_extract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION,
+                       token_chars: int = MOCK_TOKEN_CHARS) -> Iterator[str]:
+        """
+        Stream the response as JSON text (LLMResponse.to_dict() layout),
+        a few characters per token, paying per_token_seconds before each.
+
+        Args:
+            text: Input natural language text
+            level: Target extraction level
+            token_chars: Characters per simulated token
+
+        Yields:
+            Consecutive pieces of the JSON document
+        """
+        if self.latency.enabled:
+            time.sleep(self._sample_latency(len(text)))
+        document = json.dumps(self._respond(text, level).to_dict())
+        total = -(-len(document) // token_chars)
+        sent = 0
+        try:
+            for start in range(0, len(document), token_chars):
+                if self.latency.per_token_seconds:
+                    time.sleep(self.latency.per_token_seconds)
+                sent += 1
+                yield document[start:start + token_chars]
+        finally:
+            # A consumer closing the stream early stops decoding: the rest is never generated
+            with self._rng_lock:
+                self.tokens_streamed += sent
+                self.tokens_cancelled += total - sent
+
+    @property
+    def backend_version(self) -> str:
+        """Identity of this instance's answers: accuracy, seed and error model"""
+        return f"mock:{self.accuracy_level}:seed={self.seed}:errors={self.error_model.key()}"
+
+    def decode_stats(self) -> dict:
+        """Tokens streamed, and tokens never decoded because a stream was closed early"""
+        with self._rng_lock:
+            return {"tokens_streamed": self.tokens_streamed, "tokens_cancelled": self.tokens_cancelled}
+
+    def _respond(self, text: str, level: ExtractionLevel) -> LLMResponse:
+        view = TextView(text)
 
         # Find matching template
-        for template_name, template_info in self.response_templates.items():
-            if re.search(template_info["pattern"], text_lower):
-                return template_info["handler"](text, level)
+        template_name = self._dispatcher.match(view)
+        if template_name is not None:
+            response = self.response_templates[template_name]["handler"](view, level)
+        else:
+            # Default handler for unknown patterns
+            template_name = "generic"
+            response = self._handle_generic(view, level)
+
+        if response.relations and self._should_introduce_error(template_name, level):
+            self._reverse_relation(response)
+        return response
+
+    def _reverse_relation(self, response: LLMResponse):
+        """Injected extraction error: one relation is reported the wrong way round"""
+        with self._rng_lock:
+            index = self._error_rng.randrange(len(response.relations))
+        relation = response.relations[index]
+        response.relations[index] = TemporalRelation(
+            relation.event1, relation.event2,
+            _CONVERSE_RELATIONS.get(relation.relation, "after"), relation.confidence
+        )
+        response.metadata = dict(response.metadata or {}, likely_error=True)
 
-        # Default handler for unknown patterns
-        return self._handle_generic(text, level)
+    def _decode_seconds(self, response: LLMResponse) -> float:
+        tokens = -(-len(json.dumps(response.to_dict())) // MOCK_TOKEN_CHARS)
+        return tokens * self.latency.per_token_seconds
 
-    def _handle_medical_timeline(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _sample_latency(self, total_chars: int) -> float:
+        with self._rng_lock:
+            return self.latency.delay(total_chars, self._latency_rng)
+
+    def _handle_medical_timeline(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Handle medical timeline problems"""
         events = []
         relations = []
 
         # Extract events using simple pattern matching (simulating LLM)
-        if "admitted" in text.lower():
+        if "admitted" in view.lower:
             events.append(TemporalEvent(
                 name="admission",
                 description="Patient admitted to hospital"
             ))
 
-        if "surgery" in text.lower():
+        if "surgery" in view.lower:
             events.append(TemporalEvent(
                 name="surgery",
                 description="Surgical procedure"
             ))
 
-        if "discharged" in text.lower():
+        if "discharged" in view.lower:
             events.append(TemporalEvent(
                 name="discharge",
                 description="Patient discharged"
             ))
 
-        if "medication" in text.lower() or "treatment" in text.lower():
+        if "medication" in view.lower or "treatment" in view.lower:
             events.append(TemporalEvent(
                 name="treatment",
                 description="Medical treatment"
@@ -168,7 +494,7 @@ class MockLLM:
                 relations.append(TemporalRelation("surgery", "discharge", "before", 0.9))
 
         # Simulate LLM reasoning for answer
-        raw_answer = self._generate_medical_answer(text, events, relations, level)
+        raw_answer = self._generate_medical_answer(view.text, events, relations, level)
 
         return LLMResponse(
             events=events,
@@ -178,16 +504,13 @@ class MockLLM:
             metadata={"domain": "medical", "confidence": 0.85}
         )
 
-    def _handle_project_schedule(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _handle_project_schedule(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Handle project scheduling problems"""
         events = []
         relations = []
 
         # Extract tasks and meetings
-        task_pattern = r"(task|meeting|milestone|deadline)\s+(\w+)"
-        matches = re.finditer(task_pattern, text.lower())
-
-        for match in matches:
+        for match in _TASK_PATTERN.finditer(view.lower):
             event_type, event_name = match.groups()
             events.append(TemporalEvent(
                 name=event_name,
@@ -195,8 +518,8 @@ class MockLLM:
             ))
 
         # Look for temporal keywords
-        if "before" in text.lower():
-            words = text.lower().split()
+        if "before" in view.lower:
+            words = view.words
             before_idx = [i for i, w in enumerate(words) if w == "before"]
             for idx in before_idx:
                 if idx > 0 and idx < len(words) - 1:
@@ -205,7 +528,7 @@ class MockLLM:
                         words[idx-1], words[idx+1], "before", 0.7
                     ))
 
-        raw_answer = self._generate_project_answer(text, events, relations, level)
+        raw_answer = self._generate_project_answer(view.text, events, relations, level)
 
         return LLMResponse(
             events=events,
@@ -215,20 +538,16 @@ class MockLLM:
             metadata={"domain": "project_management", "confidence": 0.80}
         )
 
-    def _handle_event_sequence(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _handle_event_sequence(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Handle general event sequence problems"""
         events = []
         relations = []
 
         # Extract events from common patterns
         # Pattern: "First X, then Y, finally Z"
-        first_pattern = r"first[,\s]+([^,\.]+)"
-        then_pattern = r"then[,\s]+([^,\.]+)"
-        finally_pattern = r"finally[,\s]+([^,\.]+)"
-
-        first_match = re.search(first_pattern, text.lower())
-        then_match = re.search(then_pattern, text.lower())
-        finally_match = re.search(finally_pattern, text.lower())
+        first_match = _FIRST_PATTERN.search(view.lower)
+        then_match = _THEN_PATTERN.search(view.lower)
+        finally_match = _FINALLY_PATTERN.search(view.lower)
 
         event_names = []
         if first_match:
@@ -252,7 +571,7 @@ class MockLLM:
                 event_names[i], event_names[i+1], "before", 0.95
             ))
 
-        raw_answer = self._generate_sequence_answer(text, events, relations, level)
+        raw_answer = self._generate_sequence_answer(view.text, events, relations, level)
 
         return LLMResponse(
             events=events,
@@ -262,24 +581,21 @@ class MockLLM:
             metadata={"domain": "general", "confidence": 0.90}
         )
 
-    def _handle_duration_calculation(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _handle_duration_calculation(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Handle duration calculation problems (often has errors in pure LLM)"""
         events = []
         relations = []
 
         # Extract time values
-        time_pattern = r"(\d+)\s*(hour|minute|day|week|month)s?"
-        time_matches = re.finditer(time_pattern, text.lower())
-
         durations = []
-        for match in time_matches:
+        for match in _TIME_PATTERN.finditer(view.lower):
             value, unit = match.groups()
             durations.append(f"{value} {unit}s")
 
         # Simulate LLM attempting calculation (with potential errors at higher levels)
         if level == ExtractionLevel.LEVEL_3_CALCULATION:
             # LLM might make arithmetic errors
-            if self._should_introduce_error():
+            if self._should_introduce_error("duration_calculation", level):
                 raw_answer = "Based on the timeline, the total duration is approximately 15 hours."  # Intentional error
                 metadata = {"confidence": 0.6, "calculation_attempted": True, "likely_error": True}
             else:
@@ -300,16 +616,13 @@ class MockLLM:
             metadata=metadata
         )
 
-    def _handle_time_overlap(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _handle_time_overlap(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Handle temporal overlap problems"""
         events = []
         relations = []
 
         # Extract events
-        event_pattern = r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"
-        matches = re.finditer(event_pattern, text)
-
-        for i, match in enumerate(matches):
+        for i, match in enumerate(_CAPITALIZED_PATTERN.finditer(view.text)):
             event_name = match.group(1).lower().replace(" ", "_")
             events.append(TemporalEvent(
                 name=f"event_{i+1}",
@@ -317,13 +630,13 @@ class MockLLM:
             ))
 
         # Look for overlap indicators
-        if "overlap" in text.lower() or "simultaneously" in text.lower():
+        if "overlap" in view.lower or "simultaneously" in view.lower:
             if len(events) >= 2:
                 relations.append(TemporalRelation(
                     events[0].name, events[1].name, "overlaps", 0.85
                 ))
 
-        raw_answer = self._generate_overlap_answer(text, events, relations, level)
+        raw_answer = self._generate_overlap_answer(view.text, events, relations, level)
 
         return LLMResponse(
             events=events,
@@ -333,7 +646,7 @@ class MockLLM:
             metadata={"domain": "temporal_overlap", "confidence": 0.75}
         )
 
-    def _handle_generic(self, text: str, level: ExtractionLevel) -> LLMResponse:
+    def _handle_generic(self, view: TextView, level: ExtractionLevel) -> LLMResponse:
         """Generic handler for unrecognized patterns"""
         events = [
             TemporalEvent(name="event_unknown", description="Extracted event from text")
@@ -349,10 +662,13 @@ class MockLLM:
             metadata={"domain": "unknown", "confidence": 0.5}
         )
 
-    def _should_introduce_error(self) -> bool:
-        """Determine if an error should be introduced based on accuracy level"""
-        import random
-        return random.random() < self.current_error_rate
+    def _should_introduce_error(self, template: str, level: ExtractionLevel) -> bool:
+        """Determine if an error should be introduced, per the error model"""
+        rate = self.error_model.rate(template, level)
+        if rate <= 0.0:
+            return False
+        with self._rng_lock:
+            return self._error_rng.random() < rate
 
     def _generate_medical_answer(self, text: str, events: List[TemporalEvent],
                                  relations: List[TemporalRelation], level: ExtractionLevel) -> str:
@@ -403,18 +719,20 @@ class MockLLM:
         Returns:
             Natural language answer
         """
-        # Determine extraction level from question
-        if "how long" in question.lower() or "duration" in question.lower():
-            level = ExtractionLevel.LEVEL_3_CALCULATION
-        elif "order" in question.lower() or "sequence" in question.lower():
-            level = ExtractionLevel.LEVEL_2_ORDERING
-        else:
-            level = ExtractionLevel.LEVEL_1_EXTRACTION
-
-        response = self.extract_temporal_info(question, level)
+        response = self.extract_temporal_info(question, detect_query_level(question))
         return response.raw_answer
 
 
+def detect_query_level(question: str) -> ExtractionLevel:
+    """Extraction level MockLLM.query() uses for a plain question"""
+    question_lower = question.lower()
+    if "how long" in question_lower or "duration" in question_lower:
+        return ExtractionLevel.LEVEL_3_CALCULATION
+    elif "order" in question_lower or "sequence" in question_lower:
+        return ExtractionLevel.LEVEL_2_ORDERING
+    return ExtractionLevel.LEVEL_1_EXTRACTION
+
+
 if __name__ == "__main__":
     # Test the mock LLM
     print("=" * 60)
@@ -462,4 +780,19 @@ if __name__ == "__main__":
     print(f"Relations: {[(r.event1, r.relation, r.event2) for r in response.relations]}")
     print(f"Answer: {response.raw_answer}")
 
+    # Test Case 5: Seeded, latency-injecting mock for benchmarks
+    print("\n5. Seeded Mock with Error and Latency Models:")
+    print("-" * 60)
+    error_model = ErrorModel.for_accuracy("medium")
+    error_model.rates[("medical_timeline", ExtractionLevel.LEVEL_2_ORDERING)] = 0.5
+    latency = LatencyModel(base_seconds=0.005, jitter_seconds=0.005)
+    runs = []
+    for _ in range(2):
+        seeded = MockLLM(seed=7, error_model=error_model, latency=latency)
+        runs.append([bool(seeded.extract_temporal_info(medical_text, ExtractionLevel.LEVEL_2_ORDERING)
+                          .metadata.get("likely_error")) for _ in range(8)])
+    print(f"Injected errors, run 1: {runs[0]}")
+    print(f"Injected errors, run 2: {runs[1]}")
+    print(f"Reproducible: {runs[0] == runs[1]}")
+
     print("\n" + "=" * 60)
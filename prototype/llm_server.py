@@ -0,0 +1,259 @@
+"""
+Local HTTP LLM Stand-In
+
+Serves any LLMBackend (MockLLM by default) over a small JSON/HTTP API so the
+reasoner can be exercised against a network-bound backend in integration
+tests, and provides HTTPLLMBackend, the matching client.
+
+Endpoints:
+- POST /extract        {"text": str, "level": int}      -> LLMResponse dict
+- POST /extract_batch  {"texts": [str], "level": int}   -> {"responses": [...]}
+- GET  /health                                          -> {"status": "ok"}
+
+The server can add a fixed per-request latency to mimic a hosted model.
+The client keeps one persistent connection per thread and runs aextract()
+calls on a bounded thread pool, so many requests can be in flight at once.
+A request is retried once, on a fresh connection, only if the server closed
+or reset a kept-alive connection before sending any of the response.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence
+from urllib.parse import urlsplit
+import asyncio
+import http.client
+import json
+import threading
+import time
+
+from llm_interface import ExtractionLevel, LLMBackend, LLMResponse, MockLLM
+
+
+_POST_PATHS = ("/extract", "/extract_batch")
+
+# Failures of a stale keep-alive connection; RemoteDisconnected means the
+# server closed it without sending a status line
+_RETRYABLE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class _LLMRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            level = ExtractionLevel(request.get("level", ExtractionLevel.LEVEL_1_EXTRACTION.value))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._reply(400, {"error": f"Bad request: {e}"})
+            return
+        if self.path not in _POST_PATHS:
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        server: "LLMServer" = self.server.llm_server
+        if server.latency:
+            time.sleep(server.latency)
+        try:
+            if self.path == "/extract":
+                body = server.backend.extract_temporal_info(request["text"], level).to_dict()
+            else:
+                responses = server.backend.extract_batch(request["texts"], level)
+                body = {"responses": [response.to_dict() for response in responses]}
+        except KeyError as e:
+            self._reply(400, {"error": f"Missing field {e}"})
+            return
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+            return
+        with server.stats_lock:
+            server.requests_served += 1
+        self._reply(200, body)
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # keep test output quiet
+
+
+class LLMServer:
+    """Threaded HTTP server exposing an LLMBackend"""
+
+    def __init__(self, backend: Optional[LLMBackend] = None, host: str = "127.0.0.1",
+                 port: int = 0, latency: float = 0.0):
+        """
+        Initialize server (call start() or use as a context manager).
+
+        Args:
+            backend: Backend answering requests (default: MockLLM())
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds added to every extraction request
+        """
+        self.backend = backend if backend is not None else MockLLM()
+        self.latency = latency
+        self.requests_served = 0
+        self.stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _LLMRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.llm_server = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LLMServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                            name="llm-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LLMServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class HTTPLLMBackend:
+    """LLMBackend client for LLMServer (or any server speaking the same API)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0, max_in_flight: int = 32,
+                 backend_version: Optional[str] = None):
+        """
+        Initialize client.
+
+        Args:
+            base_url: Server URL, e.g. LLMServer.url
+            timeout: Per-request socket timeout in seconds
+            max_in_flight: Maximum concurrent aextract() requests
+            backend_version: Identity of the model behind the server, for
+                cache keys (default: the server address; set it when the
+                served model changes)
+        """
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.backend_version = backend_version or f"http://{self.host}:{self.port}"
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="llm-http")
+
+    def extract_temporal_info(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        return LLMResponse.from_dict(self._post("/extract", {"text": text, "level": level.value}))
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        body = self._post("/extract_batch", {"texts": list(texts), "level": level.value})
+        return [LLMResponse.from_dict(response) for response in body["responses"]]
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        return await asyncio.wrap_future(self._executor.submit(self.extract_temporal_info, text, level))
+
+    def close(self):
+        """Wait for in-flight aextract() calls, then close every thread's connection"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _post(self, path: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            connection = self._connection()
+            response = None
+            try:
+                connection.request("POST", path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except _RETRYABLE_ERRORS:
+                self._discard(connection)
+                # Reconnect once, unless the server had started answering
+                if attempt or response is not None:
+                    raise
+            except BaseException:
+                # Timeouts and other failures leave the connection in an unknown state
+                self._discard(connection)
+                raise
+        if response.status != 200:
+            raise RuntimeError(f"LLM server error {response.status} on {path}: {data[:200]!r}")
+        return json.loads(data)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _discard(self, connection: http.client.HTTPConnection):
+        connection.close()
+        self._local.connection = None
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("HTTP LLM Stand-In - Example")
+    print("=" * 80)
+
+    questions = [
+        "The patient was admitted, received medication treatment and was discharged. What is the order of events?",
+        "First, the team prepared the presentation. Then, they held the meeting. Finally, they sent the email. What is the order?",
+    ] * 8
+
+    with LLMServer(latency=0.05) as server:
+        client = HTTPLLMBackend(server.url)
+        print(f"\nServer at {server.url}")
+
+        started = time.perf_counter()
+        for question in questions:
+            client.extract_temporal_info(question, ExtractionLevel.LEVEL_2_ORDERING)
+        print(f"Sequential: {len(questions)} requests in {time.perf_counter() - started:.2f}s")
+
+        async def concurrent():
+            return await asyncio.gather(*(client.aextract(q, ExtractionLevel.LEVEL_2_ORDERING) for q in questions))
+
+        started = time.perf_counter()
+        responses = asyncio.run(concurrent())
+        print(f"Concurrent: {len(responses)} requests in {time.perf_counter() - started:.2f}s")
+
+        batch = client.extract_batch(questions[:2], ExtractionLevel.LEVEL_2_ORDERING)
+        print(f"Batch answers: {[response.raw_answer for response in batch]}")
+        client.close()
+
+    print("\n" + "=" * 80)
@@ -6,10 +6,24 @@ to final answer, enabling transparent explanations and debugging.
 """
 
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable, Iterable, Iterator, Mapping
 from enum import Enum
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime
+import hashlib
+import html
 import json
+import queue
+import random
+import threading
+import time
+import weakref
+
+from caching import LRUCache
+from streaming_stats import LatencyHistogram, QuantileSketch, RunningStats
 
 
 class ReasoningStep(Enum):
@@ -22,6 +36,86 @@ class ReasoningStep(Enum):
     VERIFICATION = "verification"
     CONFLICT_RESOLUTION = "conflict_resolution"
     FINAL_ANSWER = "final_answer"
+    CACHE_REUSE = "cache_reuse"
+
+
+# Weights used for chain-level confidence; critical steps count more heavily
+STEP_WEIGHTS = {
+    ReasoningStep.LLM_EXTRACTION: 0.3,
+    ReasoningStep.SYMBOLIC_CONSTRAINT: 0.2,
+    ReasoningStep.SYMBOLIC_SOLVING: 0.3,
+    ReasoningStep.VERIFICATION: 0.2,
+}
+DEFAULT_STEP_WEIGHT = 0.1
+
+# Pipeline stage reported for each step type in latency breakdowns
+STAGE_NAMES = {
+    ReasoningStep.LLM_EXTRACTION: "llm_extraction",
+    ReasoningStep.LLM_INFERENCE: "llm_inference",
+    ReasoningStep.SYMBOLIC_CONSTRAINT: "conversion",
+    ReasoningStep.SYMBOLIC_PROPAGATION: "propagation",
+    ReasoningStep.SYMBOLIC_SOLVING: "solving",
+    ReasoningStep.VERIFICATION: "verification",
+    ReasoningStep.CONFLICT_RESOLUTION: "conflict_resolution",
+    ReasoningStep.FINAL_ANSWER: "final_answer",
+    ReasoningStep.CACHE_REUSE: "cache_reuse",
+}
+
+
+class CapturePolicy(Enum):
+    """How much of each chain the tracker keeps"""
+    FULL = "full"              # every step with complete payloads
+    SUMMARY = "summary"        # steps, confidences and timings; no payloads
+    SAMPLED = "sampled"        # FULL for a sample of tasks, SUMMARY otherwise
+    ON_ANOMALY = "on_anomaly"  # payloads kept only for conflicting / low-confidence tasks
+
+
+@dataclass
+class CaptureConfig:
+    """Capture policy settings for a ProvenanceTracker"""
+    policy: CapturePolicy = CapturePolicy.FULL
+    sample_rate: float = 0.1  # SAMPLED: fraction of tasks captured in full
+    confidence_threshold: float = 0.6  # ON_ANOMALY: steps below this mark the task anomalous
+    seed: Optional[int] = None  # SAMPLED: seed for reproducible sampling
+
+
+# Capture modes decided per chain at start_task()
+_CAPTURE_FULL = "full"
+_CAPTURE_SUMMARY = "summary"
+_CAPTURE_DEFERRED = "deferred"
+
+
+class LazyPayload:
+    """
+    Payload value that is built only if the capture policy keeps it.
+
+    Pass as input_data/output_data (or as one of their values) to
+    record_step(); `size` lets descriptions report counts without building.
+    """
+
+    __slots__ = ("builder", "size")
+
+    def __init__(self, builder: Callable[[], Any], size: Optional[int] = None):
+        self.builder = builder
+        self.size = size
+
+    def build(self) -> Any:
+        return self.builder()
+
+    def __len__(self) -> int:
+        return self.size if self.size is not None else len(self.build())
+
+
+def _resolve_payload(payload: Any) -> Dict[str, Any]:
+    """Build a payload, including any LazyPayload values one level down"""
+    if isinstance(payload, LazyPayload):
+        payload = payload.build()
+    if not payload:
+        return {}
+    if any(isinstance(value, LazyPayload) for value in payload.values()):
+        payload = {key: value.build() if isinstance(value, LazyPayload) else value
+                   for key, value in payload.items()}
+    return payload
 
 
 @dataclass
@@ -36,10 +130,36 @@ class ProvenanceNode:
     confidence: float = 1.0
     parent_ids: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Content digests of the payloads, set when the tracker deduplicates them
+    input_digest: Optional[str] = None
+    output_digest: Optional[str] = None
+    metadata_digest: Optional[str] = None
+    # Monotonic step timing (time.perf_counter_ns), comparable within a process
+    start_ns: Optional[int] = None
+    end_ns: Optional[int] = None
+    # Merkle leaf content: hash of the node's fields, payload digests and parent hashes
+    content_hash: Optional[str] = None
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        if self.start_ns is None or self.end_ns is None:
+            return None
+        return self.end_ns - self.start_ns
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        duration = self.duration_ns
+        return duration / 1e6 if duration is not None else None
+
+    def to_dict(self, payload_refs: bool = False) -> dict:
+        """
+        Convert to dictionary for serialization.
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization"""
-        return {
+        Args:
+            payload_refs: Emit payload digests instead of the payloads themselves
+                (only for payloads that have a digest)
+        """
+        data = {
             "step_id": self.step_id,
             "step_type": self.step_type.value,
             "timestamp": self.timestamp,
@@ -50,6 +170,55 @@ class ProvenanceNode:
             "parent_ids": self.parent_ids,
             "metadata": self.metadata
         }
+        for key, digest in (("input", self.input_digest),
+                            ("output", self.output_digest),
+                            ("metadata", self.metadata_digest)):
+            if digest is None:
+                continue
+            data_key = key if key == "metadata" else f"{key}_data"
+            if payload_refs:
+                del data[data_key]
+            data[f"{key}_digest"] = digest
+        if self.start_ns is not None:
+            data["start_ns"] = self.start_ns
+            data["end_ns"] = self.end_ns
+        if self.content_hash is not None:
+            data["content_hash"] = self.content_hash
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, blobs: Optional[Dict[str, Dict[str, Any]]] = None) -> "ProvenanceNode":
+        """
+        Reconstruct a node from its dictionary form.
+
+        Args:
+            data: Dictionary produced by to_dict()
+            blobs: Digest -> payload table used to resolve payload references
+        """
+        def payload(data_key: str, digest_key: str) -> Dict[str, Any]:
+            if data_key in data:
+                return data[data_key]
+            if blobs is None or data.get(digest_key) not in blobs:
+                raise ValueError(f"Unresolved payload reference {data.get(digest_key)} in {data['step_id']}")
+            return blobs[data[digest_key]]
+
+        return cls(
+            step_id=data["step_id"],
+            step_type=ReasoningStep(data["step_type"]),
+            timestamp=data["timestamp"],
+            description=data["description"],
+            input_data=payload("input_data", "input_digest"),
+            output_data=payload("output_data", "output_digest"),
+            confidence=data.get("confidence", 1.0),
+            parent_ids=list(data.get("parent_ids", [])),
+            metadata=payload("metadata", "metadata_digest"),
+            input_digest=data.get("input_digest"),
+            output_digest=data.get("output_digest"),
+            metadata_digest=data.get("metadata_digest"),
+            start_ns=data.get("start_ns"),
+            end_ns=data.get("end_ns"),
+            content_hash=data.get("content_hash")
+        )
 
 
 @dataclass
@@ -63,71 +232,1048 @@ class ProvenanceChain:
     final_answer: Optional[str] = None
     success: bool = True
     error_message: Optional[str] = None
+    # Bumped on every change; used to invalidate cached explanations
+    version: int = field(default=0, compare=False, repr=False)
+    # Running sums for O(1) confidence reads
+    weighted_confidence: float = field(default=0.0, compare=False, repr=False)
+    total_weight: float = field(default=0.0, compare=False, repr=False)
+    step_counter: int = field(default=0, compare=False, repr=False)
+    # Capture mode chosen by the tracker's CapturePolicy ("full", "summary", "deferred")
+    capture: str = field(default=_CAPTURE_FULL, compare=False, repr=False)
+    anomalous: bool = field(default=False, compare=False, repr=False)
+    # step_id -> (input, output) payload builders awaiting an ON_ANOMALY decision
+    deferred_payloads: Dict[str, Tuple[Any, Any]] = field(default_factory=dict, compare=False, repr=False)
+    step_index: Dict[str, int] = field(default_factory=dict, compare=False, repr=False)
+    # Merkle tree over node content hashes (RFC 6962), maintained when tamper_evident;
+    # the chain header (see chain_header_hash) is always the last leaf
+    tamper_evident: bool = field(default=False, compare=False, repr=False)
+    merkle_leaves: List[bytes] = field(default_factory=list, compare=False, repr=False)
+    merkle_peaks: List[Tuple[int, bytes]] = field(default_factory=list, compare=False, repr=False)
+    # Root a chain was exported with; what verify() checks against after from_dict()
+    recorded_root: Optional[str] = field(default=None, compare=False, repr=False)
 
     def add_node(self, node: ProvenanceNode):
         """Add a provenance node to the chain"""
+        self.step_index[node.step_id] = len(self.nodes)
         self.nodes.append(node)
+        self.version += 1
+        weight = STEP_WEIGHTS.get(node.step_type, DEFAULT_STEP_WEIGHT)
+        self.weighted_confidence += node.confidence * weight
+        self.total_weight += weight
+        if self.tamper_evident and self.capture != _CAPTURE_DEFERRED:
+            self._append_leaf(node)
+
+    def _parent_hashes(self, node: ProvenanceNode) -> List[Optional[str]]:
+        hashes = []
+        for parent_id in node.parent_ids:
+            position = self.step_index.get(parent_id)
+            hashes.append(self.nodes[position].content_hash if position is not None else None)
+        return hashes
+
+    def _append_leaf(self, node: ProvenanceNode):
+        """Hash a node (unless it carries a hash already) and fold it into the peaks"""
+        if node.content_hash is None:
+            node.content_hash = node_content_hash(node, self._parent_hashes(node))
+        leaf = _merkle_leaf(bytes.fromhex(node.content_hash))
+        self.merkle_leaves.append(leaf)
+        _push_peak(self.merkle_peaks, leaf)
+
+    def _header_leaf(self) -> bytes:
+        return _merkle_leaf(bytes.fromhex(chain_header_hash(self)))
+
+    def rebuild_merkle(self, rehash: bool = True):
+        """Recompute the Merkle tree, e.g. once deferred payloads are final"""
+        self.merkle_leaves = []
+        self.merkle_peaks = []
+        for node in self.nodes:
+            if rehash:
+                node.content_hash = None
+            self._append_leaf(node)
+        self.version += 1
+
+    def merkle_root(self) -> Optional[str]:
+        """RFC 6962 root over the node hashes and the header; None unless tamper_evident"""
+        if not self.tamper_evident:
+            return None
+        peaks = list(self.merkle_peaks)
+        _push_peak(peaks, self._header_leaf())
+        return _fold_peaks(peaks).hex()
+
+    def inclusion_proof(self, step_id: str) -> "MerkleProof":
+        """Audit path proving that `step_id` is part of the tree with merkle_root()"""
+        position = self.step_index.get(step_id)
+        if not self.tamper_evident or position is None or position >= len(self.merkle_leaves):
+            raise KeyError(f"No hashed step {step_id} in {self.task_id}")
+        leaves = self.merkle_leaves + [self._header_leaf()]
+        return MerkleProof(
+            step_id=step_id,
+            leaf_index=position,
+            tree_size=len(leaves),
+            content_hash=self.nodes[position].content_hash,
+            audit_path=[h.hex() for h in _audit_path(position, leaves)]
+        )
+
+    def verify(self, expected_root: Optional[str] = None) -> bool:
+        """
+        Recompute every node hash and the header hash from the content and
+        check them against the recorded node hashes and a root: `expected_root`
+        (e.g. a published one), else the root the chain was imported with,
+        else the current one.
+        """
+        if not self.tamper_evident:
+            return False
+        recomputed: Dict[str, str] = {}
+        peaks: List[Tuple[int, bytes]] = []
+        for node in self.nodes:
+            parents = [recomputed.get(parent_id) if parent_id in self.step_index else None
+                       for parent_id in node.parent_ids]
+            content_hash = node_content_hash(node, parents, trust_digests=False)
+            if content_hash != node.content_hash:
+                return False
+            recomputed[node.step_id] = content_hash
+            _push_peak(peaks, _merkle_leaf(bytes.fromhex(content_hash)))
+        _push_peak(peaks, self._header_leaf())
+        root = _fold_peaks(peaks).hex()
+        return root == (expected_root or self.recorded_root or self.merkle_root())
+
+    def confidence_score(self) -> float:
+        """Weighted average confidence of all steps, maintained incrementally"""
+        if self.total_weight == 0:
+            return 0.0
+        return self.weighted_confidence / self.total_weight
 
     def get_node(self, step_id: str) -> Optional[ProvenanceNode]:
         """Retrieve a specific node by ID"""
-        for node in self.nodes:
-            if node.step_id == step_id:
-                return node
-        return None
+        position = self.step_index.get(step_id)
+        return self.nodes[position] if position is not None else None
 
     def get_nodes_by_type(self, step_type: ReasoningStep) -> List[ProvenanceNode]:
         """Get all nodes of a specific type"""
         return [node for node in self.nodes if node.step_type == step_type]
 
-    def to_dict(self) -> dict:
+    def stage_latencies(self) -> Dict[str, int]:
+        """Time spent per pipeline stage in nanoseconds (see STAGE_NAMES)"""
+        latencies: Dict[str, int] = {}
+        for node in self.nodes:
+            duration = node.duration_ns
+            if duration is not None:
+                stage = STAGE_NAMES.get(node.step_type, node.step_type.value)
+                latencies[stage] = latencies.get(stage, 0) + duration
+        return latencies
+
+    def total_latency_ns(self) -> Optional[int]:
+        """Wall time from the first timed step's start to the last one's end"""
+        timed = [node for node in self.nodes if node.duration_ns is not None]
+        if not timed:
+            return None
+        return max(node.end_ns for node in timed) - min(node.start_ns for node in timed)
+
+    def to_dict(self, payload_refs: bool = False) -> dict:
         """Convert to dictionary for serialization"""
-        return {
+        data = {
             "task_id": self.task_id,
             "task_description": self.task_description,
             "start_time": self.start_time,
             "end_time": self.end_time,
-            "nodes": [node.to_dict() for node in self.nodes],
+            "nodes": [node.to_dict(payload_refs) for node in self.nodes],
             "final_answer": self.final_answer,
             "success": self.success,
             "error_message": self.error_message
         }
+        if self.tamper_evident:
+            data["merkle_root"] = self.merkle_root()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, blobs: Optional[Dict[str, Dict[str, Any]]] = None) -> "ProvenanceChain":
+        """
+        Reconstruct a chain from its dictionary form. Recorded node hashes and
+        the root are kept as-is; use verify() to check them against the content.
+        """
+        chain = cls(
+            task_id=data["task_id"],
+            task_description=data["task_description"],
+            start_time=data["start_time"],
+            end_time=data.get("end_time"),
+            final_answer=data.get("final_answer"),
+            success=data.get("success", True),
+            error_message=data.get("error_message"),
+            tamper_evident="merkle_root" in data,
+            recorded_root=data.get("merkle_root")
+        )
+        for node_data in data.get("nodes", []):
+            chain.add_node(ProvenanceNode.from_dict(node_data, blobs))
+        return chain
 
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON string"""
         return json.dumps(self.to_dict(), indent=indent)
 
 
+def canonical_payload(payload: Dict[str, Any]) -> bytes:
+    """Canonical byte encoding of a payload (sorted keys, no whitespace)"""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def payload_digest(payload: Dict[str, Any]) -> str:
+    """SHA-256 content digest of a payload"""
+    return hashlib.sha256(canonical_payload(payload)).hexdigest()
+
+
+def node_content_hash(node: ProvenanceNode, parent_hashes: List[Optional[str]],
+                      trust_digests: bool = True) -> str:
+    """
+    Hash of a node's canonical fields, payload digests and parent hashes.
+    Parents outside the node's chain (parent hash None) are bound by step ID.
+    Only this node's payloads are serialized, never the whole chain, and not
+    even those when the blob store already digested them (trust_digests).
+    """
+    def digest(payload: Dict[str, Any], stored: Optional[str]) -> str:
+        return stored if trust_digests and stored is not None else payload_digest(payload)
+
+    return payload_digest({
+        "step_id": node.step_id,
+        "step_type": node.step_type.value,
+        "timestamp": node.timestamp,
+        "description": node.description,
+        "confidence": node.confidence,
+        "start_ns": node.start_ns,
+        "end_ns": node.end_ns,
+        "input": digest(node.input_data, node.input_digest),
+        "output": digest(node.output_data, node.output_digest),
+        "metadata": digest(node.metadata, node.metadata_digest),
+        "parents": [parent_hash or f"ref:{parent_id}"
+                    for parent_id, parent_hash in zip(node.parent_ids, parent_hashes)]
+    })
+
+
+def chain_header_hash(chain: ProvenanceChain) -> str:
+    """Hash of the chain fields outside its nodes, including the outcome"""
+    return payload_digest({
+        "task_id": chain.task_id,
+        "task_description": chain.task_description,
+        "final_answer": chain.final_answer,
+        "success": chain.success,
+        "error_message": chain.error_message
+    })
+
+
+def _merkle_leaf(content: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + content).digest()
+
+
+def _merkle_parent(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _push_peak(peaks: List[Tuple[int, bytes]], leaf: bytes):
+    """Append a leaf to the perfect subtrees of a Merkle tree, merging equal sizes"""
+    peaks.append((1, leaf))
+    while len(peaks) > 1 and peaks[-1][0] == peaks[-2][0]:
+        size, right = peaks.pop()
+        _, left = peaks.pop()
+        peaks.append((size * 2, _merkle_parent(left, right)))
+
+
+def _fold_peaks(peaks: List[Tuple[int, bytes]]) -> bytes:
+    """Root of a tree given as its perfect subtrees, largest first"""
+    root = peaks[-1][1]
+    for _, peak in reversed(peaks[:-1]):
+        root = _merkle_parent(peak, root)
+    return root
+
+
+def _merkle_tree_hash(leaves: List[bytes]) -> bytes:
+    if len(leaves) == 1:
+        return leaves[0]
+    split = 1 << ((len(leaves) - 1).bit_length() - 1)  # largest power of two < n
+    return _merkle_parent(_merkle_tree_hash(leaves[:split]), _merkle_tree_hash(leaves[split:]))
+
+
+def _audit_path(index: int, leaves: List[bytes]) -> List[bytes]:
+    """RFC 6962 PATH(m, D[n]) over leaf hashes"""
+    if len(leaves) <= 1:
+        return []
+    split = 1 << ((len(leaves) - 1).bit_length() - 1)
+    if index < split:
+        return _audit_path(index, leaves[:split]) + [_merkle_tree_hash(leaves[split:])]
+    return _audit_path(index - split, leaves[split:]) + [_merkle_tree_hash(leaves[:split])]
+
+
+@dataclass
+class MerkleProof:
+    """Inclusion proof of one step in a chain's Merkle tree"""
+    step_id: str
+    leaf_index: int
+    tree_size: int
+    content_hash: str
+    audit_path: List[str]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def verify_inclusion(proof: MerkleProof, root: str) -> bool:
+    """Check an inclusion proof against a Merkle root (RFC 9162, 2.1.3.2)"""
+    if proof.leaf_index >= proof.tree_size:
+        return False
+    index, last = proof.leaf_index, proof.tree_size - 1
+    digest = _merkle_leaf(bytes.fromhex(proof.content_hash))
+    for sibling_hex in proof.audit_path:
+        if last == 0:
+            return False
+        sibling = bytes.fromhex(sibling_hex)
+        if index & 1 or index == last:
+            digest = _merkle_parent(sibling, digest)
+            if not index & 1:
+                while not index & 1 and index != 0:
+                    index >>= 1
+                    last >>= 1
+        else:
+            digest = _merkle_parent(digest, sibling)
+        index >>= 1
+        last >>= 1
+    return last == 0 and digest.hex() == root
+
+
+def _verify_chain_batch(batch: List[Tuple[dict, Optional[str]]]) -> List[bool]:
+    """Worker entry point for verify_chains()"""
+    return [ProvenanceChain.from_dict(data).verify(root) for data, root in batch]
+
+
+def verify_chains(chains: List[ProvenanceChain],
+                  expected_roots: Optional[Dict[str, str]] = None,
+                  workers: Optional[int] = None,
+                  batch_size: int = 64,
+                  inline_threshold: int = 128) -> Dict[str, bool]:
+    """
+    Verify many tamper-evident chains, in parallel for large batches.
+
+    Args:
+        chains: Chains to verify
+        expected_roots: Optional task_id -> trusted root (e.g. from an audit log)
+        workers: Verification processes (default: CPU count)
+        batch_size: Chains per worker task
+        inline_threshold: Fewer chains than this are verified in-process
+
+    Returns:
+        task_id -> whether the chain is intact
+    """
+    expected_roots = expected_roots or {}
+    if (workers or 0) == 1 or len(chains) < inline_threshold:
+        return {c.task_id: c.verify(expected_roots.get(c.task_id)) for c in chains}
+
+    items = [(c.to_dict(), expected_roots.get(c.task_id)) for c in chains]
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    results: Dict[str, bool] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch, verdicts in zip(batches, pool.map(_verify_chain_batch, batches)):
+            for (data, _), verdict in zip(batch, verdicts):
+                results[data["task_id"]] = verdict
+    return results
+
+
+class PayloadBlobStore:
+    """
+    Content-addressed payload table shared by all chains of a tracker.
+
+    Each distinct payload is stored once under its SHA-256 digest; nodes that
+    record an identical payload share the stored object and keep its digest.
+    Stored payloads must be treated as immutable.
+    """
+
+    def __init__(self):
+        self.blobs: Dict[str, Dict[str, Any]] = {}
+        self.blob_sizes: Dict[str, int] = {}
+        self.ref_counts: Dict[str, int] = {}
+        self.total_refs = 0
+        self.referenced_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Store a payload if not already present.
+
+        Returns:
+            (digest, shared payload object)
+        """
+        data = canonical_payload(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest not in self.blobs:
+                self.blobs[digest] = payload
+                self.blob_sizes[digest] = len(data)
+                self.ref_counts[digest] = 0
+            self.ref_counts[digest] += 1
+            self.total_refs += 1
+            self.referenced_bytes += len(data)
+            return digest, self.blobs[digest]
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Look up a payload by digest"""
+        return self.blobs.get(digest)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.blobs
+
+    def __len__(self) -> int:
+        return len(self.blobs)
+
+    def stats(self) -> dict:
+        """Deduplication statistics"""
+        stored_bytes = sum(self.blob_sizes.values())
+        return {
+            "unique_blobs": len(self.blobs),
+            "total_refs": self.total_refs,
+            "duplicate_refs": self.total_refs - len(self.blobs),
+            "stored_bytes": stored_bytes,
+            "referenced_bytes": self.referenced_bytes,
+            "saved_bytes": self.referenced_bytes - stored_bytes,
+            "dedup_ratio": self.referenced_bytes / stored_bytes if stored_bytes else 1.0
+        }
+
+
+class ConfidenceStats:
+    """Streaming confidence statistics for one aggregation key"""
+
+    __slots__ = ("stats", "sketch")
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+
+    def add(self, confidence: float):
+        self.stats.add(confidence)
+        self.sketch.add(confidence)
+
+    def to_dict(self) -> dict:
+        stats = self.stats
+        return {
+            "count": stats.count,
+            "mean": stats.mean,
+            "variance": stats.variance,
+            "stddev": stats.stddev,
+            "min": stats.min if stats.count else 0.0,
+            "max": stats.max if stats.count else 0.0,
+            "p50": self.sketch.quantile(0.5),
+            "p90": self.sketch.quantile(0.9),
+            "p99": self.sketch.quantile(0.99)
+        }
+
+
+class LatencyAggregator:
+    """Per-stage latency histograms across all chains of a tracker"""
+
+    def __init__(self):
+        self._by_stage: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def add_step(self, node: "ProvenanceNode"):
+        duration = node.duration_ns
+        if duration is None:
+            return
+        stage = STAGE_NAMES.get(node.step_type, node.step_type.value)
+        with self._lock:
+            histogram = self._by_stage.get(stage)
+            if histogram is None:
+                histogram = self._by_stage[stage] = LatencyHistogram()
+            histogram.add(duration)
+
+    def histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        return self._by_stage.get(stage)
+
+    def by_stage(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: histogram.to_dict() for stage, histogram in self._by_stage.items()}
+
+
+class ConfidenceAggregator:
+    """
+    Online confidence aggregation across chains.
+
+    Step confidences are aggregated by step type as nodes are recorded;
+    chain-level confidence scores are aggregated by domain and by wall-clock
+    time window when tasks end.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, max_windows: int = 1440):
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+        self._by_step_type: Dict[ReasoningStep, ConfidenceStats] = {}
+        self._by_domain: Dict[str, ConfidenceStats] = {}
+        self._by_window: Dict[float, ConfidenceStats] = {}
+        self._chain_domains: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add_step(self, task_id: str, node: "ProvenanceNode"):
+        with self._lock:
+            stats = self._by_step_type.get(node.step_type)
+            if stats is None:
+                stats = self._by_step_type[node.step_type] = ConfidenceStats()
+            stats.add(node.confidence)
+            domain = node.metadata.get("domain")
+            if domain and task_id not in self._chain_domains:
+                self._chain_domains[task_id] = domain
+
+    def add_chain(self, task_id: str, confidence: float, wall_time: float):
+        with self._lock:
+            domain = self._chain_domains.pop(task_id, "unknown")
+            stats = self._by_domain.get(domain)
+            if stats is None:
+                stats = self._by_domain[domain] = ConfidenceStats()
+            stats.add(confidence)
+
+            window = wall_time - wall_time % self.window_seconds
+            stats = self._by_window.get(window)
+            if stats is None:
+                stats = self._by_window[window] = ConfidenceStats()
+                while len(self._by_window) > self.max_windows:
+                    del self._by_window[min(self._by_window)]
+            stats.add(confidence)
+
+    def by_step_type(self) -> Dict[str, dict]:
+        with self._lock:
+            return {step.value: stats.to_dict() for step, stats in self._by_step_type.items()}
+
+    def by_domain(self) -> Dict[str, dict]:
+        with self._lock:
+            return {domain: stats.to_dict() for domain, stats in self._by_domain.items()}
+
+    def by_window(self) -> Dict[str, dict]:
+        with self._lock:
+            return {datetime.fromtimestamp(window).isoformat(): self._by_window[window].to_dict()
+                    for window in sorted(self._by_window)}
+
+
+class AsyncProvenanceRecorder:
+    """
+    Background recorder that materializes provenance step events off the
+    reasoning path.
+
+    Producers push compact step tuples into a bounded queue; a single daemon
+    thread applies them to the sink in submission order. When the queue is
+    full, submit() blocks (backpressure) and the wait is counted in stats().
+    A failing event does not stop the thread: every error is kept in
+    `errors`, and the first one not yet reported is re-raised by the next
+    flush() or close().
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink: Callable[..., None], max_queue_size: int = 1024):
+        """
+        Args:
+            sink: Callable applied to each submitted event tuple
+            max_queue_size: Bound on pending events before producers block
+        """
+        self._sink = sink
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        # Held from the closed check to the enqueue, so no event can land behind _STOP
+        self._submit_lock = threading.Lock()
+        self._pending_error: Optional[BaseException] = None
+        self.max_queue_size = max_queue_size
+        self.submitted = 0
+        self.materialized = 0
+        self.blocked_submits = 0
+        self.blocked_ns = 0
+        self.max_depth = 0
+        self.errors: List[str] = []
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="provenance-recorder", daemon=True)
+        self._thread.start()
+
+    def submit(self, event: tuple):
+        """Queue an event, blocking while the queue is full"""
+        blocked_ns = None
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Recorder is closed")
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                wait_start = time.perf_counter_ns()
+                self._queue.put(event)
+                blocked_ns = time.perf_counter_ns() - wait_start
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self.submitted += 1
+            if blocked_ns is not None:
+                self.blocked_submits += 1
+                self.blocked_ns += blocked_ns
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is self._STOP:
+                    return
+                self._sink(*event)
+                self.materialized += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.errors.append(f"{type(e).__name__}: {e}")
+                    if self._pending_error is None:
+                        self._pending_error = e
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every submitted event has been materialized; re-raises a sink error"""
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self):
+        """Flush pending events and stop the background thread; re-raises a sink error"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self):
+        with self._stats_lock:
+            error, self._pending_error = self._pending_error, None
+        if error is not None:
+            raise error
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> dict:
+        """Queue and backpressure metrics"""
+        return {
+            "submitted": self.submitted,
+            "materialized": self.materialized,
+            "pending": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "max_queue_size": self.max_queue_size,
+            "blocked_submits": self.blocked_submits,
+            "blocked_ms": self.blocked_ns / 1e6,
+            "errors": len(self.errors)
+        }
+
+
+class LazyExplanation:
+    """
+    Handle to a chain explanation that is rendered on first use.
+
+    The rendered text is cached by the tracker per chain version, so repeated
+    reads are free until the chain changes. Behaves like a read-only string
+    (str(), ==, len, in, slicing and str methods); iter_lines() streams the
+    explanation without building the whole report. Copying or pickling it
+    (copy, deepcopy, dataclasses.asdict, pickle) yields the rendered str,
+    so results holding one do not drag the tracker along.
+    """
+
+    def __init__(self, tracker: "ProvenanceTracker", task_id: str, format: str = "text"):
+        self.tracker = tracker
+        self.task_id = task_id
+        self.format = format
+
+    def render(self) -> str:
+        """Render (or fetch the cached) explanation"""
+        return self.tracker.generate_explanation(self.task_id, self.format)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Stream the explanation line by line (text) or chunk by chunk (html)"""
+        return self.tracker.iter_explanation(self.task_id, self.format)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f"LazyExplanation(task_id={self.task_id!r}, format={self.format!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyExplanation):
+            other = other.render()
+        return self.render() == other
+
+    def __hash__(self) -> int:
+        return hash(self.render())
+
+    def __len__(self) -> int:
+        return len(self.render())
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.render()
+
+    def __getitem__(self, key):
+        return self.render()[key]
+
+    def __reduce__(self):
+        return str, (self.render(),)
+
+    def __getattr__(self, name: str):
+        # Delegate public str methods (split, startswith, ...) to the rendered
+        # text; private and dunder lookups (copy/pickle protocol probes, or
+        # attributes of a half-built instance) must not trigger a render
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.render(), name)
+
+
+class ChainChangeLog:
+    """Task IDs whose chains were registered or grew since the last take()"""
+
+    def __init__(self, task_ids: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._changed = set(task_ids)
+
+    def add(self, task_id: str):
+        with self._lock:
+            self._changed.add(task_id)
+
+    def take(self) -> Set[str]:
+        """Changed task IDs, clearing the log"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+
+class ShardedChainRegistry(MutableMapping):
+    """
+    Task ID -> ProvenanceChain mapping split into lock-striped shards.
+
+    Writes take only their shard's lock, so many threads can register and
+    update chains concurrently; lock_for() exposes the stripe guarding a
+    task for callers that mutate its chain. Readers that index chains
+    incrementally can watch() the registry instead of rescanning it.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._shards: List[Dict[str, ProvenanceChain]] = [{} for _ in range(shards)]
+        self._locks = [threading.RLock() for _ in range(shards)]
+        self._watchers: "weakref.WeakSet[ChainChangeLog]" = weakref.WeakSet()
+        self._watchers_lock = threading.Lock()
+
+    def watch(self) -> ChainChangeLog:
+        """
+        A change log that receives the task ID of every chain registered or
+        extended from now on; it starts out holding every current task ID.
+        The registry only keeps a weak reference to it.
+        """
+        with self._watchers_lock:
+            log = ChainChangeLog(self)
+            self._watchers.add(log)
+        return log
+
+    def mark_changed(self, task_id: str):
+        """Record that a task's chain changed (called after nodes are added)"""
+        if not self._watchers:
+            return
+        with self._watchers_lock:
+            for log in self._watchers:
+                log.add(task_id)
+
+    def _shard(self, task_id: str) -> int:
+        return hash(task_id) % len(self._shards)
+
+    def lock_for(self, task_id: str) -> threading.RLock:
+        return self._locks[self._shard(task_id)]
+
+    def __getitem__(self, task_id: str) -> ProvenanceChain:
+        return self._shards[self._shard(task_id)][task_id]
+
+    def __setitem__(self, task_id: str, chain: ProvenanceChain):
+        index = self._shard(task_id)
+        with self._locks[index]:
+            self._shards[index][task_id] = chain
+        self.mark_changed(task_id)
+
+    def __delitem__(self, task_id: str):
+        index = self._shard(task_id)
+        with self._locks[index]:
+            del self._shards[index][task_id]
+
+    def __contains__(self, task_id) -> bool:
+        return task_id in self._shards[self._shard(task_id)]
+
+    def __iter__(self) -> Iterator[str]:
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                task_ids = list(shard)
+            yield from task_ids
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+def summarize_data(data: Dict[str, Any], max_length: int = 100) -> str:
+    """Summarize data dictionary for display"""
+    summary = json.dumps(data, indent=None)
+    if len(summary) > max_length:
+        summary = summary[:max_length] + "..."
+    return summary
+
+
+def iter_text_explanation(chain: ProvenanceChain) -> Iterator[str]:
+    """Render a chain as plain text, one line at a time"""
+    yield "=" * 80
+    yield f"REASONING EXPLANATION: {chain.task_description}"
+    yield "=" * 80
+    yield f"Task ID: {chain.task_id}"
+    yield f"Started: {chain.start_time}"
+    yield f"Completed: {chain.end_time or 'In Progress'}"
+    yield f"Status: {'SUCCESS' if chain.success else 'FAILED'}"
+    if chain.error_message:
+        yield f"Error: {chain.error_message}"
+    yield ""
+
+    # Group steps by type for better readability
+    yield "REASONING STEPS:"
+    yield "-" * 80
+
+    for i, node in enumerate(chain.nodes, 1):
+        yield f"\n{i}. {node.step_type.value.upper().replace('_', ' ')}"
+        yield f"   ID: {node.step_id}"
+        yield f"   Description: {node.description}"
+        yield f"   Confidence: {node.confidence:.2f}"
+        if node.duration_ns is not None:
+            yield f"   Duration: {node.duration_ms:.3f} ms"
+        if node.parent_ids:
+            yield f"   Depends on: {', '.join(node.parent_ids)}"
+
+        # Show key input/output
+        if node.input_data:
+            input_summary = summarize_data(node.input_data)
+            yield f"   Input: {input_summary}"
+        if node.output_data:
+            output_summary = summarize_data(node.output_data)
+            yield f"   Output: {output_summary}"
+
+    yield ""
+    yield "-" * 80
+    yield f"FINAL ANSWER: {chain.final_answer or 'Not yet determined'}"
+    yield "=" * 80
+
+
+def iter_html_explanation(chain: ProvenanceChain) -> Iterator[str]:
+    """Render a chain as an HTML fragment, one element at a time"""
+    yield "<div class='provenance-explanation'>"
+    yield f"<h2>Reasoning Explanation: {html.escape(chain.task_description)}</h2>"
+    yield f"<p><strong>Task ID:</strong> {html.escape(chain.task_id)}</p>"
+    yield f"<p><strong>Status:</strong> {'SUCCESS' if chain.success else 'FAILED'}</p>"
+
+    yield "<div class='reasoning-steps'>"
+    yield "<h3>Reasoning Steps</h3>"
+    yield "<ol>"
+
+    for node in chain.nodes:
+        confidence_class = "high" if node.confidence > 0.8 else "medium" if node.confidence > 0.5 else "low"
+        yield f"<li class='step step-{node.step_type.value}'>"
+        yield f"<h4>{node.step_type.value.replace('_', ' ').title()}</h4>"
+        yield f"<p>{html.escape(node.description)}</p>"
+        yield f"<p class='confidence confidence-{confidence_class}'>Confidence: {node.confidence:.2f}</p>"
+        yield "</li>"
+
+    yield "</ol>"
+    yield "</div>"
+
+    yield f"<div class='final-answer'>"
+    yield f"<h3>Final Answer</h3>"
+    yield f"<p>{html.escape(chain.final_answer or 'Not yet determined')}</p>"
+    yield "</div>"
+
+    yield "</div>"
+
+
+def iter_chain_explanation(chain: ProvenanceChain, format: str = "text") -> Iterator[str]:
+    """
+    Render a chain as "text" or "html". Module-level (rather than a tracker
+    method) so chains can be rendered in worker processes.
+    """
+    if format == "html":
+        return iter_html_explanation(chain)
+    return iter_text_explanation(chain)
+
+
+# Active chain per tracker for the current thread / asyncio task.
+# Holds an immutable {tracker context key: chain} mapping, replaced on every
+# change. Keys are per-tracker sentinel objects: unlike id(tracker) they are
+# never reused by a later tracker, and unlike the tracker itself they do not
+# keep it alive from a stale context.
+_ACTIVE_CHAINS: ContextVar[Mapping[object, ProvenanceChain]] = ContextVar("provenance_active_chains", default={})
+
+
 class ProvenanceTracker:
     """
     Manages provenance tracking for hybrid reasoning sessions.
     Provides methods to record steps, generate explanations, and debug reasoning chains.
     """
 
-    def __init__(self):
-        self.chains: Dict[str, ProvenanceChain] = {}
-        self.current_chain: Optional[ProvenanceChain] = None
-        self.step_counter = 0
+    def __init__(self, deduplicate_payloads: bool = False, async_recording: bool = False,
+                 max_queue_size: int = 1024, shards: int = 16,
+                 capture: Optional[CaptureConfig] = None, tamper_evident: bool = False,
+                 explanation_cache_size: int = 1024):
+        """
+        Initialize tracker.
+
+        Args:
+            deduplicate_payloads: Store node payloads once in a shared
+                content-addressed blob table (see PayloadBlobStore)
+            async_recording: Materialize nodes on a background thread
+                (see AsyncProvenanceRecorder); call flush()/close() when done
+            max_queue_size: Pending-event bound for async recording
+            shards: Number of lock stripes in the chain registry
+            capture: Capture policy (default: full chains with payloads)
+            tamper_evident: Hash every node over its content and parent hashes
+                and maintain a per-chain Merkle root (see ProvenanceChain.verify)
+            explanation_cache_size: Rendered explanations kept (least recently
+                used are evicted)
+
+        The tracker is safe to share between threads and asyncio tasks: the
+        active chain is tracked per context (see task() and activate()).
+        """
+        self.chains: ShardedChainRegistry = ShardedChainRegistry(shards)
+        self.blob_store: Optional[PayloadBlobStore] = PayloadBlobStore() if deduplicate_payloads else None
+        self.recorder: Optional[AsyncProvenanceRecorder] = (
+            AsyncProvenanceRecorder(self._apply_event, max_queue_size) if async_recording else None
+        )
+        # (task_id, format) -> (chain version, rendered explanation)
+        self._explanation_cache = LRUCache(max_entries=explanation_cache_size)
+        self.confidence_stats = ConfidenceAggregator()
+        self.latency_stats = LatencyAggregator()
+        self.capture = capture or CaptureConfig()
+        self._sampler = random.Random(self.capture.seed)
+        self.capture_counts = {"full": 0, "summary": 0, "anomaly_kept": 0, "anomaly_dropped": 0}
+        self._capture_lock = threading.Lock()
+        self.tamper_evident = tamper_evident
+        self._context_key = object()
+
+    def flush(self):
+        """Wait until all recorded steps are materialized (no-op in sync mode)"""
+        if self.recorder is not None:
+            self.recorder.flush()
+
+    def close(self):
+        """Flush pending steps and stop the background recorder, if any"""
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def recorder_stats(self) -> dict:
+        """Async recording queue metrics (empty in sync mode)"""
+        if self.recorder is None:
+            return {}
+        return self.recorder.stats()
+
+    def __enter__(self) -> "ProvenanceTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def current_chain(self) -> Optional[ProvenanceChain]:
+        """Chain that record_step() writes to in the current thread / asyncio task"""
+        return _ACTIVE_CHAINS.get().get(self._context_key)
+
+    @property
+    def step_counter(self) -> int:
+        chain = self.current_chain
+        return chain.step_counter if chain else 0
+
+    def _set_active(self, chain: Optional[ProvenanceChain]):
+        active = dict(_ACTIVE_CHAINS.get())
+        if chain is None:
+            active.pop(self._context_key, None)
+        else:
+            active[self._context_key] = chain
+        return _ACTIVE_CHAINS.set(active)
 
     def start_task(self, task_id: str, task_description: str) -> ProvenanceChain:
-        """Start tracking a new reasoning task"""
+        """Start tracking a new reasoning task and make it active in the current context"""
         chain = ProvenanceChain(
             task_id=task_id,
             task_description=task_description,
-            start_time=datetime.now().isoformat()
+            start_time=datetime.now().isoformat(),
+            capture=self._choose_capture(),
+            tamper_evident=self.tamper_evident
         )
         self.chains[task_id] = chain
-        self.current_chain = chain
-        self.step_counter = 0
+        self._set_active(chain)
         return chain
 
+    def _choose_capture(self) -> str:
+        """Decide up front how much of a new chain to keep"""
+        policy = self.capture.policy
+        if policy == CapturePolicy.SUMMARY:
+            return _CAPTURE_SUMMARY
+        if policy == CapturePolicy.SAMPLED:
+            return _CAPTURE_FULL if self._sampler.random() < self.capture.sample_rate else _CAPTURE_SUMMARY
+        if policy == CapturePolicy.ON_ANOMALY:
+            return _CAPTURE_DEFERRED
+        return _CAPTURE_FULL
+
+    def capture_stats(self) -> dict:
+        """Number of tasks per capture outcome"""
+        self.flush()
+        with self._capture_lock:
+            return dict(self.capture_counts)
+
+    @contextmanager
+    def task(self, task_id: str, task_description: str) -> Iterator[ProvenanceChain]:
+        """
+        Recording context for one task: starts it, makes it the active chain
+        for the current thread / asyncio task, and restores the previous
+        active chain on exit.
+        """
+        token = _ACTIVE_CHAINS.set(_ACTIVE_CHAINS.get())
+        try:
+            yield self.start_task(task_id, task_description)
+        finally:
+            _ACTIVE_CHAINS.reset(token)
+
+    @contextmanager
+    def activate(self, task_id: str) -> Iterator[ProvenanceChain]:
+        """Bind an existing task's chain as the active chain in the current context"""
+        chain = self.chains.get(task_id)
+        if not isinstance(chain, ProvenanceChain):
+            raise ValueError(f"No chain found for task {task_id}")
+        token = self._set_active(chain)
+        try:
+            yield chain
+        finally:
+            _ACTIVE_CHAINS.reset(token)
+
     def end_task(self, task_id: str, final_answer: str, success: bool = True, error_message: Optional[str] = None):
         """Complete a reasoning task"""
         if task_id in self.chains:
-            chain = self.chains[task_id]
-            chain.end_time = datetime.now().isoformat()
+            event = (self._finish_chain, self.chains[task_id], final_answer, success, error_message, time.time())
+            if self.recorder is not None:
+                self.recorder.submit(event)
+            else:
+                self._apply_event(*event)
+
+    def _finish_chain(self, chain: ProvenanceChain, final_answer: str, success: bool,
+                      error_message: Optional[str], wall_time: float):
+        if chain.capture == _CAPTURE_DEFERRED:
+            self._settle_deferred_payloads(chain, keep=chain.anomalous or not success)
+        else:
+            with self._capture_lock:
+                self.capture_counts[chain.capture] += 1
+
+        with self.chains.lock_for(chain.task_id):
+            chain.end_time = datetime.fromtimestamp(wall_time).isoformat()
             chain.final_answer = final_answer
             chain.success = success
             chain.error_message = error_message
+            chain.version += 1
+            if chain.tamper_evident and chain.capture == _CAPTURE_DEFERRED:
+                # Deferred payloads are final only now
+                chain.rebuild_merkle()
+        self.confidence_stats.add_chain(chain.task_id, chain.confidence_score(), wall_time)
+
+    @staticmethod
+    def _apply_event(handler: Callable[..., None], *args):
+        """Apply a recorded event (inline, or on the async recorder thread)"""
+        handler(*args)
 
     def record_step(self,
                    step_type: ReasoningStep,
@@ -136,7 +1282,8 @@ class ProvenanceTracker:
                    output_data: Dict[str, Any],
                    confidence: float = 1.0,
                    parent_ids: List[str] = None,
-                   metadata: Dict[str, Any] = None) -> str:
+                   metadata: Dict[str, Any] = None,
+                   started_ns: Optional[int] = None) -> str:
         """
         Record a reasoning step in the current chain.
 
@@ -148,33 +1295,107 @@ class ProvenanceTracker:
             confidence: Confidence score (0-1)
             parent_ids: IDs of parent steps this depends on
             metadata: Additional metadata
+            started_ns: time.perf_counter_ns() taken when the step began;
+                the step ends when it is recorded
 
         Returns:
             step_id: Unique identifier for this step
+
+        Payloads may be LazyPayload builders, which are only called if the
+        chain's capture policy keeps them. In async mode the node is
+        materialized later on the recorder thread; payloads must not be
+        mutated after they are recorded.
         """
-        if not self.current_chain:
+        end_ns = time.perf_counter_ns()
+        chain = self.current_chain
+        if not chain:
             raise RuntimeError("No active task. Call start_task() first.")
 
-        self.step_counter += 1
-        step_id = f"{self.current_chain.task_id}_step_{self.step_counter}"
+        with self.chains.lock_for(chain.task_id):
+            chain.step_counter += 1
+            step_id = f"{chain.task_id}_step_{chain.step_counter}"
 
+        if chain.capture == _CAPTURE_SUMMARY:
+            input_data = output_data = None
+
+        event = (self._materialize_step, chain, step_id, step_type, description,
+                 input_data, output_data, confidence, parent_ids, metadata, time.time(),
+                 started_ns if started_ns is not None else end_ns, end_ns)
+        if self.recorder is not None:
+            self.recorder.submit(event)
+        else:
+            self._apply_event(*event)
+        return step_id
+
+    def _materialize_step(self, chain: ProvenanceChain, step_id: str, step_type: ReasoningStep,
+                          description: str, input_data: Dict[str, Any], output_data: Dict[str, Any],
+                          confidence: float, parent_ids: Optional[List[str]],
+                          metadata: Optional[Dict[str, Any]], wall_time: float,
+                          start_ns: int, end_ns: int):
+        """Build a ProvenanceNode from a step event and append it to its chain"""
+        deferred = chain.capture == _CAPTURE_DEFERRED
         node = ProvenanceNode(
             step_id=step_id,
             step_type=step_type,
-            timestamp=datetime.now().isoformat(),
+            timestamp=datetime.fromtimestamp(wall_time).isoformat(),
             description=description,
-            input_data=input_data,
-            output_data=output_data,
+            input_data={} if deferred else _resolve_payload(input_data),
+            output_data={} if deferred else _resolve_payload(output_data),
             confidence=confidence,
             parent_ids=parent_ids or [],
-            metadata=metadata or {}
+            metadata=_resolve_payload(metadata),
+            start_ns=start_ns,
+            end_ns=end_ns
         )
 
-        self.current_chain.add_node(node)
-        return step_id
+        if deferred:
+            chain.deferred_payloads[step_id] = (input_data, output_data)
+            if (step_type == ReasoningStep.CONFLICT_RESOLUTION
+                    or confidence < self.capture.confidence_threshold):
+                chain.anomalous = True
+        # Deferred payloads reach the blob store only if the chain keeps them
+        self._store_payloads(node, io=not deferred)
+
+        with self.chains.lock_for(chain.task_id):
+            chain.add_node(node)
+        self.chains.mark_changed(chain.task_id)
+        self.confidence_stats.add_step(chain.task_id, node)
+        self.latency_stats.add_step(node)
+
+    def _store_payloads(self, node: ProvenanceNode, io: bool = True, metadata: bool = True):
+        """
+        Route a node's payloads through the blob store, if deduplicating.
+
+        Args:
+            io: Store input_data and output_data (False while they are
+                deferred placeholders)
+            metadata: Store metadata
+        """
+        if self.blob_store is None:
+            return
+        if io:
+            node.input_digest, node.input_data = self.blob_store.put(node.input_data)
+            node.output_digest, node.output_data = self.blob_store.put(node.output_data)
+        if metadata:
+            node.metadata_digest, node.metadata = self.blob_store.put(node.metadata)
+
+    def _settle_deferred_payloads(self, chain: ProvenanceChain, keep: bool):
+        """Build deferred payloads of an anomalous chain, or drop them"""
+        deferred, chain.deferred_payloads = chain.deferred_payloads, {}
+        with self._capture_lock:
+            self.capture_counts["anomaly_kept" if keep else "anomaly_dropped"] += 1
+        if not keep:
+            return
+        for node in chain.nodes:
+            if node.step_id in deferred:
+                input_data, output_data = deferred[node.step_id]
+                node.input_data = _resolve_payload(input_data)
+                node.output_data = _resolve_payload(output_data)
+                self._store_payloads(node, metadata=False)
 
     def record_llm_extraction(self, query: str, events: List[dict], relations: List[dict],
-                             confidence: float = 0.8, metadata: Dict[str, Any] = None) -> str:
+                             confidence: float = 0.8, metadata: Dict[str, Any] = None,
+                             started_ns: Optional[int] = None) -> str:
         """Record LLM extraction step"""
         return self.record_step(
             step_type=ReasoningStep.LLM_EXTRACTION,
@@ -182,11 +1403,13 @@ class ProvenanceTracker:
             input_data={"query": query},
             output_data={"events": events, "relations": relations},
             confidence=confidence,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            started_ns=started_ns
         )
 
     def record_symbolic_constraint(self, constraint_desc: str, constraint_data: dict,
-                                   parent_ids: List[str] = None, confidence: float = 1.0) -> str:
+                                   parent_ids: List[str] = None, confidence: float = 1.0,
+                                   started_ns: Optional[int] = None) -> str:
         """Record symbolic constraint addition"""
         return self.record_step(
             step_type=ReasoningStep.SYMBOLIC_CONSTRAINT,
@@ -194,11 +1417,28 @@ class ProvenanceTracker:
             input_data={"constraint_description": constraint_desc},
             output_data={"constraint": constraint_data},
             confidence=confidence,
-            parent_ids=parent_ids or []
+            parent_ids=parent_ids or [],
+            started_ns=started_ns
+        )
+
+    def record_symbolic_propagation(self, num_constraints: int, consistent: bool,
+                                    parent_ids: List[str] = None,
+                                    started_ns: Optional[int] = None) -> str:
+        """Record constraint propagation (path consistency) step"""
+        return self.record_step(
+            step_type=ReasoningStep.SYMBOLIC_PROPAGATION,
+            description=f"Propagated {num_constraints} constraints: "
+                        f"{'consistent' if consistent else 'inconsistent'}",
+            input_data={"num_constraints": num_constraints},
+            output_data={"consistent": consistent},
+            confidence=1.0 if consistent else 0.0,
+            parent_ids=parent_ids or [],
+            started_ns=started_ns
         )
 
     def record_symbolic_solving(self, problem_desc: str, solution: dict,
-                               parent_ids: List[str] = None, success: bool = True) -> str:
+                               parent_ids: List[str] = None, success: bool = True,
+                               started_ns: Optional[int] = None) -> str:
         """Record symbolic solving step"""
         return self.record_step(
             step_type=ReasoningStep.SYMBOLIC_SOLVING,
@@ -206,11 +1446,13 @@ class ProvenanceTracker:
             input_data={"problem": problem_desc},
             output_data={"solution": solution, "success": success},
             confidence=1.0 if success else 0.0,
-            parent_ids=parent_ids or []
+            parent_ids=parent_ids or [],
+            started_ns=started_ns
         )
 
     def record_verification(self, verification_desc: str, verified: bool,
-                           details: dict, parent_ids: List[str] = None) -> str:
+                           details: dict, parent_ids: List[str] = None,
+                           started_ns: Optional[int] = None) -> str:
         """Record verification step"""
         return self.record_step(
             step_type=ReasoningStep.VERIFICATION,
@@ -218,11 +1460,13 @@ class ProvenanceTracker:
             input_data={"verification_type": verification_desc},
             output_data={"verified": verified, "details": details},
             confidence=1.0 if verified else 0.5,
-            parent_ids=parent_ids or []
+            parent_ids=parent_ids or [],
+            started_ns=started_ns
         )
 
     def record_conflict_resolution(self, conflict_desc: str, resolution: dict,
-                                   parent_ids: List[str] = None) -> str:
+                                   parent_ids: List[str] = None,
+                                   started_ns: Optional[int] = None) -> str:
         """Record conflict resolution step"""
         return self.record_step(
             step_type=ReasoningStep.CONFLICT_RESOLUTION,
@@ -230,7 +1474,23 @@ class ProvenanceTracker:
             input_data={"conflict": conflict_desc},
             output_data={"resolution": resolution},
             confidence=0.9,
-            parent_ids=parent_ids or []
+            parent_ids=parent_ids or [],
+            started_ns=started_ns
+        )
+
+    def record_cache_reuse(self, source_task_id: str, source_step_ids: List[str],
+                           answer: str, confidence: float, cache_key: str,
+                           started_ns: Optional[int] = None) -> str:
+        """Record reuse of a cached result; the step links to the source chain"""
+        return self.record_step(
+            step_type=ReasoningStep.CACHE_REUSE,
+            description=f"Reused cached result of {source_task_id}",
+            input_data={"cache_key": cache_key},
+            output_data={"answer": answer},
+            confidence=confidence,
+            parent_ids=source_step_ids,
+            metadata={"source_task_id": source_task_id},
+            started_ns=started_ns
         )
 
     def generate_explanation(self, task_id: str, format: str = "text") -> str:
@@ -242,135 +1502,110 @@ class ProvenanceTracker:
             format: "text" or "html"
 
         Returns:
-            Formatted explanation
+            Formatted explanation (cached until the chain changes)
         """
+        self.flush()
         if task_id not in self.chains:
             return f"No provenance found for task {task_id}"
 
         chain = self.chains[task_id]
+        cache_key = (task_id, format)
+        cached = self._explanation_cache.get(cache_key)
+        if cached is not None and cached[0] == chain.version:
+            return cached[1]
 
-        if format == "html":
-            return self._generate_html_explanation(chain)
-        else:
-            return self._generate_text_explanation(chain)
+        explanation = "\n".join(self._iter_chain_explanation(chain, format))
+        self._explanation_cache.put(cache_key, (chain.version, explanation))
+        return explanation
+
+    def explain_lazily(self, task_id: str, format: str = "text") -> LazyExplanation:
+        """Return a handle that renders the explanation only when read"""
+        return LazyExplanation(self, task_id, format)
+
+    def iter_explanation(self, task_id: str, format: str = "text") -> Iterator[str]:
+        """
+        Stream an explanation line by line (text) or chunk by chunk (html)
+        without materializing the full report; suited to very large chains.
+        """
+        self.flush()
+        if task_id not in self.chains:
+            yield f"No provenance found for task {task_id}"
+            return
+        yield from self._iter_chain_explanation(self.chains[task_id], format)
+
+    def _iter_chain_explanation(self, chain: ProvenanceChain, format: str) -> Iterator[str]:
+        return iter_chain_explanation(chain, format)
 
     def _generate_text_explanation(self, chain: ProvenanceChain) -> str:
         """Generate text-based explanation"""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(f"REASONING EXPLANATION: {chain.task_description}")
-        lines.append("=" * 80)
-        lines.append(f"Task ID: {chain.task_id}")
-        lines.append(f"Started: {chain.start_time}")
-        lines.append(f"Completed: {chain.end_time or 'In Progress'}")
-        lines.append(f"Status: {'SUCCESS' if chain.success else 'FAILED'}")
-        if chain.error_message:
-            lines.append(f"Error: {chain.error_message}")
-        lines.append("")
-
-        # Group steps by type for better readability
-        lines.append("REASONING STEPS:")
-        lines.append("-" * 80)
-
-        for i, node in enumerate(chain.nodes, 1):
-            lines.append(f"\n{i}. {node.step_type.value.upper().replace('_', ' ')}")
-            lines.append(f"   ID: {node.step_id}")
-            lines.append(f"   Description: {node.description}")
-            lines.append(f"   Confidence: {node.confidence:.2f}")
-            if node.parent_ids:
-                lines.append(f"   Depends on: {', '.join(node.parent_ids)}")
-
-            # Show key input/output
-            if node.input_data:
-                input_summary = self._summarize_data(node.input_data)
-                lines.append(f"   Input: {input_summary}")
-            if node.output_data:
-                output_summary = self._summarize_data(node.output_data)
-                lines.append(f"   Output: {output_summary}")
-
-        lines.append("")
-        lines.append("-" * 80)
-        lines.append(f"FINAL ANSWER: {chain.final_answer or 'Not yet determined'}")
-        lines.append("=" * 80)
-
-        return "\n".join(lines)
+        return "\n".join(iter_text_explanation(chain))
 
     def _generate_html_explanation(self, chain: ProvenanceChain) -> str:
         """Generate HTML-based explanation"""
-        html = []
-        html.append("<div class='provenance-explanation'>")
-        html.append(f"<h2>Reasoning Explanation: {chain.task_description}</h2>")
-        html.append(f"<p><strong>Task ID:</strong> {chain.task_id}</p>")
-        html.append(f"<p><strong>Status:</strong> {'SUCCESS' if chain.success else 'FAILED'}</p>")
-
-        html.append("<div class='reasoning-steps'>")
-        html.append("<h3>Reasoning Steps</h3>")
-        html.append("<ol>")
-
-        for node in chain.nodes:
-            confidence_class = "high" if node.confidence > 0.8 else "medium" if node.confidence > 0.5 else "low"
-            html.append(f"<li class='step step-{node.step_type.value}'>")
-            html.append(f"<h4>{node.step_type.value.replace('_', ' ').title()}</h4>")
-            html.append(f"<p>{node.description}</p>")
-            html.append(f"<p class='confidence confidence-{confidence_class}'>Confidence: {node.confidence:.2f}</p>")
-            html.append("</li>")
-
-        html.append("</ol>")
-        html.append("</div>")
-
-        html.append(f"<div class='final-answer'>")
-        html.append(f"<h3>Final Answer</h3>")
-        html.append(f"<p>{chain.final_answer or 'Not yet determined'}</p>")
-        html.append("</div>")
-
-        html.append("</div>")
-        return "\n".join(html)
+        return "\n".join(iter_html_explanation(chain))
 
     def _summarize_data(self, data: Dict[str, Any], max_length: int = 100) -> str:
         """Summarize data dictionary for display"""
-        summary = json.dumps(data, indent=None)
-        if len(summary) > max_length:
-            summary = summary[:max_length] + "..."
-        return summary
+        return summarize_data(data, max_length)
+
+    def merkle_root(self, task_id: str) -> Optional[str]:
+        """Merkle root of a tamper-evident chain (None if unknown or not hashed)"""
+        self.flush()
+        chain = self.chains.get(task_id)
+        if not isinstance(chain, ProvenanceChain):
+            return None
+        with self.chains.lock_for(task_id):
+            return chain.merkle_root()
+
+    def inclusion_proof(self, task_id: str, step_id: str) -> MerkleProof:
+        """Compact proof that a step belongs to its chain's Merkle root"""
+        self.flush()
+        chain = self.chains.get(task_id)
+        if not isinstance(chain, ProvenanceChain):
+            raise KeyError(f"No provenance chain for task {task_id}")
+        with self.chains.lock_for(task_id):
+            return chain.inclusion_proof(step_id)
+
+    def verify_chains(self, task_ids: Optional[List[str]] = None,
+                      expected_roots: Optional[Dict[str, str]] = None,
+                      workers: Optional[int] = None) -> Dict[str, bool]:
+        """Verify stored tamper-evident chains (all by default) in parallel"""
+        self.flush()
+        ids = task_ids if task_ids is not None else list(self.chains)
+        chains = [c for c in (self.chains.get(t) for t in ids) if isinstance(c, ProvenanceChain)]
+        return verify_chains(chains, expected_roots, workers)
 
     def get_confidence_score(self, task_id: str) -> float:
         """
         Calculate overall confidence score for a task based on all steps.
-        Uses weighted average based on step importance.
+        Uses weighted average based on step importance (see STEP_WEIGHTS);
+        the sums are maintained as steps are recorded, so this is O(1).
         """
-        if task_id not in self.chains:
+        self.flush()
+        chain = self.chains.get(task_id)
+        if not isinstance(chain, ProvenanceChain):
             return 0.0
+        return chain.confidence_score()
 
-        chain = self.chains[task_id]
-        if not chain.nodes:
-            return 0.0
-
-        # Weight critical steps more heavily
-        weights = {
-            ReasoningStep.LLM_EXTRACTION: 0.3,
-            ReasoningStep.SYMBOLIC_CONSTRAINT: 0.2,
-            ReasoningStep.SYMBOLIC_SOLVING: 0.3,
-            ReasoningStep.VERIFICATION: 0.2,
-        }
-
-        total_weight = 0.0
-        weighted_confidence = 0.0
-
-        for node in chain.nodes:
-            weight = weights.get(node.step_type, 0.1)
-            weighted_confidence += node.confidence * weight
-            total_weight += weight
+    def get_stage_latencies(self, task_id: str) -> Dict[str, float]:
+        """Per-stage latency of one task in milliseconds"""
+        self.flush()
+        chain = self.chains.get(task_id)
+        if not isinstance(chain, ProvenanceChain):
+            return {}
+        return {stage: ns / 1e6 for stage, ns in chain.stage_latencies().items()}
 
-        if total_weight == 0:
-            return 0.0
-
-        return weighted_confidence / total_weight
+    def latency_histogram(self) -> Dict[str, dict]:
+        """Latency distribution per stage, aggregated across all chains"""
+        self.flush()
+        return self.latency_stats.by_stage()
 
     def get_reasoning_path(self, task_id: str, step_id: str) -> List[ProvenanceNode]:
         """
         Get the complete reasoning path leading to a specific step.
         Traces back through parent dependencies.
         """
+        self.flush()
         if task_id not in self.chains:
             return []
 
@@ -396,6 +1631,7 @@ class ProvenanceTracker:
 
     def export_chain(self, task_id: str, filepath: str):
         """Export provenance chain to JSON file"""
+        self.flush()
         if task_id not in self.chains:
             raise ValueError(f"No chain found for task {task_id}")
 
@@ -407,10 +1643,63 @@ class ProvenanceTracker:
         with open(filepath, 'r') as f:
             data = json.load(f)
 
-        # Reconstruct chain (simplified - full version would reconstruct all objects)
-        task_id = data['task_id']
-        self.chains[task_id] = data
-        return task_id
+        chain = ProvenanceChain.from_dict(data)
+        self.chains[chain.task_id] = chain
+        return chain.task_id
+
+    def dedup_stats(self) -> dict:
+        """Payload deduplication statistics (empty if deduplication is disabled)"""
+        if self.blob_store is None:
+            return {}
+        self.flush()
+        return self.blob_store.stats()
+
+    def export_archive(self, filepath: str, task_ids: Optional[List[str]] = None):
+        """
+        Export chains to a deduplicated JSON archive.
+
+        Each distinct payload is written once to a shared blob table and
+        nodes reference payloads by digest.
+        """
+        self.flush()
+        task_ids = list(self.chains) if task_ids is None else task_ids
+        blobs: Dict[str, Dict[str, Any]] = {}
+        chains = []
+        for task_id in task_ids:
+            if task_id not in self.chains:
+                raise ValueError(f"No chain found for task {task_id}")
+            chain_data = self.chains[task_id].to_dict()
+            for node_data in chain_data["nodes"]:
+                for key in ("input", "output", "metadata"):
+                    data_key = key if key == "metadata" else f"{key}_data"
+                    digest = node_data.get(f"{key}_digest") or payload_digest(node_data[data_key])
+                    blobs.setdefault(digest, node_data.pop(data_key))
+                    node_data[f"{key}_digest"] = digest
+            chains.append(chain_data)
+
+        with open(filepath, 'w') as f:
+            json.dump({"blobs": blobs, "chains": chains}, f, separators=(",", ":"))
+
+    def import_archive(self, filepath: str) -> List[str]:
+        """Import chains from an archive written by export_archive()"""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+
+        blobs = data["blobs"]
+        if self.blob_store is not None:
+            for digest, payload in blobs.items():
+                if digest not in self.blob_store:
+                    self.blob_store.blobs[digest] = payload
+                    self.blob_store.blob_sizes[digest] = len(canonical_payload(payload))
+                    self.blob_store.ref_counts[digest] = 0
+            blobs = self.blob_store.blobs
+
+        task_ids = []
+        for chain_data in data["chains"]:
+            chain = ProvenanceChain.from_dict(chain_data, blobs)
+            self.chains[chain.task_id] = chain
+            task_ids.append(chain.task_id)
+        return task_ids
 
 
 if __name__ == "__main__":
@@ -473,4 +1762,53 @@ if __name__ == "__main__":
     # Show confidence score
     print(f"\nOverall Confidence Score: {tracker.get_confidence_score(task_id):.2f}")
 
+    # Streaming confidence aggregation across chains
+    print(f"Confidence by step type: "
+          f"{ {k: round(v['mean'], 2) for k, v in tracker.confidence_stats.by_step_type().items()} }")
+
+    # Payload deduplication across repeated chains
+    dedup_tracker = ProvenanceTracker(deduplicate_payloads=True)
+    for i in range(3):
+        dedup_tracker.start_task(f"repeat_{i}", "Repeated templated question")
+        dedup_tracker.record_symbolic_constraint(
+            constraint_desc="admission before surgery",
+            constraint_data={"interval1": "admission", "interval2": "surgery", "relation": "before"}
+        )
+        dedup_tracker.end_task(f"repeat_{i}", "admission before surgery")
+    stats = dedup_tracker.dedup_stats()
+    print(f"\nDedup: {stats['unique_blobs']} unique payloads for {stats['total_refs']} references "
+          f"(ratio {stats['dedup_ratio']:.1f}x)")
+
+    # Asynchronous recording: nodes are materialized on a background thread
+    with ProvenanceTracker(async_recording=True) as async_tracker:
+        async_tracker.start_task("async_001", "Async recording example")
+        async_tracker.record_symbolic_constraint("admission before surgery", {"relation": "before"})
+        async_tracker.end_task("async_001", "done")
+        async_tracker.flush()
+        print(f"Async recorder: {async_tracker.recorder_stats()}")
+
+    # Capture policies: only anomalous (low-confidence / conflicting) tasks keep payloads
+    policy_tracker = ProvenanceTracker(capture=CaptureConfig(policy=CapturePolicy.ON_ANOMALY))
+    for i, confidence in enumerate([0.9, 0.4]):
+        policy_tracker.start_task(f"policy_{i}", "Capture policy example")
+        policy_tracker.record_llm_extraction(
+            query="Patient admitted Monday",
+            events=LazyPayload(lambda: [{"name": "admission"}], size=1),
+            relations=[],
+            confidence=confidence
+        )
+        policy_tracker.end_task(f"policy_{i}", "done")
+    print(f"Capture policy: {policy_tracker.capture_stats()}")
+
+    # Tamper evidence: Merkle root per chain, inclusion proof for one step
+    audit_tracker = ProvenanceTracker(tamper_evident=True)
+    audit_tracker.start_task("audit_001", "Tamper-evident example")
+    step = audit_tracker.record_symbolic_constraint("admission before surgery", {"relation": "before"})
+    audit_tracker.record_verification("Check ordering", True, {"conflicts": []}, parent_ids=[step])
+    audit_tracker.end_task("audit_001", "admission before surgery")
+    root = audit_tracker.merkle_root("audit_001")
+    proof = audit_tracker.inclusion_proof("audit_001", step)
+    print(f"Merkle root: {root[:16]}..., proof of {step}: {verify_inclusion(proof, root)}, "
+          f"chains intact: {audit_tracker.verify_chains()}")
+
     print("\n" + "=" * 80)
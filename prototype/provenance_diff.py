@@ -0,0 +1,350 @@
+"""
+Provenance Chain Diffing
+
+Structural diff between two provenance chains, e.g. the same question run
+under an old and a new extraction version or two llm_accuracy settings, and
+between whole runs of chains for regression triage.
+
+Nodes are aligned by (step type, occurrence of that type), since step IDs
+embed the task ID and differ between runs. Each node is reduced to a content
+digest over its confidence and payloads (reusing the tracker's payload
+digests when deduplication is enabled); nodes with equal digests are skipped
+without a deep comparison, and chains whose digests all match are reported
+identical after one pass. Timestamps, timings and step IDs are ignored.
+
+Beyond per-node field changes the diff reports the domain-level changes
+that matter for triage: extracted relations, solved intervals, step
+confidences and the final answer. Everything is linear in the size of the
+chains, so nightly runs of thousands of chains can be diffed directly.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import re
+
+from provenance import ProvenanceChain, ProvenanceNode, ProvenanceTracker, ReasoningStep, payload_digest
+
+
+NodeKey = Tuple[str, int]  # (step type value, occurrence index)
+
+
+@dataclass
+class FieldChange:
+    """One changed leaf value inside a node's payloads"""
+    path: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class NodeDiff:
+    """Difference between two aligned nodes"""
+    key: NodeKey
+    status: str  # "changed", "added" or "removed"
+    old_step_id: Optional[str] = None
+    new_step_id: Optional[str] = None
+    old_confidence: Optional[float] = None
+    new_confidence: Optional[float] = None
+    changes: List[FieldChange] = field(default_factory=list)
+
+    @property
+    def confidence_delta(self) -> Optional[float]:
+        if self.old_confidence is None or self.new_confidence is None:
+            return None
+        return self.new_confidence - self.old_confidence
+
+
+@dataclass
+class RelationChange:
+    """Relation between two events added, removed or changed"""
+    event1: str
+    event2: str
+    old_relation: Optional[str]
+    new_relation: Optional[str]
+
+
+@dataclass
+class IntervalChange:
+    """Solved interval added, removed or changed"""
+    name: str
+    old: Optional[Dict[str, Any]]
+    new: Optional[Dict[str, Any]]
+
+
+@dataclass
+class ChainDiff:
+    """Structural diff between two chains"""
+    old_task_id: str
+    new_task_id: str
+    node_diffs: List[NodeDiff] = field(default_factory=list)
+    relation_changes: List[RelationChange] = field(default_factory=list)
+    interval_changes: List[IntervalChange] = field(default_factory=list)
+    old_answer: Optional[str] = None
+    new_answer: Optional[str] = None
+    unchanged_nodes: int = 0
+
+    @property
+    def answer_changed(self) -> bool:
+        return self.old_answer != self.new_answer
+
+    @property
+    def identical(self) -> bool:
+        return not (self.node_diffs or self.relation_changes or self.interval_changes or self.answer_changed)
+
+    @property
+    def confidence_changes(self) -> List[NodeDiff]:
+        return [d for d in self.node_diffs if d.confidence_delta]
+
+    def summary(self) -> dict:
+        return {
+            "old_task_id": self.old_task_id,
+            "new_task_id": self.new_task_id,
+            "identical": self.identical,
+            "answer_changed": self.answer_changed,
+            "changed_nodes": sum(1 for d in self.node_diffs if d.status == "changed"),
+            "added_nodes": sum(1 for d in self.node_diffs if d.status == "added"),
+            "removed_nodes": sum(1 for d in self.node_diffs if d.status == "removed"),
+            "unchanged_nodes": self.unchanged_nodes,
+            "relation_changes": len(self.relation_changes),
+            "interval_changes": len(self.interval_changes),
+            "confidence_changes": len(self.confidence_changes)
+        }
+
+    def to_text(self) -> str:
+        """Human-readable report"""
+        lines = [f"DIFF {self.old_task_id} -> {self.new_task_id}"]
+        if self.identical:
+            lines.append("  identical")
+            return "\n".join(lines)
+        if self.answer_changed:
+            lines.append(f"  final answer: {self.old_answer!r} -> {self.new_answer!r}")
+        for change in self.relation_changes:
+            lines.append(f"  relation {change.event1} ? {change.event2}: "
+                         f"{change.old_relation or '-'} -> {change.new_relation or '-'}")
+        for change in self.interval_changes:
+            lines.append(f"  interval {change.name}: {change.old} -> {change.new}")
+        for diff in self.node_diffs:
+            step_type, occurrence = diff.key
+            label = f"{step_type}[{occurrence}]"
+            if diff.status != "changed":
+                lines.append(f"  {label}: {diff.status}")
+                continue
+            if diff.confidence_delta:
+                lines.append(f"  {label} confidence: {diff.old_confidence:.2f} -> {diff.new_confidence:.2f}")
+            for change in diff.changes:
+                lines.append(f"  {label} {change.path}: {change.old!r} -> {change.new!r}")
+        return "\n".join(lines)
+
+
+@dataclass
+class RunDiff:
+    """Diff between two runs (collections of chains)"""
+    chain_diffs: List[ChainDiff] = field(default_factory=list)
+    only_old: List[str] = field(default_factory=list)  # task IDs without a counterpart
+    only_new: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> List[ChainDiff]:
+        return [d for d in self.chain_diffs if not d.identical]
+
+    @property
+    def answer_changes(self) -> List[ChainDiff]:
+        return [d for d in self.chain_diffs if d.answer_changed]
+
+    def summary(self) -> dict:
+        return {
+            "paired_chains": len(self.chain_diffs),
+            "identical_chains": len(self.chain_diffs) - len(self.changed),
+            "changed_chains": len(self.changed),
+            "answer_changes": len(self.answer_changes),
+            "relation_changes": sum(len(d.relation_changes) for d in self.chain_diffs),
+            "interval_changes": sum(len(d.interval_changes) for d in self.chain_diffs),
+            "only_old": len(self.only_old),
+            "only_new": len(self.only_new)
+        }
+
+
+def diff_chains(old: ProvenanceChain, new: ProvenanceChain) -> ChainDiff:
+    """Structural diff between two chains"""
+    diff = ChainDiff(old_task_id=old.task_id, new_task_id=new.task_id,
+                     old_answer=old.final_answer, new_answer=new.final_answer)
+
+    old_nodes = _align(old)
+    new_nodes = _align(new)
+    changed_types = set()
+    for key, old_node in old_nodes.items():
+        new_node = new_nodes.get(key)
+        if new_node is None:
+            diff.node_diffs.append(NodeDiff(key, "removed", old_step_id=old_node.step_id,
+                                            old_confidence=old_node.confidence))
+            changed_types.add(old_node.step_type)
+        elif _node_digest(old_node) == _node_digest(new_node):
+            diff.unchanged_nodes += 1
+        else:
+            diff.node_diffs.append(_diff_nodes(key, old_node, new_node))
+            changed_types.add(old_node.step_type)
+    for key, new_node in new_nodes.items():
+        if key not in old_nodes:
+            diff.node_diffs.append(NodeDiff(key, "added", new_step_id=new_node.step_id,
+                                            new_confidence=new_node.confidence))
+            changed_types.add(new_node.step_type)
+
+    # Domain-level changes are only recomputed where the underlying steps differ
+    if ReasoningStep.LLM_EXTRACTION in changed_types:
+        diff.relation_changes = _diff_mappings(_relations(old), _relations(new), _relation_change)
+    if ReasoningStep.SYMBOLIC_SOLVING in changed_types:
+        diff.interval_changes = _diff_mappings(_intervals(old), _intervals(new), IntervalChange)
+    return diff
+
+
+def diff_runs(old: Union[ProvenanceTracker, Iterable[ProvenanceChain]],
+              new: Union[ProvenanceTracker, Iterable[ProvenanceChain]],
+              key: Optional[Callable[[ProvenanceChain], Any]] = None) -> RunDiff:
+    """
+    Diff two runs chain by chain.
+
+    Args:
+        old: Baseline run (tracker or chains)
+        new: Candidate run (tracker or chains)
+        key: Pairs chains across runs (default: task description, i.e. the
+            question; repeated questions are paired by occurrence)
+
+    Returns:
+        RunDiff with one ChainDiff per paired chain
+    """
+    key = key or (lambda chain: chain.task_description)
+    old_index = _index_run(old, key)
+    new_index = _index_run(new, key)
+
+    result = RunDiff()
+    for pair_key, old_chain in old_index.items():
+        new_chain = new_index.get(pair_key)
+        if new_chain is None:
+            result.only_old.append(old_chain.task_id)
+        else:
+            result.chain_diffs.append(diff_chains(old_chain, new_chain))
+    result.only_new = [chain.task_id for pair_key, chain in new_index.items() if pair_key not in old_index]
+    return result
+
+
+def _index_run(run: Union[ProvenanceTracker, Iterable[ProvenanceChain]],
+               key: Callable[[ProvenanceChain], Any]) -> Dict[Tuple[Any, int], ProvenanceChain]:
+    if isinstance(run, ProvenanceTracker):
+        run.flush()
+        # The registry iterates by shard; repeated questions pair by recording order
+        run = sorted(run.chains.values(), key=lambda chain: (chain.start_time, _natural_key(chain.task_id)))
+    occurrences: Dict[Any, int] = defaultdict(int)
+    index = {}
+    for chain in run:
+        chain_key = key(chain)
+        index[(chain_key, occurrences[chain_key])] = chain
+        occurrences[chain_key] += 1
+    return index
+
+
+def _natural_key(task_id: str) -> List[Union[str, int]]:
+    """Sort key comparing digit runs as numbers, so task_2 sorts before task_10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", task_id)]
+
+
+def _align(chain: ProvenanceChain) -> Dict[NodeKey, ProvenanceNode]:
+    occurrences: Dict[ReasoningStep, int] = defaultdict(int)
+    aligned = {}
+    for node in chain.nodes:
+        aligned[(node.step_type.value, occurrences[node.step_type])] = node
+        occurrences[node.step_type] += 1
+    return aligned
+
+
+def _node_digest(node: ProvenanceNode) -> str:
+    """Digest of everything the diff compares (not step IDs, timestamps or timings)"""
+    digest = hashlib.sha256()
+    digest.update(f"{node.step_type.value}|{node.confidence!r}|{node.description}|".encode("utf-8"))
+    digest.update((node.input_digest or payload_digest(node.input_data)).encode("ascii"))
+    digest.update((node.output_digest or payload_digest(node.output_data)).encode("ascii"))
+    digest.update((node.metadata_digest or payload_digest(node.metadata)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _diff_nodes(key: NodeKey, old: ProvenanceNode, new: ProvenanceNode) -> NodeDiff:
+    diff = NodeDiff(key, "changed", old_step_id=old.step_id, new_step_id=new.step_id,
+                    old_confidence=old.confidence, new_confidence=new.confidence)
+    if old.description != new.description:
+        diff.changes.append(FieldChange("description", old.description, new.description))
+    for name in ("input_data", "output_data", "metadata"):
+        old_value, new_value = getattr(old, name), getattr(new, name)
+        if old_value != new_value:
+            _diff_values(name, old_value, new_value, diff.changes)
+    return diff
+
+
+def _diff_values(path: str, old: Any, new: Any, changes: List[FieldChange]):
+    """Append leaf-level differences between two JSON-like values"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in [*old, *(key for key in new if key not in old)]:  # stable order
+            if old.get(key) != new.get(key):
+                _diff_values(f"{path}.{key}", old.get(key), new.get(key), changes)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            if old_item != new_item:
+                _diff_values(f"{path}[{i}]", old_item, new_item, changes)
+    elif old != new:
+        changes.append(FieldChange(path, old, new))
+
+
+def _relations(chain: ProvenanceChain) -> Dict[Tuple[str, str], str]:
+    relations = {}
+    for node in chain.get_nodes_by_type(ReasoningStep.LLM_EXTRACTION):
+        for relation in node.output_data.get("relations", []):
+            relations[(relation["event1"], relation["event2"])] = relation["relation"]
+    return relations
+
+
+def _intervals(chain: ProvenanceChain) -> Dict[str, Dict[str, Any]]:
+    intervals = {}
+    for node in chain.get_nodes_by_type(ReasoningStep.SYMBOLIC_SOLVING):
+        solution = node.output_data.get("solution") or {}
+        intervals.update(solution.get("intervals") or {})
+    return intervals
+
+
+def _relation_change(pair: Tuple[str, str], old: Optional[str], new: Optional[str]) -> RelationChange:
+    return RelationChange(pair[0], pair[1], old, new)
+
+
+def _diff_mappings(old: Dict, new: Dict, make: Callable) -> list:
+    changes = [make(key, value, new.get(key)) for key, value in old.items() if new.get(key) != value]
+    changes.extend(make(key, None, value) for key, value in new.items() if key not in old)
+    return changes
+
+
+if __name__ == "__main__":
+    from hybrid_reasoner import HybridTemporalReasoner
+    from llm_interface import MockLLM
+
+    print("=" * 80)
+    print("Provenance Diff - Example")
+    print("=" * 80)
+
+    questions = [
+        "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday. How long was the stay?",
+        "The patient was admitted, received medication treatment and was discharged. What is the order of events?",
+        "The meeting lasted 2 hours, followed by a 30 minute break, then a 1 hour workshop. How long did it take in total?",
+    ]
+
+    runs = {}
+    for accuracy in ("high", "low"):
+        # Seeded, so the same errors are injected on every run
+        reasoner = HybridTemporalReasoner(llm_accuracy=accuracy, llm_backend=MockLLM(accuracy, seed=7))
+        for question in questions * 3:
+            reasoner.reason(question)
+        runs[accuracy] = reasoner.provenance
+
+    run_diff = diff_runs(runs["high"], runs["low"])
+    print(f"\nRun diff (high vs low accuracy): {run_diff.summary()}")
+    for chain_diff in run_diff.changed:
+        print("\n" + chain_diff.to_text())
+
+    print("\n" + "=" * 80)
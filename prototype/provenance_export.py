@@ -0,0 +1,277 @@
+"""
+Batch Explanation Export
+
+Renders text/HTML explanations for many provenance chains at once, e.g. for
+periodic audit exports of a tracker's full history:
+- chains are selected by task ID, by a chain predicate, or from a
+  ProvenanceQueryEngine query (see tasks_matching)
+- batches of chains are shipped to a process pool in the compact wire format
+  and rendered there by the module-level renderers in provenance.py
+- rendered explanations are streamed, in selection order, into a single file
+  or one file per task; the number of batches in flight is bounded so memory
+  stays flat regardless of history size
+- HTML output shares one stylesheet: inlined once in a single-file report,
+  or written once as provenance.css next to per-task files
+- per-task file names are derived from task IDs; an ID that is not a safe
+  file name as-is gets a digest suffix, so distinct tasks never share a file
+
+Small selections are rendered inline, where pool start-up would dominate.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+import hashlib
+import os
+import re
+import time
+
+from provenance import ProvenanceChain, ProvenanceTracker, iter_chain_explanation
+from provenance_wire import decode_chains, encode_chains
+
+
+EXPLANATION_CSS = """\
+body { font-family: sans-serif; margin: 2em; color: #222; }
+.provenance-explanation { border-bottom: 1px solid #ccc; padding-bottom: 1em; margin-bottom: 2em; }
+.reasoning-steps ol { padding-left: 1.5em; }
+.step h4 { margin: 0.6em 0 0.2em; }
+.confidence-high { color: #2e7d32; }
+.confidence-medium { color: #f9a825; }
+.confidence-low { color: #c62828; }
+.final-answer { background: #f5f5f5; padding: 0.5em 1em; }
+"""
+
+STYLESHEET_NAME = "provenance.css"
+
+_EXTENSIONS = {"text": ".txt", "html": ".html"}
+
+
+@dataclass
+class ExportReport:
+    """Summary of a batch export"""
+    format: str
+    chains: int = 0
+    files: List[str] = field(default_factory=list)
+    bytes_written: int = 0  # UTF-8 encoded
+    elapsed_seconds: float = 0.0
+    workers: int = 0  # 0 when rendered inline
+
+    def summary(self) -> dict:
+        return {
+            "format": self.format,
+            "chains": self.chains,
+            "files": len(self.files),
+            "bytes_written": self.bytes_written,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "chains_per_second": round(self.chains / self.elapsed_seconds, 1) if self.elapsed_seconds else None,
+            "workers": self.workers
+        }
+
+
+def render_chain(chain: ProvenanceChain, format: str = "text") -> str:
+    """Render one chain's explanation as a string"""
+    return "\n".join(iter_chain_explanation(chain, format))
+
+
+def _render_batch(encoded: bytes, format: str) -> List[Tuple[str, str]]:
+    """Worker entry point: decode a wire-encoded batch and render every chain"""
+    return [(chain.task_id, render_chain(chain, format)) for chain in decode_chains(encoded)]
+
+
+def tasks_matching(engine, **find_kwargs) -> List[str]:
+    """
+    Task IDs of every chain with at least one node matching
+    ProvenanceQueryEngine.find(**find_kwargs), in first-match order.
+    """
+    task_ids = {}
+    for node in engine.find(**find_kwargs):
+        task_ids.setdefault(engine.task_of(node.step_id), None)
+    return list(task_ids)
+
+
+class BatchExplanationExporter:
+    """Renders and writes explanations for many chains of a tracker"""
+
+    def __init__(self, tracker: ProvenanceTracker, workers: Optional[int] = None,
+                 batch_size: int = 64, inline_threshold: int = 128):
+        """
+        Initialize exporter.
+
+        Args:
+            tracker: Tracker whose chains are exported
+            workers: Render processes (default: CPU count)
+            batch_size: Chains shipped to a worker per task
+            inline_threshold: Selections smaller than this are rendered in-process
+        """
+        self.tracker = tracker
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.inline_threshold = inline_threshold
+
+    def select(self, task_ids: Optional[Iterable[str]] = None,
+               where: Optional[Callable[[ProvenanceChain], bool]] = None) -> List[ProvenanceChain]:
+        """Chains to export: the given task IDs (or all chains), filtered by `where`"""
+        self.tracker.flush()
+        chains = self.tracker.chains
+        ids = list(task_ids) if task_ids is not None else list(chains)
+        selected = []
+        for task_id in ids:
+            chain = chains.get(task_id)
+            if not isinstance(chain, ProvenanceChain):
+                continue  # unknown task or legacy import_chain() dict
+            if where is None or where(chain):
+                selected.append(chain)
+        return selected
+
+    def render(self, chains: List[ProvenanceChain], format: str = "text") -> Iterator[Tuple[str, str]]:
+        """Yield (task_id, explanation) pairs in input order"""
+        if self.workers <= 1 or len(chains) < self.inline_threshold:
+            for chain in chains:
+                yield chain.task_id, render_chain(chain, format)
+            return
+
+        batches = (chains[i:i + self.batch_size] for i in range(0, len(chains), self.batch_size))
+        max_in_flight = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight: Deque = deque()
+            for batch in batches:
+                in_flight.append(pool.submit(_render_batch, encode_chains(batch), format))
+                if len(in_flight) >= max_in_flight:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+    def export(self, path: str,
+               task_ids: Optional[Iterable[str]] = None,
+               where: Optional[Callable[[ProvenanceChain], bool]] = None,
+               format: str = "text",
+               split: bool = False) -> ExportReport:
+        """
+        Render and write explanations for the selected chains.
+
+        Args:
+            path: Output file, or output directory when split=True
+            task_ids: Tasks to export (default: all)
+            where: Additional chain predicate
+            format: "text" or "html"
+            split: Write one file per task instead of a single report
+
+        Returns:
+            ExportReport describing what was written
+        """
+        if format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported export format: {format}")
+
+        started = time.perf_counter()
+        chains = self.select(task_ids, where)
+        pooled = self.workers > 1 and len(chains) >= self.inline_threshold
+        report = ExportReport(format=format, chains=len(chains), workers=self.workers if pooled else 0)
+        rendered = self.render(chains, format)
+
+        if split:
+            self._write_split(path, rendered, format, report)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as out:
+                self._write_single(out, rendered, format, report)
+            report.files.append(path)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def _write_single(self, out: TextIO, rendered: Iterator[Tuple[str, str]],
+                      format: str, report: ExportReport):
+        if format == "html":
+            _write(out, _html_head(f"<style>\n{EXPLANATION_CSS}</style>"), report)
+            for _, body in rendered:
+                _write(out, body + "\n", report)
+            _write(out, _HTML_TAIL, report)
+        else:
+            for i, (_, body) in enumerate(rendered):
+                _write(out, ("\n\n" if i else "") + body, report)
+            _write(out, "\n", report)
+
+    def _write_split(self, directory: str, rendered: Iterator[Tuple[str, str]],
+                     format: str, report: ExportReport):
+        os.makedirs(directory, exist_ok=True)
+        head = ""
+        if format == "html":
+            stylesheet = os.path.join(directory, STYLESHEET_NAME)
+            with open(stylesheet, "w", encoding="utf-8", newline="") as out:
+                _write(out, EXPLANATION_CSS, report)
+            head = _html_head(f"<link rel='stylesheet' href='{STYLESHEET_NAME}'>")
+
+        used_names: Set[str] = set()
+        for task_id, body in rendered:
+            filepath = os.path.join(directory, _safe_filename(task_id, used_names) + _EXTENSIONS[format])
+            with open(filepath, "w", encoding="utf-8", newline="") as out:
+                if format == "html":
+                    _write(out, head + body + "\n" + _HTML_TAIL, report)
+                else:
+                    _write(out, body + "\n", report)
+            report.files.append(filepath)
+
+
+_HTML_TAIL = "</body>\n</html>\n"
+
+
+def _html_head(style: str) -> str:
+    return ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset='utf-8'>\n"
+            f"<title>Reasoning Explanations</title>\n{style}\n</head>\n<body>\n")
+
+
+def _write(out: TextIO, text: str, report: ExportReport):
+    out.write(text)
+    report.bytes_written += len(text.encode("utf-8"))
+
+
+def _safe_filename(task_id: str, used: Set[str]) -> str:
+    """
+    File name stem for a task. IDs that had to be sanitized ("task/1") and
+    names already used in this export (compared case-insensitively, as on
+    case-insensitive file systems) get a digest of the task ID appended, so
+    they cannot collide with "task_1".
+    """
+    name = re.sub(r"[^\w.-]", "_", task_id)
+    if name != task_id or name.casefold() in used:
+        name = f"{name}-{hashlib.sha256(task_id.encode('utf-8')).hexdigest()[:12]}"
+    used.add(name.casefold())
+    return name
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from hybrid_reasoner import HybridTemporalReasoner
+    from provenance import ReasoningStep
+    from provenance_query import ProvenanceQueryEngine
+
+    print("=" * 80)
+    print("Batch Explanation Export - Example")
+    print("=" * 80)
+
+    reasoner = HybridTemporalReasoner(llm_accuracy="medium")
+    questions = [
+        "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday. How long was the stay?",
+        "The patient was admitted, received medication treatment and was discharged. What is the order of events?",
+        "First, the team prepared the presentation. Then, they held the meeting. Finally, they sent the email. What is the order?",
+    ]
+    for i in range(200):
+        reasoner.reason(questions[i % len(questions)])
+
+    exporter = BatchExplanationExporter(reasoner.provenance, workers=4)
+    output_dir = tempfile.mkdtemp(prefix="provenance_export_")
+
+    report = exporter.export(os.path.join(output_dir, "audit.txt"))
+    print(f"\nSingle text report: {report.summary()}")
+
+    report = exporter.export(os.path.join(output_dir, "html"), format="html", split=True)
+    print(f"Per-task HTML files: {report.summary()}")
+
+    engine = ProvenanceQueryEngine(reasoner.provenance)
+    uncertain = tasks_matching(engine, step_type=ReasoningStep.LLM_EXTRACTION, max_confidence=0.85)
+    report = exporter.export(os.path.join(output_dir, "uncertain.html"), task_ids=uncertain, format="html")
+    print(f"Low-confidence extractions only: {report.summary()}")
+
+    print(f"\nOutput written to {output_dir}")
+    print("\n" + "=" * 80)
@@ -0,0 +1,338 @@
+"""
+Provenance Graph Query Engine
+
+Indexes every node of every chain held by a ProvenanceTracker and answers
+graph queries over the combined provenance graph:
+- ancestor / descendant closure of any step (breadth-first reachability,
+  with recent closures kept in a bounded LRU cache)
+- filtering by step type, confidence range, task or arbitrary predicate
+- metadata lookups through an inverted index (e.g. all extractions that
+  produced a given raw answer template)
+- impact analysis: every downstream step and final answer that depends on
+  a set of (e.g. faulty) steps
+
+Parent references may cross chain boundaries; nodes are keyed by step_id.
+The index is refreshed incrementally: the engine watches the tracker's chain
+registry, so a query only scans chains that changed since the last one, and
+new nodes only evict the cached closures of the steps they are connected to.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from caching import LRUCache
+from provenance import ProvenanceChain, ProvenanceNode, ProvenanceTracker, ReasoningStep
+
+
+@dataclass
+class ImpactReport:
+    """Result of an impact analysis"""
+    source_step_ids: List[str]
+    affected_steps: List[ProvenanceNode]
+    affected_answers: Dict[str, Optional[str]] = field(default_factory=dict)  # task_id -> final answer
+
+    @property
+    def affected_task_ids(self) -> List[str]:
+        return list(self.affected_answers)
+
+    def summary(self) -> dict:
+        return {
+            "sources": len(self.source_step_ids),
+            "affected_steps": len(self.affected_steps),
+            "affected_tasks": len(self.affected_answers)
+        }
+
+
+class ProvenanceQueryEngine:
+    """Query engine over all chains stored in a ProvenanceTracker"""
+
+    def __init__(self, tracker: ProvenanceTracker, closure_cache_size: int = 1024):
+        """
+        Initialize query engine.
+
+        Args:
+            tracker: Tracker whose chains are queried
+            closure_cache_size: Ancestor / descendant closures kept (least
+                recently used are evicted)
+        """
+        self.tracker = tracker
+        self._changes = tracker.chains.watch()
+        self._nodes: Dict[str, ProvenanceNode] = {}
+        self._task_of: Dict[str, str] = {}
+        self._order: Dict[str, Tuple[int, int]] = {}  # step_id -> (chain position, node position)
+        self._children: Dict[str, List[str]] = defaultdict(list)
+        self._by_type: Dict[ReasoningStep, List[str]] = defaultdict(list)
+        self._indexed_counts: Dict[str, int] = {}
+        self._chain_positions: Dict[str, int] = {}
+        # ("descendants" | "ancestors", step_id) -> closure
+        self._closures = LRUCache(max_entries=closure_cache_size)
+        self._metadata_index: Dict[str, Dict[Any, List[str]]] = {}
+
+    def refresh(self) -> int:
+        """
+        Index nodes recorded since the last refresh.
+
+        Returns:
+            Number of newly indexed nodes
+        """
+        self.tracker.flush()
+        chains = []
+        for task_id in self._changes.take():
+            chain = self.tracker.chains.get(task_id)
+            if isinstance(chain, ProvenanceChain):  # legacy import_chain() entries are plain dicts
+                chains.append(chain)
+
+        added: List[str] = []
+        for chain in sorted(chains, key=lambda c: (c.start_time, c.task_id)):
+            task_id = chain.task_id
+            start = self._indexed_counts.get(task_id, 0)
+            nodes = chain.nodes
+            if len(nodes) == start:
+                continue
+            chain_position = self._chain_positions.setdefault(task_id, len(self._chain_positions))
+            for position in range(start, len(nodes)):
+                self._index_node(task_id, chain_position, position, nodes[position])
+                added.append(nodes[position].step_id)
+            self._indexed_counts[task_id] = len(nodes)
+
+        if added and len(self._closures):
+            self._invalidate_closures(added)
+        return len(added)
+
+    def _index_node(self, task_id: str, chain_position: int, position: int, node: ProvenanceNode):
+        step_id = node.step_id
+        self._nodes[step_id] = node
+        self._task_of[step_id] = task_id
+        self._order[step_id] = (chain_position, position)
+        self._by_type[node.step_type].append(step_id)
+        for parent_id in node.parent_ids:
+            self._children[parent_id].append(step_id)
+        for key, index in self._metadata_index.items():
+            value = node.metadata.get(key)
+            if _hashable(value):
+                index.setdefault(value, []).append(step_id)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get_node(self, step_id: str) -> Optional[ProvenanceNode]:
+        self.refresh()
+        return self._nodes.get(step_id)
+
+    def task_of(self, step_id: str) -> Optional[str]:
+        self.refresh()
+        return self._task_of.get(step_id)
+
+    def find(self,
+             step_type: Optional[ReasoningStep] = None,
+             min_confidence: Optional[float] = None,
+             max_confidence: Optional[float] = None,
+             task_ids: Optional[Iterable[str]] = None,
+             where: Optional[Callable[[ProvenanceNode], bool]] = None) -> List[ProvenanceNode]:
+        """Find nodes across all chains matching every given filter"""
+        self.refresh()
+        candidates = self._by_type.get(step_type, []) if step_type is not None else self._nodes.keys()
+        return self._filter(candidates, None, min_confidence, max_confidence, task_ids, where)
+
+    def find_by_metadata(self, key: str, value: Any,
+                         step_type: Optional[ReasoningStep] = None) -> List[ProvenanceNode]:
+        """
+        Find nodes whose metadata[key] == value using an inverted index that is
+        built on first use of `key` and maintained incrementally afterwards.
+        """
+        self.refresh()
+        if key not in self._metadata_index:
+            index: Dict[Any, List[str]] = {}
+            for step_id in self._ordered(self._nodes):
+                item = self._nodes[step_id].metadata.get(key)
+                if _hashable(item):
+                    index.setdefault(item, []).append(step_id)
+            self._metadata_index[key] = index
+        if not _hashable(value):
+            return [n for n in self.find(step_type=step_type) if n.metadata.get(key) == value]
+        return self._filter(self._metadata_index[key].get(value, []), step_type)
+
+    # ------------------------------------------------------------------
+    # Closure queries
+    # ------------------------------------------------------------------
+
+    def descendants(self, step_id: str,
+                    step_type: Optional[ReasoningStep] = None,
+                    min_confidence: Optional[float] = None,
+                    max_confidence: Optional[float] = None) -> List[ProvenanceNode]:
+        """All steps that transitively depend on `step_id`"""
+        self.refresh()
+        closure = self._closure(step_id, "descendants")
+        return self._filter(closure, step_type, min_confidence, max_confidence)
+
+    def ancestors(self, step_id: str,
+                  step_type: Optional[ReasoningStep] = None,
+                  min_confidence: Optional[float] = None,
+                  max_confidence: Optional[float] = None) -> List[ProvenanceNode]:
+        """All steps that `step_id` transitively depends on"""
+        self.refresh()
+        closure = self._closure(step_id, "ancestors")
+        return self._filter(closure, step_type, min_confidence, max_confidence)
+
+    def depends_on(self, step_id: str, ancestor_id: str) -> bool:
+        """Whether `step_id` transitively depends on `ancestor_id`"""
+        self.refresh()
+        return step_id in self._closure(ancestor_id, "descendants")
+
+    def impact(self, step_ids: Iterable[str],
+               step_type: Optional[ReasoningStep] = None,
+               min_confidence: Optional[float] = None,
+               max_confidence: Optional[float] = None) -> ImpactReport:
+        """
+        Impact analysis: every downstream step (optionally filtered) and the
+        final answer of every task that depends on any of `step_ids`.
+        A task is affected if any of its steps is a source or a descendant.
+        """
+        self.refresh()
+        sources = [s for s in step_ids if s in self._nodes]
+        affected: Set[str] = set()
+        for source in sources:
+            affected |= self._closure(source, "descendants")
+
+        tasks = {self._task_of[s] for s in affected} | {self._task_of[s] for s in sources}
+        answers = {}
+        for task_id in sorted(tasks, key=lambda t: self._chain_positions[t]):
+            chain = self.tracker.chains.get(task_id)
+            answers[task_id] = chain.final_answer if isinstance(chain, ProvenanceChain) else None
+
+        return ImpactReport(
+            source_step_ids=sources,
+            affected_steps=self._filter(affected, step_type, min_confidence, max_confidence),
+            affected_answers=answers
+        )
+
+    def impact_of(self, step_type: Optional[ReasoningStep] = None,
+                  where: Optional[Callable[[ProvenanceNode], bool]] = None,
+                  **metadata: Any) -> ImpactReport:
+        """
+        Impact analysis seeded by a query, e.g.
+        impact_of(ReasoningStep.LLM_EXTRACTION, raw_answer="...faulty template...")
+        """
+        if metadata:
+            (key, value), *rest = metadata.items()
+            seeds = self.find_by_metadata(key, value, step_type)
+            seeds = [n for n in seeds if all(n.metadata.get(k) == v for k, v in rest)]
+            if where is not None:
+                seeds = [n for n in seeds if where(n)]
+        else:
+            seeds = self.find(step_type=step_type, where=where)
+        return self.impact([n.step_id for n in seeds])
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _parents_of(self, step_id: str) -> List[str]:
+        node = self._nodes.get(step_id)
+        return node.parent_ids if node else []
+
+    def _children_of(self, step_id: str) -> List[str]:
+        return self._children.get(step_id, [])
+
+    def _closure(self, step_id: str, direction: str) -> FrozenSet[str]:
+        """Indexed steps reachable from `step_id` ("descendants" or "ancestors")"""
+        key = (direction, step_id)
+        cached = self._closures.get(key)
+        if cached is not None:
+            return cached
+
+        edges = self._children_of if direction == "descendants" else self._parents_of
+        reached: Set[str] = set()
+        frontier = deque([step_id])
+        while frontier:
+            for nxt in edges(frontier.popleft()):
+                if nxt not in reached and nxt in self._nodes:
+                    reached.add(nxt)
+                    frontier.append(nxt)
+        reached.discard(step_id)
+        closure = frozenset(reached)
+        if step_id in self._nodes:
+            self._closures.put(key, closure)
+        return closure
+
+    def _invalidate_closures(self, new_step_ids: List[str]):
+        """
+        Evict the closures new nodes can change: the descendants of their
+        ancestors and the ancestors of their (already indexed) descendants.
+        """
+        for edges, stale in ((self._parents_of, "descendants"), (self._children_of, "ancestors")):
+            reached = set(new_step_ids)
+            frontier = deque(new_step_ids)
+            while frontier:
+                for nxt in edges(frontier.popleft()):
+                    if nxt not in reached and nxt in self._nodes:
+                        reached.add(nxt)
+                        frontier.append(nxt)
+            for step_id in reached:
+                self._closures.invalidate((stale, step_id))
+
+    def _ordered(self, step_ids: Iterable[str]) -> List[str]:
+        return sorted(step_ids, key=self._order.__getitem__)
+
+    def _filter(self, step_ids: Iterable[str],
+                step_type: Optional[ReasoningStep] = None,
+                min_confidence: Optional[float] = None,
+                max_confidence: Optional[float] = None,
+                task_ids: Optional[Iterable[str]] = None,
+                where: Optional[Callable[[ProvenanceNode], bool]] = None) -> List[ProvenanceNode]:
+        tasks = set(task_ids) if task_ids is not None else None
+        result = []
+        for step_id in self._ordered(step_ids):
+            node = self._nodes[step_id]
+            if step_type is not None and node.step_type != step_type:
+                continue
+            if min_confidence is not None and node.confidence < min_confidence:
+                continue
+            if max_confidence is not None and node.confidence > max_confidence:
+                continue
+            if tasks is not None and self._task_of[step_id] not in tasks:
+                continue
+            if where is not None and not where(node):
+                continue
+            result.append(node)
+        return result
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    from hybrid_reasoner import HybridTemporalReasoner
+
+    print("=" * 80)
+    print("Provenance Query Engine - Example")
+    print("=" * 80)
+
+    reasoner = HybridTemporalReasoner(llm_accuracy="medium")
+    questions = [
+        "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday. How long was the stay?",
+        "The patient was admitted, received medication treatment and was discharged. What is the order of events?",
+        "First, the team prepared the presentation. Then, they held the meeting. Finally, they sent the email. What is the order?",
+    ]
+    for question in questions:
+        reasoner.reason(question)
+
+    engine = ProvenanceQueryEngine(reasoner.provenance)
+
+    # A faulty extraction template: every medical-domain extraction
+    report = engine.impact_of(ReasoningStep.LLM_EXTRACTION, domain="medical")
+    print(f"\nImpact of medical extractions: {report.summary()}")
+    for task_id, answer in report.affected_answers.items():
+        print(f"  {task_id}: {answer}")
+
+    low_confidence = engine.find(max_confidence=0.6)
+    print(f"\nLow-confidence steps: {[n.step_id for n in low_confidence]}")
+
+    print("\n" + "=" * 80)
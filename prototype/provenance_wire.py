@@ -0,0 +1,503 @@
+"""
+Compact Binary Wire Format for Provenance Chains
+
+Schema-driven binary encoding used to ship provenance chains between
+reasoning workers and an aggregator. Compared to ProvenanceChain.to_json():
+- step types are single-byte enum codes
+- ISO timestamps are int64 nanoseconds since the epoch
+- strings are interned in a table shared by the chains of a stream; once
+  it holds `max_interned` strings, the encoder writes a reset record
+  before the next chain and both sides start a new table, so long-lived
+  streams use bounded memory
+- parent references are varint indexes into the chain's node list
+- step IDs of the form "<task_id>_step_<n>" are stored as the varint n
+- node content hashes of tamper-evident chains are raw 32-byte digests
+
+Encoding is streaming: WireEncoder appends chains to any binary stream and
+WireDecoder reads them back one at a time. Decoding reproduces the original
+ProvenanceChain exactly (timestamps that cannot be represented as int64
+nanoseconds without loss, such as those past 2262, are kept as strings).
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+import io
+import struct
+
+from provenance import ProvenanceChain, ProvenanceNode, ReasoningStep
+
+
+MAGIC = b"PVW"
+FORMAT_VERSION = 3  # 2: node content hashes for tamper-evident chains; 3: string table resets
+_READABLE_VERSIONS = (1, 2, 3)
+
+# Record tags
+_TAG_CHAIN = 0x01
+_TAG_RESET_STRINGS = 0x02
+
+# Value tags for payload dictionaries
+_V_NONE = 0
+_V_FALSE = 1
+_V_TRUE = 2
+_V_INT = 3
+_V_FLOAT = 4
+_V_STR = 5
+_V_LIST = 6
+_V_DICT = 7
+_V_TUPLE = 8
+
+# Timestamp tags
+_T_NONE = 0
+_T_NANOS = 1
+_T_STRING = 2
+
+# Chain flags
+_C_SUCCESS = 0x01
+_C_FINAL_ANSWER = 0x02
+_C_ERROR = 0x04
+_C_TAMPER_EVIDENT = 0x08
+
+# Node flags
+_N_INPUT_DIGEST = 0x01
+_N_OUTPUT_DIGEST = 0x02
+_N_METADATA_DIGEST = 0x04
+_N_GENERIC_STEP_ID = 0x08
+_N_TIMING = 0x10
+_N_CONTENT_HASH = 0x20
+
+_STEP_CODES = {step: code for code, step in enumerate(ReasoningStep)}
+_STEP_TYPES = list(ReasoningStep)
+
+_EPOCH = datetime(1970, 1, 1)
+# Timestamps are written as zigzag int64; later or earlier ones as strings
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_DOUBLE = struct.Struct("<d")
+
+
+def _timestamp_to_nanos(timestamp: str) -> Optional[int]:
+    """Convert an ISO timestamp to epoch nanoseconds if that is lossless and fits int64"""
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if dt.tzinfo is not None or dt.isoformat() != timestamp:
+        return None
+    nanos = (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+    return nanos if _INT64_MIN <= nanos <= _INT64_MAX else None
+
+
+def _nanos_to_timestamp(nanos: int) -> str:
+    return (_EPOCH + timedelta(microseconds=nanos // 1000)).isoformat()
+
+
+class WireEncoder:
+    """Streaming encoder writing provenance chains to a binary stream"""
+
+    def __init__(self, stream: BinaryIO, max_interned: int = 65536):
+        """
+        Args:
+            stream: Binary stream to write to
+            max_interned: String table size that triggers a reset before
+                the next chain (a single chain may still add more)
+        """
+        self.stream = stream
+        self.max_interned = max_interned
+        self._strings: Dict[str, int] = {}
+        self._buf = bytearray()
+        self.chains_written = 0
+        self.bytes_written = 0
+        self.table_resets = 0
+        self._emit(MAGIC + bytes([FORMAT_VERSION]))
+
+    def write_chain(self, chain: ProvenanceChain):
+        """Encode one chain and write it to the stream"""
+        buf = self._buf
+        if len(self._strings) >= self.max_interned:
+            buf.append(_TAG_RESET_STRINGS)
+            self._strings.clear()
+            self.table_resets += 1
+        buf.append(_TAG_CHAIN)
+        self._str(chain.task_id)
+        self._str(chain.task_description)
+        self._timestamp(chain.start_time)
+        self._timestamp(chain.end_time)
+
+        flags = 0
+        if chain.success:
+            flags |= _C_SUCCESS
+        if chain.final_answer is not None:
+            flags |= _C_FINAL_ANSWER
+        if chain.error_message is not None:
+            flags |= _C_ERROR
+        if chain.tamper_evident:
+            flags |= _C_TAMPER_EVIDENT
+        buf.append(flags)
+        if chain.final_answer is not None:
+            self._str(chain.final_answer)
+        if chain.error_message is not None:
+            self._str(chain.error_message)
+
+        positions = {node.step_id: i for i, node in enumerate(chain.nodes)}
+        step_prefix = f"{chain.task_id}_step_"
+        self._varint(len(chain.nodes))
+        for node in chain.nodes:
+            self._node(node, positions, step_prefix)
+
+        self._emit(bytes(buf))
+        buf.clear()
+        self.chains_written += 1
+
+    def write_chains(self, chains: Iterable[ProvenanceChain]):
+        for chain in chains:
+            self.write_chain(chain)
+
+    def _emit(self, data: bytes):
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+    def _node(self, node: ProvenanceNode, positions: Dict[str, int], step_prefix: str):
+        buf = self._buf
+        step_number = None
+        if node.step_id.startswith(step_prefix):
+            suffix = node.step_id[len(step_prefix):]
+            if suffix.isdigit() and str(int(suffix)) == suffix:
+                step_number = int(suffix)
+
+        flags = 0
+        if node.input_digest is not None:
+            flags |= _N_INPUT_DIGEST
+        if node.output_digest is not None:
+            flags |= _N_OUTPUT_DIGEST
+        if node.metadata_digest is not None:
+            flags |= _N_METADATA_DIGEST
+        if step_number is None:
+            flags |= _N_GENERIC_STEP_ID
+        timed = node.start_ns is not None and node.end_ns is not None and 0 <= node.start_ns <= node.end_ns
+        if timed:
+            flags |= _N_TIMING
+        if node.content_hash is not None:
+            flags |= _N_CONTENT_HASH
+        buf.append(flags)
+
+        if step_number is None:
+            self._str(node.step_id)
+        else:
+            self._varint(step_number)
+        buf.append(_STEP_CODES[node.step_type])
+        self._timestamp(node.timestamp)
+        self._str(node.description)
+        buf += _DOUBLE.pack(node.confidence)
+        if timed:
+            # Start as-is, end as a delta (durations are small)
+            self._varint(node.start_ns)
+            self._varint(node.end_ns - node.start_ns)
+
+        self._varint(len(node.parent_ids))
+        for parent_id in node.parent_ids:
+            # In-chain parents are stored as index + 1; 0 escapes to a string ID
+            position = positions.get(parent_id)
+            if position is None:
+                self._varint(0)
+                self._str(parent_id)
+            else:
+                self._varint(position + 1)
+
+        self._value(node.input_data)
+        self._value(node.output_data)
+        self._value(node.metadata)
+        for digest in (node.input_digest, node.output_digest, node.metadata_digest):
+            if digest is not None:
+                self._str(digest)
+        if node.content_hash is not None:
+            buf += bytes.fromhex(node.content_hash)
+
+    def _varint(self, value: int):
+        buf = self._buf
+        while value > 0x7F:
+            buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        buf.append(value)
+
+    def _str(self, value: str):
+        # Known strings are written as index + 1; 0 introduces a new string
+        index = self._strings.get(value)
+        if index is not None:
+            self._varint(index + 1)
+            return
+        self._strings[value] = len(self._strings)
+        data = value.encode("utf-8")
+        self._varint(0)
+        self._varint(len(data))
+        self._buf += data
+
+    def _timestamp(self, timestamp: Optional[str]):
+        if timestamp is None:
+            self._buf.append(_T_NONE)
+            return
+        nanos = _timestamp_to_nanos(timestamp)
+        if nanos is None:
+            self._buf.append(_T_STRING)
+            self._str(timestamp)
+        else:
+            self._buf.append(_T_NANOS)
+            self._varint((nanos << 1) ^ (nanos >> 63))
+
+    def _value(self, value: Any):
+        buf = self._buf
+        if value is None:
+            buf.append(_V_NONE)
+        elif value is True:
+            buf.append(_V_TRUE)
+        elif value is False:
+            buf.append(_V_FALSE)
+        elif isinstance(value, int):
+            buf.append(_V_INT)
+            zigzag = value << 1 if value >= 0 else ((-value) << 1) - 1
+            self._varint(zigzag)
+        elif isinstance(value, float):
+            buf.append(_V_FLOAT)
+            buf += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            buf.append(_V_STR)
+            self._str(value)
+        elif isinstance(value, dict):
+            buf.append(_V_DICT)
+            self._varint(len(value))
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise ValueError(f"Unsupported payload key type: {type(key).__name__}")
+                self._str(key)
+                self._value(item)
+        elif isinstance(value, (list, tuple)):
+            buf.append(_V_LIST if isinstance(value, list) else _V_TUPLE)
+            self._varint(len(value))
+            for item in value:
+                self._value(item)
+        else:
+            raise ValueError(f"Unsupported payload value type: {type(value).__name__}")
+
+
+class WireDecoder:
+    """Streaming decoder reading provenance chains from a binary stream"""
+
+    _CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._strings: List[str] = []
+        self._buf = b""
+        self._pos = 0
+        header = self._read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a provenance wire stream")
+        if header[-1] not in _READABLE_VERSIONS:
+            raise ValueError(f"Unsupported wire format version {header[-1]}")
+
+    def read_chain(self) -> Optional[ProvenanceChain]:
+        """Decode the next chain, or return None at end of stream"""
+        if not self._fill(1):
+            return None
+        tag = self._byte()
+        if tag == _TAG_RESET_STRINGS:
+            self._strings.clear()
+            tag = self._byte()
+        if tag != _TAG_CHAIN:
+            raise ValueError(f"Unknown record tag {tag:#x}")
+
+        task_id = self._str()
+        task_description = self._str()
+        start_time = self._timestamp()
+        end_time = self._timestamp()
+        flags = self._byte()
+        final_answer = self._str() if flags & _C_FINAL_ANSWER else None
+        error_message = self._str() if flags & _C_ERROR else None
+
+        chain = ProvenanceChain(
+            task_id=task_id,
+            task_description=task_description,
+            start_time=start_time,
+            end_time=end_time,
+            final_answer=final_answer,
+            success=bool(flags & _C_SUCCESS),
+            error_message=error_message,
+            tamper_evident=bool(flags & _C_TAMPER_EVIDENT)
+        )
+        step_prefix = f"{task_id}_step_"
+        for _ in range(self._varint()):
+            chain.add_node(self._node(chain.nodes, step_prefix))
+        return chain
+
+    def __iter__(self) -> Iterator[ProvenanceChain]:
+        while True:
+            chain = self.read_chain()
+            if chain is None:
+                return
+            yield chain
+
+    def _node(self, previous: List[ProvenanceNode], step_prefix: str) -> ProvenanceNode:
+        flags = self._byte()
+        if flags & _N_GENERIC_STEP_ID:
+            step_id = self._str()
+        else:
+            step_id = f"{step_prefix}{self._varint()}"
+        step_type = _STEP_TYPES[self._byte()]
+        timestamp = self._timestamp()
+        description = self._str()
+        confidence = _DOUBLE.unpack(self._read(8))[0]
+        start_ns = end_ns = None
+        if flags & _N_TIMING:
+            start_ns = self._varint()
+            end_ns = start_ns + self._varint()
+
+        parent_ids = []
+        for _ in range(self._varint()):
+            ref = self._varint()
+            parent_ids.append(self._str() if ref == 0 else previous[ref - 1].step_id)
+
+        input_data = self._value()
+        output_data = self._value()
+        metadata = self._value()
+        input_digest = self._str() if flags & _N_INPUT_DIGEST else None
+        output_digest = self._str() if flags & _N_OUTPUT_DIGEST else None
+        metadata_digest = self._str() if flags & _N_METADATA_DIGEST else None
+        content_hash = self._read(32).hex() if flags & _N_CONTENT_HASH else None
+
+        return ProvenanceNode(
+            step_id=step_id,
+            step_type=step_type,
+            timestamp=timestamp,
+            description=description,
+            input_data=input_data,
+            output_data=output_data,
+            confidence=confidence,
+            parent_ids=parent_ids,
+            metadata=metadata,
+            input_digest=input_digest,
+            output_digest=output_digest,
+            metadata_digest=metadata_digest,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            content_hash=content_hash
+        )
+
+    def _fill(self, size: int) -> bool:
+        """Ensure at least `size` unread bytes are buffered"""
+        while len(self._buf) - self._pos < size:
+            chunk = self.stream.read(max(self._CHUNK_SIZE, size))
+            if not chunk:
+                return False
+            self._buf = self._buf[self._pos:] + chunk
+            self._pos = 0
+        return True
+
+    def _read(self, size: int) -> bytes:
+        if not self._fill(size):
+            raise ValueError("Truncated provenance wire stream")
+        data = self._buf[self._pos:self._pos + size]
+        self._pos += size
+        return data
+
+    def _byte(self) -> int:
+        if self._pos >= len(self._buf) and not self._fill(1):
+            raise ValueError("Truncated provenance wire stream")
+        value = self._buf[self._pos]
+        self._pos += 1
+        return value
+
+    def _varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self._byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def _str(self) -> str:
+        ref = self._varint()
+        if ref:
+            return self._strings[ref - 1]
+        value = self._read(self._varint()).decode("utf-8")
+        self._strings.append(value)
+        return value
+
+    def _timestamp(self) -> Optional[str]:
+        tag = self._byte()
+        if tag == _T_NONE:
+            return None
+        if tag == _T_STRING:
+            return self._str()
+        zigzag = self._varint()
+        return _nanos_to_timestamp((zigzag >> 1) ^ -(zigzag & 1))
+
+    def _value(self) -> Any:
+        tag = self._byte()
+        if tag == _V_NONE:
+            return None
+        if tag == _V_TRUE:
+            return True
+        if tag == _V_FALSE:
+            return False
+        if tag == _V_INT:
+            zigzag = self._varint()
+            return (zigzag >> 1) ^ -(zigzag & 1)
+        if tag == _V_FLOAT:
+            return _DOUBLE.unpack(self._read(8))[0]
+        if tag == _V_STR:
+            return self._str()
+        if tag == _V_DICT:
+            return {self._str(): self._value() for _ in range(self._varint())}
+        if tag == _V_LIST:
+            return [self._value() for _ in range(self._varint())]
+        if tag == _V_TUPLE:
+            return tuple(self._value() for _ in range(self._varint()))
+        raise ValueError(f"Unknown value tag {tag:#x}")
+
+
+def encode_chains(chains: Iterable[ProvenanceChain]) -> bytes:
+    """Encode chains into a single wire-format byte string"""
+    stream = io.BytesIO()
+    WireEncoder(stream).write_chains(chains)
+    return stream.getvalue()
+
+
+def decode_chains(data: bytes) -> List[ProvenanceChain]:
+    """Decode every chain in a wire-format byte string"""
+    return list(WireDecoder(io.BytesIO(data)))
+
+
+if __name__ == "__main__":
+    from provenance import ProvenanceTracker
+
+    print("=" * 80)
+    print("Provenance Wire Format - Example")
+    print("=" * 80)
+
+    tracker = ProvenanceTracker()
+    for i in range(100):
+        task_id = f"task_{i:04d}"
+        tracker.start_task(task_id, "Determine patient hospital stay duration")
+        llm_step = tracker.record_llm_extraction(
+            query="Patient admitted Monday, surgery Tuesday, discharged Friday",
+            events=[{"name": "admission"}, {"name": "surgery"}, {"name": "discharge"}],
+            relations=[{"event1": "admission", "event2": "surgery", "relation": "before"}],
+            confidence=0.9
+        )
+        tracker.record_symbolic_constraint(
+            constraint_desc="admission before surgery",
+            constraint_data={"interval1": "admission", "interval2": "surgery", "relation": "before"},
+            parent_ids=[llm_step]
+        )
+        tracker.end_task(task_id, "The patient stayed in hospital for 4 days.")
+
+    chains = list(tracker.chains.values())
+    json_size = sum(len(chain.to_json(indent=2)) for chain in chains)
+    data = encode_chains(chains)
+    decoded = decode_chains(data)
+
+    print(f"Chains: {len(chains)}")
+    print(f"JSON size: {json_size} bytes")
+    print(f"Wire size: {len(data)} bytes ({json_size / len(data):.1f}x smaller)")
+    print(f"Exact round trip: {decoded == chains}")
+    print("\n" + "=" * 80)
@@ -0,0 +1,246 @@
+"""
+Self-Consistency Voting
+
+Extraction mode that asks N samplers (e.g. MockLLM at different seeds, or
+several model endpoints) for the same text concurrently and merges their
+answers into one response:
+- every relation is a vote for (event pair, Allen relation); relations are
+  normalized to one orientation, so "a before b" and "b after a" agree
+- votes are tallied as each sample arrives (samples are merged incrementally,
+  in completion order)
+- the tally is then resolved most-voted first through an
+  IncrementalConstraintSolver: a relation contradicting better-supported
+  ones is dropped, so one sample's error cannot make the network inconsistent
+- each kept relation is reported as most samples wrote it, with its vote
+  share as confidence
+
+SelfConsistencyBackend is itself an LLMBackend, so it drops into
+HybridTemporalReasoner(llm_backend=...) unchanged.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import threading
+
+from llm_interface import (
+    ErrorModel, ExtractionLevel, LatencyModel, LLMBackend, LLMResponse, MockLLM,
+    TemporalEvent, TemporalRelation, backend_version_of
+)
+from temporal_core import AllenAlgebra, IncrementalConstraintSolver, relation_from_name
+
+
+# (first event, second event, relation name) in canonical orientation
+VoteKey = Tuple[str, str, str]
+
+
+@dataclass
+class _Ballot:
+    votes: int = 0
+    confidence_sum: float = 0.0
+    first_seen: int = 0
+    spellings: Counter = field(default_factory=Counter)  # (event1, event2, relation) as sampled
+
+
+@dataclass
+class VoteTally:
+    """Votes of the samples merged so far, for one text"""
+    samples: int = 0
+    ballots: Dict[VoteKey, _Ballot] = field(default_factory=dict)
+    events: Dict[str, TemporalEvent] = field(default_factory=dict)
+    answers: Counter = field(default_factory=Counter)
+    domains: Counter = field(default_factory=Counter)
+    confidence_sum: float = 0.0
+
+    def add(self, response: LLMResponse):
+        """Merge one sample"""
+        self.samples += 1
+        for event in response.events:
+            self.events.setdefault(event.name, event)
+        for relation in response.relations:
+            key = canonical_relation(relation)
+            ballot = self.ballots.get(key)
+            if ballot is None:
+                ballot = self.ballots[key] = _Ballot(first_seen=len(self.ballots))
+            ballot.votes += 1
+            ballot.confidence_sum += relation.confidence
+            ballot.spellings[(relation.event1, relation.event2, relation.relation)] += 1
+        self.answers[response.raw_answer] += 1
+        metadata = response.metadata or {}
+        self.domains[metadata.get("domain")] += 1
+        self.confidence_sum += metadata.get("confidence", 0.8)
+
+    def resolve(self, level: ExtractionLevel, min_votes: int = 1) -> LLMResponse:
+        """
+        Merged response: relations with at least `min_votes` votes, most
+        voted first, minus those contradicting better-supported relations.
+        """
+        solver = IncrementalConstraintSolver()
+        ranked = sorted(self.ballots.items(),
+                        key=lambda item: (-item[1].votes, -item[1].confidence_sum, item[1].first_seen))
+        relations: List[TemporalRelation] = []
+        dropped: List[str] = []
+        for (event1, event2, name), ballot in ranked:
+            if ballot.votes < min_votes:
+                dropped.append(f"{event1} {name} {event2} ({ballot.votes} votes)")
+                continue
+            allen_relation = relation_from_name(name)
+            if allen_relation is not None and not solver.add_relation_checked(event1, event2, {allen_relation}):
+                dropped.append(f"{event1} {name} {event2} ({ballot.votes} votes)")
+                continue
+            # Reported as most samples wrote it
+            event1, event2, name = ballot.spellings.most_common(1)[0][0]
+            relations.append(TemporalRelation(event1, event2, name, ballot.votes / self.samples))
+
+        raw_answer = self.answers.most_common(1)[0][0] if self.answers else ""
+        return LLMResponse(
+            events=list(self.events.values()),
+            relations=relations,
+            raw_answer=raw_answer,
+            extraction_level=level,
+            metadata={
+                "domain": self.domains.most_common(1)[0][0] if self.domains else None,
+                "confidence": self.confidence_sum / self.samples if self.samples else 0.0,
+                "samples": self.samples,
+                "answer_agreement": self.answers[raw_answer] / self.samples if self.samples else 0.0,
+                "dropped_relations": dropped
+            }
+        )
+
+
+def canonical_relation(relation: TemporalRelation) -> VoteKey:
+    """Vote key of a relation: endpoints in sorted order, relation inverted to match"""
+    name = relation.relation.lower().strip()
+    allen_relation = relation_from_name(name)
+    if allen_relation is not None:
+        name = allen_relation.value
+    if relation.event1 <= relation.event2 or allen_relation is None:
+        return relation.event1, relation.event2, name
+    return relation.event2, relation.event1, AllenAlgebra.inverse(allen_relation).value
+
+
+class SelfConsistencyBackend:
+    """LLMBackend sampling several backends concurrently and voting on their relations"""
+
+    def __init__(self, samplers: Sequence[LLMBackend], min_votes: int = 1,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize voting backend.
+
+        Args:
+            samplers: Backends asked for every text (one sample each)
+            min_votes: Votes a relation needs to be kept at all
+            max_workers: Concurrent sample requests (default: one per sampler)
+        """
+        if not samplers:
+            raise ValueError("At least one sampler is required")
+        self.samplers = list(samplers)
+        self.min_votes = min_votes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(self.samplers),
+                                            thread_name_prefix="self-consistency")
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.relations_dropped = 0
+
+    @classmethod
+    def from_seeds(cls, samples: int, accuracy_level: str = "medium", base_seed: int = 0,
+                   error_model: Optional[ErrorModel] = None, latency: Optional[LatencyModel] = None,
+                   min_votes: int = 1) -> "SelfConsistencyBackend":
+        """N MockLLM samplers that differ only in their seed"""
+        samplers = [MockLLM(accuracy_level, seed=base_seed + i, error_model=error_model, latency=latency)
+                    for i in range(samples)]
+        return cls(samplers, min_votes=min_votes)
+
+    @property
+    def backend_version(self) -> Optional[str]:
+        """Identity of the vote: min_votes and every sampler's identity (None if one has none)"""
+        versions = [backend_version_of(sampler) for sampler in self.samplers]
+        if None in versions:
+            return None
+        return f"vote:min={self.min_votes}:[{'|'.join(versions)}]"
+
+    def extract_temporal_info(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        tally = VoteTally()
+        futures = [self._executor.submit(sampler.extract_temporal_info, text, level) for sampler in self.samplers]
+        for future in as_completed(futures):
+            tally.add(future.result())
+        return self._resolve(tally, level)
+
+    def extract_batch(self, texts: Sequence[str], level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> List[LLMResponse]:
+        """One batch per sampler, all samplers concurrently"""
+        tallies = [VoteTally() for _ in texts]
+        futures = [self._executor.submit(sampler.extract_batch, list(texts), level) for sampler in self.samplers]
+        for future in as_completed(futures):
+            responses = future.result()
+            if len(responses) != len(tallies):
+                raise RuntimeError(f"Sampler returned {len(responses)} responses for {len(tallies)} texts")
+            for tally, response in zip(tallies, responses):
+                tally.add(response)
+        return [self._resolve(tally, level) for tally in tallies]
+
+    async def aextract(self, text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        tally = VoteTally()
+        for sample in asyncio.as_completed([sampler.aextract(text, level) for sampler in self.samplers]):
+            tally.add(await sample)
+        return self._resolve(tally, level)
+
+    def _resolve(self, tally: VoteTally, level: ExtractionLevel) -> LLMResponse:
+        response = tally.resolve(level, self.min_votes)
+        with self._lock:
+            self.texts += 1
+            self.relations_dropped += len(response.metadata["dropped_relations"])
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"samplers": len(self.samplers), "texts": self.texts,
+                    "relations_dropped": self.relations_dropped}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SelfConsistencyBackend":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 80)
+    print("Self-Consistency Voting - Example")
+    print("=" * 80)
+
+    text = "The patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday."
+    level = ExtractionLevel.LEVEL_2_ORDERING
+    # Each sample reverses one relation 30% of the time
+    error_model = ErrorModel(rates={("medical_timeline", None): 0.3})
+    latency = LatencyModel(base_seconds=0.02)
+    trials = 40
+
+    def wrong(response: LLMResponse) -> bool:
+        return any(r.relation != "before" for r in response.relations) or len(response.relations) < 2
+
+    single = MockLLM(seed=100, error_model=error_model, latency=latency)
+    started = time.perf_counter()
+    single_errors = sum(wrong(single.extract_temporal_info(text, level)) for _ in range(trials))
+    single_time = (time.perf_counter() - started) / trials
+
+    with SelfConsistencyBackend.from_seeds(5, error_model=error_model, latency=latency) as voter:
+        started = time.perf_counter()
+        voted_errors = sum(wrong(voter.extract_temporal_info(text, level)) for _ in range(trials))
+        voted_time = (time.perf_counter() - started) / trials
+        response = voter.extract_temporal_info(text, level)
+        stats = voter.stats()
+
+    print(f"\nSingle sample: {single_errors}/{trials} wrong orderings, {single_time * 1000:.1f} ms per text")
+    print(f"5-sample vote: {voted_errors}/{trials} wrong orderings, {voted_time * 1000:.1f} ms per text")
+    print(f"Voted relations: {[(r.event1, r.relation, r.event2, r.confidence) for r in response.relations]}")
+    print(f"Stats: {stats}")
+
+    print("\n" + "=" * 80)
@@ -0,0 +1,288 @@
+"""
+Process-Pool Constraint Solving
+
+Path consistency (AllenAlgebra.is_consistent) is pure Python and holds the
+GIL, so threads cannot solve networks in parallel. SolverPool runs it in a
+pool of worker processes instead:
+- a network crosses the process boundary as an n x n uint16 matrix in
+  multiprocessing.shared_memory, not as a pickled dict of sets: bits 0-12
+  hold the Allen relation mask of an edge, bit 15 marks the edge as
+  present (the constraint dict may hold either or both orientations of a
+  pair, and propagation never adds edges)
+- the worker refines the matrix in place, with the same algorithm and the
+  same composition table as is_consistent, so answers do not depend on
+  where a network was solved
+- workers stay up for the pool's lifetime with the composition and
+  inverse tables precomputed as masks
+- networks with fewer than `inline_below` intervals are solved in the
+  calling thread, where they cost less than a round trip to a worker
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Set, Tuple
+import multiprocessing
+import os
+import threading
+
+from temporal_core import (
+    AllenAlgebra, AllenRelation, ALL_RELATIONS_MASK, inverse_masks, mask_to_relations,
+    propagate_network, relations_to_mask
+)
+
+
+EDGE_PRESENT = 1 << 15
+RELATION_MASK = ALL_RELATIONS_MASK  # bits 0-12
+
+Constraints = Dict[Tuple[str, str], Set[AllenRelation]]
+
+_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+@lru_cache(maxsize=None)
+def algebra_composition_masks() -> Tuple[Tuple[int, ...], ...]:
+    """AllenAlgebra.compose as a table of masks (the table is_consistent uses)"""
+    relations = list(AllenRelation)
+    return tuple(tuple(relations_to_mask(AllenAlgebra.compose(r1, r2)) for r2 in relations)
+                 for r1 in relations)
+
+
+@lru_cache(maxsize=1 << 16)
+def _compose(mask1: int, mask2: int) -> int:
+    table = algebra_composition_masks()
+    result = 0
+    i = 0
+    while mask1:
+        if mask1 & 1:
+            row = table[i]
+            m2, j = mask2, 0
+            while m2:
+                if m2 & 1:
+                    result |= row[j]
+                m2 >>= 1
+                j += 1
+        mask1 >>= 1
+        i += 1
+    return result
+
+
+def propagate_matrix(matrix: List[int], n: int, max_iterations: int = 100) -> bool:
+    """
+    AllenAlgebra.is_consistent over an edge matrix, refining it in place.
+
+    Args:
+        matrix: n * n entries, row-major; EDGE_PRESENT | relation mask for
+            each stored edge, 0 elsewhere
+        n: Number of intervals
+
+    Returns:
+        True if no edge became empty
+    """
+    inverse = inverse_masks()
+    # Pairs constrained in either orientation; propagation only visits those
+    neighbours = [set() for _ in range(n)]
+    for i in range(n):
+        row = i * n
+        for j in range(n):
+            if matrix[row + j] & EDGE_PRESENT:
+                neighbours[i].add(j)
+                neighbours[j].add(i)
+    neighbours = [sorted(adjacent) for adjacent in neighbours]
+    common = {}
+
+    def oriented(i: int, j: int) -> int:
+        # The stored edge i -> j, else the inverse of the stored edge j -> i
+        entry = matrix[i * n + j]
+        if entry & EDGE_PRESENT:
+            return entry & RELATION_MASK
+        return inverse[matrix[j * n + i] & RELATION_MASK]
+
+    changed = True
+    iterations = 0
+    while changed and iterations < max_iterations:
+        changed = False
+        iterations += 1
+        for i in range(n):
+            for j in neighbours[i]:
+                if (i, j) not in common:
+                    common[(i, j)] = sorted(set(neighbours[i]).intersection(neighbours[j]))
+                ij = oriented(i, j)
+                for k in common[(i, j)]:
+                    if k == i or k == j:
+                        continue
+                    composed = _compose(ij, oriented(j, k))
+                    position = i * n + k
+                    if matrix[position] & EDGE_PRESENT:
+                        old = matrix[position] & RELATION_MASK
+                        new = old & composed
+                        if not new:
+                            return False
+                        if new != old:
+                            matrix[position] = EDGE_PRESENT | new
+                            changed = True
+                    else:
+                        position = k * n + i
+                        old = inverse[matrix[position] & RELATION_MASK]
+                        new = old & composed
+                        if not new:
+                            return False
+                        if new != old:
+                            matrix[position] = EDGE_PRESENT | inverse[new]
+                            changed = True
+    return True
+
+
+def encode_network(constraints: Constraints) -> Tuple[List[str], List[int]]:
+    """Interval names and the edge matrix of a constraint dict"""
+    names = sorted({name for pair in constraints for name in pair})
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    matrix = [0] * (n * n)
+    for (first, second), relations in constraints.items():
+        matrix[index[first] * n + index[second]] = EDGE_PRESENT | relations_to_mask(relations)
+    return names, matrix
+
+
+def decode_network(constraints: Constraints, names: List[str], matrix: List[int]) -> Constraints:
+    """The constraint dict (keys in their original order) with the matrix's relations"""
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    return {(first, second): mask_to_relations(matrix[index[first] * n + index[second]] & RELATION_MASK)
+            for first, second in constraints}
+
+
+def _warm_worker():
+    algebra_composition_masks()
+    inverse_masks()
+
+
+def _solve_shared(segment_name: str, n: int) -> bool:
+    """Worker: propagate the matrix in a shared-memory segment, in place"""
+    segment = shared_memory.SharedMemory(name=segment_name)
+    view = segment.buf.cast("H")
+    try:
+        matrix = view[:n * n].tolist()
+        consistent = propagate_matrix(matrix, n)
+        view[:n * n] = array("H", matrix)
+        return consistent
+    finally:
+        view.release()
+        segment.close()
+
+
+class SolverPool:
+    """Warm worker processes solving constraint networks passed through shared memory"""
+
+    def __init__(self, processes: Optional[int] = None, inline_below: int = 12):
+        """
+        Initialize the pool and start its workers.
+
+        Args:
+            processes: Worker processes (default: one per CPU)
+            inline_below: Networks with fewer intervals are solved in the
+                calling thread
+        """
+        self.inline_below = inline_below
+        self.processes = processes or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=_CONTEXT,
+                                             initializer=_warm_worker)
+        # Start every worker now rather than on the first large network
+        for future in [self._executor.submit(_warm_worker) for _ in range(self.processes)]:
+            future.result()
+        self._lock = threading.Lock()
+        self.counts = {"inline": 0, "pooled": 0}
+
+    def solve(self, constraints: Constraints) -> Tuple[bool, Constraints]:
+        """
+        Propagate a network; blocks until it is solved.
+
+        Args:
+            constraints: Constraint dict as held by TemporalConstraintSolver
+
+        Returns:
+            (consistent, the constraints as refined by propagation)
+        """
+        if len({name for pair in constraints for name in pair}) < max(self.inline_below, 2):
+            self._count("inline")
+            return propagate_network(constraints)
+
+        self._count("pooled")
+        names, matrix = encode_network(constraints)
+        n = len(names)
+        segment = shared_memory.SharedMemory(create=True, size=2 * n * n)
+        try:
+            view = segment.buf.cast("H")
+            try:
+                view[:n * n] = array("H", matrix)
+                consistent = self._executor.submit(_solve_shared, segment.name, n).result()
+                refined = view[:n * n].tolist()
+            finally:
+                view.release()
+        finally:
+            segment.close()
+            segment.unlink()
+        return consistent, decode_network(constraints, names, refined)
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counts)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SolverPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("=" * 80)
+    print("Process-Pool Constraint Solving - Example")
+    print("=" * 80)
+
+    def random_network(rng: random.Random, n: int, edges: int) -> Constraints:
+        names = [f"e{i}" for i in range(n)]
+        constraints = {}
+        while len(constraints) < edges:
+            first, second = rng.sample(names, 2)
+            constraints[(first, second)] = set(rng.sample(list(AllenRelation), rng.randint(3, 9)))
+        return constraints
+
+    rng = random.Random(0)
+    networks = [random_network(rng, 40, 200) for _ in range(8)]
+
+    started = time.perf_counter()
+    inline = [AllenAlgebra.is_consistent({k: set(v) for k, v in network.items()}) for network in networks]
+    inline_time = time.perf_counter() - started
+
+    # Workers visit only constrained triples, so they win even on one CPU;
+    # with more CPUs the networks are also solved in parallel
+    with SolverPool() as pool, ThreadPoolExecutor(max_workers=8) as threads:
+        started = time.perf_counter()
+        pooled = list(threads.map(lambda network: pool.solve(network)[0], networks))
+        pooled_time = time.perf_counter() - started
+        small = pool.solve({("a", "b"): {AllenRelation.BEFORE}, ("b", "c"): {AllenRelation.BEFORE}})
+        stats = pool.stats()
+
+    print(f"\n{len(networks)} networks of 40 intervals / 200 edges, {stats['pooled']} solved by "
+          f"{pool.processes} worker process(es)")
+    print(f"Inline is_consistent: {inline_time * 1000:.0f} ms, SolverPool: {pooled_time * 1000:.0f} ms "
+          f"(same verdicts: {inline == pooled})")
+    print(f"Small network solved inline: {small[0]}, stats: {stats}")
+
+    print("\n" + "=" * 80)
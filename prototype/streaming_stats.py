@@ -0,0 +1,144 @@
+"""
+Streaming Statistics
+
+Constant-memory summaries of value streams, shared by the provenance
+aggregators and the extraction scheduler's metrics:
+- RunningStats: count, mean, variance (Welford), min and max
+- QuantileSketch: fixed-bin quantiles for values in [0, 1], e.g. confidences
+- LatencyHistogram: power-of-two buckets and quantiles for nanosecond durations
+
+None of them lock; callers that share one between threads guard it.
+"""
+
+
+class RunningStats:
+    """Online mean/variance (Welford) with min and max"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return self.variance ** 0.5
+
+
+class QuantileSketch:
+    """
+    Fixed-bin streaming quantile sketch for values in [0, 1].
+
+    O(1) updates and O(bins) queries; quantiles are accurate to within half
+    a bin width (0.005 with the default 100 bins).
+    """
+
+    def __init__(self, bins: int = 100):
+        self.bins = bins
+        self.counts = [0] * bins
+        self.total = 0
+
+    def add(self, value: float):
+        index = int(value * self.bins)
+        self.counts[min(max(index, 0), self.bins - 1)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> float:
+        if self.total == 0:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                # Interpolate linearly inside the bin
+                return (index + (rank - seen) / count) / self.bins
+            seen += count
+        return 1.0
+
+
+class LatencyHistogram:
+    """
+    Streaming latency histogram with power-of-two nanosecond buckets.
+
+    Bucket b holds durations in [2^(b-1), 2^b); quantiles interpolate
+    linearly inside a bucket.
+    """
+
+    def __init__(self):
+        self.counts = [0] * 64
+        self.stats = RunningStats()
+
+    def add(self, duration_ns: int):
+        self.counts[min(max(duration_ns, 0).bit_length(), 63)] += 1
+        self.stats.add(duration_ns)
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile in nanoseconds"""
+        total = self.stats.count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = 0 if bucket == 0 else 1 << (bucket - 1)
+                high = 1 << bucket
+                value = low + (high - low) * (rank - seen) / count
+                return min(max(value, self.stats.min), self.stats.max)
+            seen += count
+        return self.stats.max
+
+    def to_dict(self) -> dict:
+        stats = self.stats
+        return {
+            "count": stats.count,
+            "mean_ms": stats.mean / 1e6,
+            "min_ms": stats.min / 1e6 if stats.count else 0.0,
+            "max_ms": stats.max / 1e6 if stats.count else 0.0,
+            "p50_ms": self.quantile(0.5) / 1e6,
+            "p90_ms": self.quantile(0.9) / 1e6,
+            "p99_ms": self.quantile(0.99) / 1e6,
+            "buckets": {f"<{(1 << b) / 1e6:g}ms": c for b, c in enumerate(self.counts) if c}
+        }
+
+
+if __name__ == "__main__":
+    import random
+
+    print("=" * 80)
+    print("Streaming Statistics - Example")
+    print("=" * 80)
+
+    rng = random.Random(0)
+    confidences = RunningStats()
+    sketch = QuantileSketch()
+    latencies = LatencyHistogram()
+    for _ in range(10000):
+        confidence = rng.betavariate(8, 2)
+        confidences.add(confidence)
+        sketch.add(confidence)
+        latencies.add(int(rng.lognormvariate(14, 0.5)))  # ~1.2 ms median
+
+    print(f"\nConfidence mean {confidences.mean:.3f}, stddev {confidences.stddev:.3f}, "
+          f"p10/p50/p90 {sketch.quantile(0.1):.3f} / {sketch.quantile(0.5):.3f} / {sketch.quantile(0.9):.3f}")
+    summary = latencies.to_dict()
+    print(f"Latency p50/p99 {summary['p50_ms']:.2f} / {summary['p99_ms']:.2f} ms over {summary['count']} samples")
+
+    print("\n" + "=" * 80)
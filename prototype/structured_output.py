@@ -0,0 +1,246 @@
+"""
+Streaming Structured-Output Parser
+
+Model backends return extractions as JSON text in the LLMResponse.to_dict()
+layout:
+
+    {"events": [{"name": ..., "description": ...}, ...],
+     "relations": [{"event1": ..., "event2": ..., "relation": ...}, ...],
+     "raw_answer": ..., "extraction_level": 2, "metadata": {...}}
+
+StreamingResponseParser consumes that text chunk by chunk as the model
+decodes it and emits each TemporalEvent / TemporalRelation the moment its
+object closes, so symbolic conversion can run while generation continues.
+Text before the first "{" and after the object closes (prose, code fences)
+is ignored.
+"""
+
+from dataclasses import fields
+from typing import Iterable, Iterator, List, Optional, Union
+import json
+
+from llm_interface import ExtractionLevel, LLMResponse, TemporalEvent, TemporalRelation
+
+
+StreamItem = Union[TemporalEvent, TemporalRelation]
+
+_EVENT_FIELDS = frozenset(f.name for f in fields(TemporalEvent))
+_RELATION_FIELDS = frozenset(f.name for f in fields(TemporalRelation))
+
+
+class StructuredOutputError(ValueError):
+    """The model output is not a valid extraction document"""
+
+
+def event_from_dict(data: dict) -> TemporalEvent:
+    """TemporalEvent from model JSON; unknown keys are ignored"""
+    if not isinstance(data, dict) or not data.get("name"):
+        raise StructuredOutputError(f"Event without a name: {data!r}")
+    values = {key: value for key, value in data.items() if key in _EVENT_FIELDS}
+    values.setdefault("description", "")
+    return TemporalEvent(**values)
+
+
+def relation_from_dict(data: dict) -> TemporalRelation:
+    """TemporalRelation from model JSON; unknown keys are ignored"""
+    if not isinstance(data, dict) or not all(data.get(key) for key in ("event1", "event2", "relation")):
+        raise StructuredOutputError(f"Relation needs event1, event2 and relation: {data!r}")
+    values = {key: value for key, value in data.items() if key in _RELATION_FIELDS}
+    values["confidence"] = float(values.get("confidence", 1.0))
+    return TemporalRelation(**values)
+
+
+_ITEM_BUILDERS = {"events": event_from_dict, "relations": relation_from_dict}
+
+
+class StreamingResponseParser:
+    """
+    Incremental parser for one streamed extraction document.
+
+    Only bracket depth, string/escape state and the current top-level key
+    are tracked while scanning; each array element of "events" or
+    "relations" is decoded with json.loads once it closes. Malformed
+    elements are skipped and reported in `errors`.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []       # the document, from its opening brace
+        self._item: List[str] = []         # characters of the element being read
+        self._capturing = False
+        self._stack: List[str] = []        # open brackets
+        self._in_string = False
+        self._escape = False
+        self._key_chars: Optional[List[str]] = None
+        self._expect_key = False
+        self._section: Optional[str] = None  # top-level key whose value is being read
+        self._done = False
+        self.events: List[TemporalEvent] = []
+        self.relations: List[TemporalRelation] = []
+        self.errors: List[str] = []
+        self.chars_consumed = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level object has closed"""
+        return self._done
+
+    def feed(self, chunk: str) -> List[StreamItem]:
+        """
+        Consume the next piece of model output.
+
+        Args:
+            chunk: Text in stream order (any split, even inside strings)
+
+        Returns:
+            Events and relations completed by this chunk, in document order
+        """
+        completed: List[StreamItem] = []
+        if self._done:
+            return completed
+        self.chars_consumed += len(chunk)
+        start = None if self._stack else chunk.find("{")
+        if start is not None:
+            if start < 0:
+                return completed  # still in leading prose
+            chunk = chunk[start:]
+
+        stack = self._stack
+        item = self._item
+        for position, char in enumerate(chunk):
+            if self._capturing:
+                item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._end_key()
+                elif self._key_chars is not None:
+                    self._key_chars.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if len(stack) == 1 and self._expect_key:
+                    self._key_chars = []
+            elif char in "{[":
+                stack.append(char)
+                if len(stack) == 1:
+                    self._expect_key = True
+                elif len(stack) == 3 and self._section is not None and stack[1] == "[":
+                    self._capturing = True
+                    item.append(char)
+            elif char in "}]":
+                if not stack:
+                    raise StructuredOutputError("Unbalanced closing bracket in model output")
+                stack.pop()
+                if len(stack) == 2 and self._capturing:
+                    self._capturing = False
+                    completed.extend(self._emit_item())
+                elif len(stack) == 1:
+                    self._section = None
+                elif not stack:
+                    self._chunks.append(chunk[:position + 1])
+                    self._done = True
+                    return completed
+            elif char == "," and len(stack) == 1:
+                self._expect_key = True
+                self._section = None
+        self._chunks.append(chunk)
+        return completed
+
+    def finish(self, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+        """
+        Validate the complete document and build the LLMResponse.
+
+        Args:
+            level: Extraction level to report if the document omits it
+
+        Returns:
+            The response, with the events and relations already emitted
+        """
+        if not self._done:
+            raise StructuredOutputError("Model output ended before the JSON object closed")
+        try:
+            document = json.loads("".join(self._chunks))
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"Invalid JSON in model output: {e}") from e
+        if not isinstance(document, dict):
+            raise StructuredOutputError("Model output is not a JSON object")
+        try:
+            extraction_level = ExtractionLevel(document.get("extraction_level", level.value))
+        except ValueError:
+            extraction_level = level
+        return LLMResponse(
+            events=list(self.events),
+            relations=list(self.relations),
+            raw_answer=str(document.get("raw_answer", "")),
+            extraction_level=extraction_level,
+            metadata=document.get("metadata") or {}
+        )
+
+    def _end_key(self):
+        key = "".join(self._key_chars)
+        self._key_chars = None
+        self._expect_key = False
+        self._section = key if key in _ITEM_BUILDERS else None
+
+    def _emit_item(self) -> List[StreamItem]:
+        text = "".join(self._item)
+        self._item.clear()
+        try:
+            item = _ITEM_BUILDERS[self._section](json.loads(text))
+        except (json.JSONDecodeError, StructuredOutputError, TypeError, ValueError) as e:
+            self.errors.append(f"{self._section}: {e}")
+            return []
+        (self.events if isinstance(item, TemporalEvent) else self.relations).append(item)
+        return [item]
+
+
+def parse_stream(chunks: Iterable[str]) -> Iterator[StreamItem]:
+    """Events and relations of a streamed document, as each completes"""
+    parser = StreamingResponseParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.complete:
+            return
+
+
+def parse_response(text: str, level: ExtractionLevel = ExtractionLevel.LEVEL_1_EXTRACTION) -> LLMResponse:
+    """Parse a complete (non-streamed) model output"""
+    parser = StreamingResponseParser()
+    parser.feed(text)
+    return parser.finish(level)
+
+
+if __name__ == "__main__":
+    from llm_interface import MockLLM
+
+    print("=" * 80)
+    print("Streaming Structured-Output Parser - Example")
+    print("=" * 80)
+
+    text = "The patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday."
+    llm = MockLLM(seed=1)
+    parser = StreamingResponseParser()
+    tokens = 0
+    for token in llm.stream_extract(text, ExtractionLevel.LEVEL_2_ORDERING):
+        tokens += 1
+        for item in parser.feed(token):
+            label = item.name if isinstance(item, TemporalEvent) else f"{item.event1} {item.relation} {item.event2}"
+            print(f"  token {tokens:3d}: {type(item).__name__} {label}")
+
+    response = parser.finish(ExtractionLevel.LEVEL_2_ORDERING)
+    print(f"\n{tokens} tokens, answer: {response.raw_answer}")
+
+    fenced = 'Here you go:\n```json\n{"events": [{"name": "a"}, {"nope": 1}], "relations": []}\n```'
+    parser = StreamingResponseParser()
+    parser.feed(fenced)
+    response = parser.finish()
+    print(f"Fenced output: events={[e.name for e in response.events]}, skipped: {parser.errors}")
+
+    print("\n" + "=" * 80)
@@ -10,9 +10,10 @@ References:
 """
 
 from enum import Enum
-from typing import Set, Dict, Tuple, List, Optional
+from typing import Set, Dict, Tuple, List, Optional, Iterable, FrozenSet
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 
 
@@ -66,66 +67,6 @@ class AllenAlgebra:
     - Constraint satisfaction checking
     """
 
-    # Composition table: composition_table[R1][R2] = set of possible relations
-    COMPOSITION_TABLE = {
-        AllenRelation.BEFORE: {
-            AllenRelation.BEFORE: {AllenRelation.BEFORE},
-            AllenRelation.AFTER: {AllenRelation.BEFORE, AllenRelation.AFTER, AllenRelation.OVERLAPS,
-                                 AllenRelation.OVERLAPPED_BY, AllenRelation.MEETS, AllenRelation.MET_BY,
-                                 AllenRelation.DURING, AllenRelation.CONTAINS, AllenRelation.STARTS,
-                                 AllenRelation.STARTED_BY, AllenRelation.FINISHES, AllenRelation.FINISHED_BY,
-                                 AllenRelation.EQUALS},
-            AllenRelation.MEETS: {AllenRelation.BEFORE},
-            AllenRelation.OVERLAPS: {AllenRelation.BEFORE},
-            AllenRelation.DURING: {AllenRelation.BEFORE},
-            AllenRelation.STARTS: {AllenRelation.BEFORE},
-            AllenRelation.FINISHES: {AllenRelation.BEFORE},
-        },
-        AllenRelation.AFTER: {
-            AllenRelation.BEFORE: {AllenRelation.BEFORE, AllenRelation.AFTER, AllenRelation.OVERLAPS,
-                                  AllenRelation.OVERLAPPED_BY, AllenRelation.MEETS, AllenRelation.MET_BY,
-                                  AllenRelation.DURING, AllenRelation.CONTAINS, AllenRelation.STARTS,
-                                  AllenRelation.STARTED_BY, AllenRelation.FINISHES, AllenRelation.FINISHED_BY,
-                                  AllenRelation.EQUALS},
-            AllenRelation.AFTER: {AllenRelation.AFTER},
-            AllenRelation.MET_BY: {AllenRelation.AFTER},
-            AllenRelation.OVERLAPPED_BY: {AllenRelation.AFTER},
-            AllenRelation.CONTAINS: {AllenRelation.AFTER},
-            AllenRelation.FINISHED_BY: {AllenRelation.AFTER},
-            AllenRelation.STARTED_BY: {AllenRelation.AFTER},
-        },
-        AllenRelation.MEETS: {
-            AllenRelation.BEFORE: {AllenRelation.BEFORE},
-            AllenRelation.MEETS: {AllenRelation.BEFORE},
-            AllenRelation.OVERLAPS: {AllenRelation.BEFORE},
-            AllenRelation.DURING: {AllenRelation.BEFORE},
-            AllenRelation.STARTS: {AllenRelation.BEFORE},
-            AllenRelation.MET_BY: {AllenRelation.EQUALS},
-            AllenRelation.AFTER: {AllenRelation.AFTER},
-            AllenRelation.OVERLAPPED_BY: {AllenRelation.AFTER},
-            AllenRelation.CONTAINS: {AllenRelation.OVERLAPPED_BY, AllenRelation.AFTER, AllenRelation.CONTAINS,
-                                    AllenRelation.FINISHED_BY, AllenRelation.STARTED_BY},
-            AllenRelation.STARTED_BY: {AllenRelation.STARTED_BY},
-            AllenRelation.FINISHED_BY: {AllenRelation.AFTER},
-            AllenRelation.FINISHES: {AllenRelation.BEFORE},
-        },
-        AllenRelation.EQUALS: {
-            AllenRelation.BEFORE: {AllenRelation.BEFORE},
-            AllenRelation.AFTER: {AllenRelation.AFTER},
-            AllenRelation.MEETS: {AllenRelation.MEETS},
-            AllenRelation.MET_BY: {AllenRelation.MET_BY},
-            AllenRelation.OVERLAPS: {AllenRelation.OVERLAPS},
-            AllenRelation.OVERLAPPED_BY: {AllenRelation.OVERLAPPED_BY},
-            AllenRelation.DURING: {AllenRelation.DURING},
-            AllenRelation.CONTAINS: {AllenRelation.CONTAINS},
-            AllenRelation.STARTS: {AllenRelation.STARTS},
-            AllenRelation.STARTED_BY: {AllenRelation.STARTED_BY},
-            AllenRelation.FINISHES: {AllenRelation.FINISHES},
-            AllenRelation.FINISHED_BY: {AllenRelation.FINISHED_BY},
-            AllenRelation.EQUALS: {AllenRelation.EQUALS},
-        }
-    }
-
     # Inverse relations
     INVERSE = {
         AllenRelation.BEFORE: AllenRelation.AFTER,
@@ -192,12 +133,8 @@ class AllenAlgebra:
         Compose two relations: if X rel1 Y and Y rel2 Z, what are possible relations X ? Z
         Returns a set of possible relations.
         """
-        # Use simplified composition - in full implementation would use complete table
-        if rel1 in AllenAlgebra.COMPOSITION_TABLE and rel2 in AllenAlgebra.COMPOSITION_TABLE[rel1]:
-            return AllenAlgebra.COMPOSITION_TABLE[rel1][rel2]
-
-        # Default: return all relations (conservative)
-        return set(AllenRelation)
+        # The complete table (see composition_masks), shared with IncrementalConstraintSolver
+        return _composition_sets()[rel1][rel2]
 
     @staticmethod
     def inverse(rel: AllenRelation) -> AllenRelation:
@@ -271,6 +208,18 @@ class AllenAlgebra:
         return True
 
 
+def propagate_network(constraints: Dict[Tuple[str, str], Set[AllenRelation]]
+                      ) -> Tuple[bool, Dict[Tuple[str, str], Set[AllenRelation]]]:
+    """
+    Path consistency over a constraint dict, as TemporalConstraintSolver
+    runs it; a module-level function so it can run in a worker process.
+
+    Returns:
+        (consistent, the constraints as refined by propagation)
+    """
+    return AllenAlgebra.is_consistent(constraints), constraints
+
+
 class TemporalConstraintSolver:
     """
     Solves temporal constraint satisfaction problems using Allen's Interval Algebra
@@ -388,6 +337,235 @@ class TemporalConstraintSolver:
         }
 
 
+# Relation names as written in LLM output -> relation
+RELATION_NAMES: Dict[str, AllenRelation] = {
+    "before": AllenRelation.BEFORE,
+    "after": AllenRelation.AFTER,
+    "meets": AllenRelation.MEETS,
+    "met-by": AllenRelation.MET_BY,
+    "met_by": AllenRelation.MET_BY,
+    "overlaps": AllenRelation.OVERLAPS,
+    "overlapped-by": AllenRelation.OVERLAPPED_BY,
+    "overlapped_by": AllenRelation.OVERLAPPED_BY,
+    "during": AllenRelation.DURING,
+    "contains": AllenRelation.CONTAINS,
+    "starts": AllenRelation.STARTS,
+    "started-by": AllenRelation.STARTED_BY,
+    "started_by": AllenRelation.STARTED_BY,
+    "finishes": AllenRelation.FINISHES,
+    "finished-by": AllenRelation.FINISHED_BY,
+    "finished_by": AllenRelation.FINISHED_BY,
+    "equals": AllenRelation.EQUALS,
+}
+
+
+def relation_from_name(name: str) -> Optional[AllenRelation]:
+    """Allen relation for a relation name from LLM output, or None"""
+    return RELATION_NAMES.get(name.lower().strip())
+
+
+# Bitmask encoding of relation sets: bit i = i-th AllenRelation
+RELATION_BITS: Dict[AllenRelation, int] = {rel: 1 << i for i, rel in enumerate(AllenRelation)}
+ALL_RELATIONS_MASK = (1 << len(AllenRelation)) - 1
+
+
+def relations_to_mask(relations: Iterable[AllenRelation]) -> int:
+    mask = 0
+    for rel in relations:
+        mask |= RELATION_BITS[rel]
+    return mask
+
+
+def mask_to_relations(mask: int) -> Set[AllenRelation]:
+    return {rel for rel, bit in RELATION_BITS.items() if mask & bit}
+
+
+@lru_cache(maxsize=None)
+def composition_masks() -> Tuple[Tuple[int, ...], ...]:
+    """
+    Complete composition table as bitmasks: composition_masks()[i][j] is the
+    mask of relations X ? Z given X (relation i) Y and Y (relation j) Z.
+
+    Derived once by enumerating every ordering of three intervals' endpoints
+    (six points suffice), so it covers all 169 pairs. AllenAlgebra.compose
+    and IncrementalConstraintSolver both read it.
+    """
+    relations = list(AllenRelation)
+    index = {rel: i for i, rel in enumerate(relations)}
+    intervals = [TimeInterval(f"{start}-{end}", start=start, end=end)
+                 for start in range(6) for end in range(start + 1, 6)]
+    pair = {(x.name, y.name): index[AllenAlgebra.determine_relation(x, y)]
+            for x in intervals for y in intervals}
+    table = [[0] * len(relations) for _ in relations]
+    for x in intervals:
+        for y in intervals:
+            row = table[pair[(x.name, y.name)]]
+            for z in intervals:
+                row[pair[(y.name, z.name)]] |= 1 << pair[(x.name, z.name)]
+    return tuple(tuple(row) for row in table)
+
+
+@lru_cache(maxsize=None)
+def _composition_sets() -> Dict[AllenRelation, Dict[AllenRelation, FrozenSet[AllenRelation]]]:
+    """composition_masks() as relation sets, for AllenAlgebra.compose"""
+    relations = list(AllenRelation)
+    table = composition_masks()
+    return {rel1: {rel2: frozenset(mask_to_relations(table[i][j])) for j, rel2 in enumerate(relations)}
+            for i, rel1 in enumerate(relations)}
+
+
+@lru_cache(maxsize=None)
+def inverse_masks() -> Tuple[int, ...]:
+    """inverse_masks()[mask] is the mask of the inverse relations"""
+    inverse_bit = [RELATION_BITS[AllenAlgebra.inverse(rel)] for rel in AllenRelation]
+    table = []
+    for mask in range(ALL_RELATIONS_MASK + 1):
+        inverse = 0
+        for i, bit in enumerate(inverse_bit):
+            if mask >> i & 1:
+                inverse |= bit
+        table.append(inverse)
+    return tuple(table)
+
+
+def compose_masks(mask1: int, mask2: int) -> int:
+    """Composition of two relation sets, as bitmasks"""
+    if mask1 == ALL_RELATIONS_MASK or mask2 == ALL_RELATIONS_MASK:
+        return ALL_RELATIONS_MASK
+    return _compose_masks(mask1, mask2)
+
+
+@lru_cache(maxsize=1 << 16)
+def _compose_masks(mask1: int, mask2: int) -> int:
+    table = composition_masks()
+    result = 0
+    i = 0
+    while mask1:
+        if mask1 & 1:
+            row = table[i]
+            m2, j = mask2, 0
+            while m2:
+                if m2 & 1:
+                    result |= row[j]
+                m2 >>= 1
+                j += 1
+            if result == ALL_RELATIONS_MASK:
+                break
+        mask1 >>= 1
+        i += 1
+    return result
+
+
+class IncrementalConstraintSolver(TemporalConstraintSolver):
+    """
+    TemporalConstraintSolver that keeps its network path-consistent while
+    constraints arrive, so an inconsistency is known the moment the
+    offending constraint is added.
+
+    Every constraint is intersected into a bitmask network over all pairs
+    (missing edges are unconstrained) and propagated from that edge only: a
+    queue of changed edges (i, j) revises (i, k) through (i, j) o (j, k) and
+    (k, j) through (k, i) o (i, j) for constrained neighbours k. The
+    complete composition table (composition_masks) is used, so propagation
+    is sound: an empty edge proves the constraints contradict each other.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._network: Dict[str, Dict[str, int]] = {}  # _network[i][j] = mask of i -> j
+        self.consistent = True
+        self.conflict: Optional[Tuple[str, str, Set[AllenRelation]]] = None
+        self.rejected: List[Tuple[str, str, Set[AllenRelation]]] = []
+        self.revisions = 0
+
+    def add_constraint(self, interval1: str, interval2: str, relations: Set[AllenRelation]):
+        """Add a constraint and propagate it (the network stays inconsistent if it conflicts)"""
+        self.add_relation_checked(interval1, interval2, relations, rollback=False)
+
+    def add_relation_checked(self, interval1: str, interval2: str, relations: Set[AllenRelation],
+                             rollback: bool = True) -> bool:
+        """
+        Add a constraint and propagate it through the network.
+
+        Args:
+            interval1: First interval name
+            interval2: Second interval name
+            relations: Allowed relations interval1 -> interval2
+            rollback: On inconsistency, undo the addition (and record it in
+                `rejected`) instead of leaving the network inconsistent
+
+        Returns:
+            Whether the network is still consistent with the constraint
+        """
+        if not self.consistent:
+            if rollback:
+                self.rejected.append((interval1, interval2, set(relations)))
+            return False
+
+        undo: List[Tuple[str, str, Optional[int]]] = []
+        if self._revise(interval1, interval2, relations_to_mask(relations), undo) and \
+                self._propagate([(interval1, interval2)], undo):
+            super().add_constraint(interval1, interval2, set(relations))
+            return True
+
+        if rollback:
+            for i, j, old in reversed(undo):
+                if old is None:
+                    del self._network[i][j]
+                else:
+                    self._network[i][j] = old
+            self.rejected.append((interval1, interval2, set(relations)))
+        else:
+            super().add_constraint(interval1, interval2, set(relations))
+            self.consistent = False
+            self.conflict = (interval1, interval2, set(relations))
+        return False
+
+    def propagate_constraints(self) -> bool:
+        """Consistency of the network (propagation already ran on every addition)"""
+        return self.consistent
+
+    def relation_mask(self, interval1: str, interval2: str) -> int:
+        """Current mask of interval1 -> interval2 (all bits if unconstrained)"""
+        return self._network.get(interval1, {}).get(interval2, ALL_RELATIONS_MASK)
+
+    def _revise(self, i: str, j: str, mask: int, undo: List[Tuple[str, str, Optional[int]]]) -> bool:
+        """Intersect edge (i, j) with `mask`; False if it becomes empty"""
+        if i == j:
+            return bool(mask & RELATION_BITS[AllenRelation.EQUALS])
+        old = self.relation_mask(i, j)
+        new = old & mask
+        if new != old:
+            inverse = inverse_masks()
+            for a, b, value in ((i, j, new), (j, i, inverse[new])):
+                row = self._network.setdefault(a, {})
+                undo.append((a, b, row.get(b)))
+                row[b] = value
+            self.revisions += 1
+        return new != 0
+
+    def _propagate(self, queue: List[Tuple[str, str]], undo: List[Tuple[str, str, Optional[int]]]) -> bool:
+        inverse = inverse_masks()
+        queued = set(queue)
+        while queue:
+            i, j = queue.pop()
+            queued.discard((i, j))
+            ij = self.relation_mask(i, j)
+            # (i, k) through (i, j) o (j, k), and (k, j) through (k, i) o (i, j)
+            revisions = [(i, k, compose_masks(ij, jk)) for k, jk in self._network.get(j, {}).items() if k != i]
+            revisions += [(k, j, compose_masks(inverse[ik], ij)) for k, ik in self._network.get(i, {}).items() if k != j]
+            for a, b, mask in revisions:
+                old = self.relation_mask(a, b)
+                if old & mask == old:
+                    continue
+                if not self._revise(a, b, mask, undo):
+                    return False
+                if (a, b) not in queued:
+                    queue.append((a, b))
+                    queued.add((a, b))
+        return True
+
+
 def parse_relative_time(time_str: str, reference: float = 0) -> float:
     """
     Parse relative time expressions like '2 hours', '30 minutes', '1 day'
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Prototype modules import each other by flat module name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,81 @@
+import asyncio
+import contextvars
+import threading
+
+from provenance import ProvenanceTracker, ReasoningStep
+
+STEPS = 20
+
+
+def record_steps(tracker, task_id, checks):
+    for i in range(STEPS):
+        tracker.record_step(ReasoningStep.SYMBOLIC_CONSTRAINT, f"{task_id} {i}", {}, {})
+        checks.append(tracker.current_chain.task_id == task_id)
+
+
+def test_threads_each_record_into_their_own_chain():
+    tracker = ProvenanceTracker()
+    checks = []
+    barrier = threading.Barrier(8)
+
+    def worker(n):
+        task_id = f"thread_{n}"
+        barrier.wait()
+        with tracker.task(task_id, "q"):
+            record_steps(tracker, task_id, checks)
+            tracker.end_task(task_id, "answer")
+        checks.append(tracker.current_chain is None)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(checks) == 8 * (STEPS + 1) and all(checks)
+    for n in range(8):
+        chain = tracker.chains[f"thread_{n}"]
+        assert [node.description for node in chain.nodes] == [f"thread_{n} {i}" for i in range(STEPS)]
+
+
+def test_interleaved_asyncio_tasks_keep_their_own_chain():
+    tracker = ProvenanceTracker()
+    checks = []
+
+    async def run(n):
+        task_id = f"async_{n}"
+        with tracker.task(task_id, "q"):
+            for i in range(STEPS):
+                tracker.record_step(ReasoningStep.SYMBOLIC_CONSTRAINT, f"{task_id} {i}", {}, {})
+                await asyncio.sleep(0)
+                checks.append(tracker.current_chain.task_id == task_id)
+            tracker.end_task(task_id, "answer")
+
+    async def main():
+        with tracker.task("outer", "q"):
+            await asyncio.gather(*(run(n) for n in range(8)))
+            checks.append(tracker.current_chain.task_id == "outer")
+
+    asyncio.run(main())
+    assert len(checks) == 8 * STEPS + 1 and all(checks)
+    for n in range(8):
+        assert len(tracker.chains[f"async_{n}"].nodes) == STEPS
+
+
+def test_trackers_sharing_a_context_have_separate_active_chains():
+    first, second = ProvenanceTracker(), ProvenanceTracker()
+    with first.task("a", "q"), second.task("b", "q"):
+        assert first.current_chain.task_id == "a"
+        assert second.current_chain.task_id == "b"
+    assert first.current_chain is None and second.current_chain is None
+
+
+def test_new_tracker_never_sees_a_collected_trackers_chain():
+    def run():
+        tracker = ProvenanceTracker()
+        tracker.start_task("old", "q")  # left active in this context
+        del tracker
+        # CPython typically hands the freed tracker's memory, and so its id(), to the next one
+        return ProvenanceTracker().current_chain
+
+    assert contextvars.copy_context().run(run) is None
@@ -0,0 +1,108 @@
+from chunked_extraction import ChunkedExtractor, chunk_document, iter_sentences
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import ExtractionLevel, LLMResponse, MockLLM, TemporalEvent, TemporalRelation
+
+LEVEL = ExtractionLevel.LEVEL_2_ORDERING
+
+
+def test_sentences_and_sections_from_pieces():
+    pieces = ["First one. Sec", "ond one.\n", "\n", "Third one! Fourth"]
+    assert list(iter_sentences(iter(pieces))) == [
+        (0, "First one."), (0, "Second one."), (1, "Third one!"), (1, "Fourth")
+    ]
+
+
+def test_chunks_respect_size_overlap_and_sections():
+    text = " ".join(f"Sentence {i} is here." for i in range(10)) + "\n\nNew section starts."
+    chunks = list(chunk_document(text, max_chars=60, overlap_sentences=1))
+
+    assert all(len(chunk.text) <= 60 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        if chunk.section == previous.section:
+            assert chunk.text.startswith(previous.text.split(". ")[-1].rstrip("."))
+    assert chunks[-1].text == "New section starts." and chunks[-1].section == 1
+
+
+class ScriptedLLM:
+    """Backend answering from a table keyed by chunk text fragments"""
+
+    def __init__(self, script):
+        self.script = script
+
+    def extract_temporal_info(self, text, level=LEVEL):
+        events, relations = [], []
+        for fragment, (chunk_events, chunk_relations) in self.script.items():
+            if fragment in text:
+                events += [TemporalEvent(name, "") for name in chunk_events]
+                relations += [TemporalRelation(*r) for r in chunk_relations]
+        return LLMResponse(events, relations, "answer", level, {"domain": "test", "confidence": 0.9})
+
+
+def test_events_stitched_and_relations_merged_across_chunks():
+    script = {
+        "Admission happened.": (["Admission"], []),
+        "Surgery followed.": (["surgery", "the admission"], [("admission", "surgery", "before")]),
+        "Discharge came last.": (["discharge"], [("Surgery", "discharge", "before"),
+                                                ("discharge", "admission", "before")]),
+    }
+    text = "Admission happened. Surgery followed. Discharge came last."
+    with ChunkedExtractor(ScriptedLLM(script), max_chars=40, overlap_sentences=1) as extractor:
+        response = extractor.extract_document(text, LEVEL)
+
+    assert response.metadata["chunks"] == 2
+    assert [e.name for e in response.events] == ["Admission", "surgery", "discharge"]
+    assert [(r.event1, r.event2) for r in response.relations] == [
+        ("Admission", "surgery"), ("surgery", "discharge")
+    ]
+    assert response.metadata["dropped_relations"] == ["discharge before Admission"]
+
+
+def test_document_is_read_lazily():
+    yielded = []
+
+    def lines():
+        for i in range(500):
+            yielded.append(i)
+            yield f"Line number {i} is a sentence.\n"
+
+    seen = []
+
+    class RecordingLLM(ScriptedLLM):
+        def extract_temporal_info(self, text, level=LEVEL):
+            seen.append(len(yielded))
+            return super().extract_temporal_info(text, level)
+
+    with ChunkedExtractor(RecordingLLM({}), max_chars=100, overlap_sentences=0,
+                          max_workers=1, max_pending=2) as extractor:
+        response = extractor.extract_document(lines(), LEVEL)
+
+    chunks = response.metadata["chunks"]
+    assert chunks == len(seen) > 100
+    # Each chunk holds 3 lines; reading never runs more than max_pending chunks ahead
+    assert all(read <= (call + 4) * 3 for call, read in enumerate(seen))
+
+
+def test_reasoner_over_chunked_backend():
+    phases = [f"phase{i}" for i in range(12)]
+    document = "".join(f"The project task {name} must be complete by its deadline. " for name in phases)
+    document += "\n\n" + " ".join(f"Each task is complete in order: {a} before {b}."
+                                  for a, b in zip(phases, phases[1:]))
+    with ChunkedExtractor(MockLLM(seed=1), max_chars=200) as extractor:
+        reasoner = HybridTemporalReasoner(llm_backend=extractor)
+        result = reasoner.reason(document + " What is the order?", LEVEL)
+        assert result.symbolic_answer.startswith("The temporal sequence involves: phase0, phase1")
+        assert extractor.stats()["chunks"] > 1
+
+
+def test_backend_version_covers_chunking_and_the_chunk_backend():
+    llm = MockLLM(seed=1)
+    with ChunkedExtractor(llm, max_chars=200) as small, ChunkedExtractor(llm, max_chars=400) as large:
+        assert small.backend_version != large.backend_version
+        assert llm.backend_version in small.backend_version
+
+    class Unversioned:
+        def extract_temporal_info(self, text, level=LEVEL):
+            return llm.extract_temporal_info(text, level)
+
+    with ChunkedExtractor(Unversioned()) as extractor:
+        assert extractor.backend_version is None
@@ -0,0 +1,82 @@
+import random
+import statistics
+
+import pytest
+
+from provenance import (
+    DEFAULT_STEP_WEIGHT, STEP_WEIGHTS, ProvenanceTracker, QuantileSketch, ReasoningStep,
+    RunningStats
+)
+
+
+def test_running_stats_match_the_statistics_module():
+    rng = random.Random(0)
+    values = [rng.gauss(0.7, 0.1) for _ in range(5000)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), abs=1e-12)
+    assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert stats.stddev == pytest.approx(statistics.stdev(values), rel=1e-9)
+    assert (stats.min, stats.max) == (min(values), max(values))
+
+
+def test_running_stats_of_one_value_has_no_variance():
+    stats = RunningStats()
+    stats.add(0.5)
+    assert (stats.mean, stats.variance, stats.min, stats.max) == (0.5, 0.0, 0.5, 0.5)
+
+
+def test_quantile_sketch_is_within_half_a_bin_of_the_exact_quantile():
+    rng = random.Random(1)
+    values = sorted(rng.betavariate(5, 2) for _ in range(20000))
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert abs(sketch.quantile(q) - exact) <= 0.5 / sketch.bins + 1e-3
+
+
+def test_quantile_sketch_clamps_out_of_range_values():
+    sketch = QuantileSketch(bins=10)
+    for value in (-0.5, 1.0, 1.5):
+        sketch.add(value)
+    assert sketch.counts[0] == 1 and sketch.counts[-1] == 2
+    assert QuantileSketch().quantile(0.5) == 0.0
+
+
+def test_incremental_chain_confidence_equals_a_full_recompute():
+    tracker = ProvenanceTracker()
+    steps = [(ReasoningStep.LLM_EXTRACTION, 0.8), (ReasoningStep.SYMBOLIC_CONSTRAINT, 1.0),
+             (ReasoningStep.SYMBOLIC_SOLVING, 0.9), (ReasoningStep.VERIFICATION, 0.6),
+             (ReasoningStep.FINAL_ANSWER, 0.95)]
+    with tracker.task("t", "q"):
+        for step_type, confidence in steps:
+            tracker.record_step(step_type, "step", {}, {}, confidence=confidence)
+        tracker.end_task("t", "answer")
+
+    weights = [STEP_WEIGHTS.get(step_type, DEFAULT_STEP_WEIGHT) for step_type, _ in steps]
+    expected = sum(w * c for w, (_, c) in zip(weights, steps)) / sum(weights)
+    assert tracker.get_confidence_score("t") == pytest.approx(expected)
+
+
+def test_confidence_is_aggregated_by_step_type_and_domain():
+    tracker = ProvenanceTracker()
+    for i, domain in enumerate(["medical", "medical", "business"]):
+        task_id = f"task_{i}"
+        with tracker.task(task_id, "q"):
+            tracker.record_step(ReasoningStep.LLM_EXTRACTION, "extract", {}, {},
+                                confidence=0.5 + 0.1 * i, metadata={"domain": domain})
+            tracker.end_task(task_id, "answer")
+
+    extraction = tracker.confidence_stats.by_step_type()["llm_extraction"]
+    assert extraction["count"] == 3
+    assert extraction["mean"] == pytest.approx(0.6)
+    assert (extraction["min"], extraction["max"]) == (0.5, pytest.approx(0.7))
+    by_domain = tracker.confidence_stats.by_domain()
+    assert by_domain["medical"]["count"] == 2 and by_domain["business"]["count"] == 1
+    assert sum(window["count"] for window in tracker.confidence_stats.by_window().values()) == 3
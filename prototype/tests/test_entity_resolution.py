@@ -0,0 +1,71 @@
+import random
+
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import ExtractionLevel, LLMResponse, MockLLM, TemporalEvent, TemporalRelation
+from provenance import ReasoningStep
+from entity_resolution import EntityResolver, normalize_name, resolve_response
+
+
+def test_normalize_name():
+    assert normalize_name("The Surgery") == "surgery"
+    assert normalize_name("event_1") == "event 1"
+    assert normalize_name("A") == "a"
+
+
+def test_exact_alias_and_fuzzy_resolution():
+    resolver = EntityResolver()
+    resolver.add_event(TemporalEvent("Surgery", "patient underwent surgery"))
+    resolver.add_event(TemporalEvent("admission", ""))
+    resolver.add_event(TemporalEvent("event_1", ""))
+
+    assert resolver.resolve("the surgery") == "Surgery"
+    assert resolver.resolve("Patient underwent surgery") == "Surgery"
+    assert resolver.resolve("admision") == "admission"
+    assert resolver.resolve("event 2") is None  # numbers must agree
+    assert resolver.resolve("completed") is None
+    assert (resolver.stats.exact, resolver.stats.fuzzy, resolver.stats.unresolved) == (2, 1, 2)
+
+
+def test_duplicate_events_merge_and_unresolved_relations_drop():
+    response = LLMResponse(
+        events=[TemporalEvent("surgery", "", start_time="Tuesday"),
+                TemporalEvent("The Surgery", "", duration="3 hours"),
+                TemporalEvent("discharge", "")],
+        relations=[TemporalRelation("Surgery", "discharge", "before"),
+                   TemporalRelation("completed", "task", "before"),
+                   TemporalRelation("surgery", "the surgery", "equals")],
+        raw_answer="", extraction_level=ExtractionLevel.LEVEL_2_ORDERING
+    )
+    resolved = resolve_response(response)
+
+    assert [(e.name, e.start_time, e.duration) for e in resolved.events] == [
+        ("surgery", "Tuesday", "3 hours"), ("discharge", None, None)
+    ]
+    assert [(r.event1, r.event2) for r in resolved.relations] == [("surgery", "discharge")]
+    assert resolved.metadata["resolution"]["dropped_relations"] == 2
+
+
+def test_lsh_blocking_compares_few_candidates():
+    rng = random.Random(0)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    names = sorted({"".join(rng.choice(alphabet) for _ in range(20)) for _ in range(3000)})
+    resolver = EntityResolver()
+    for name in names:
+        resolver.add_event(TemporalEvent(name, ""))
+
+    mentions = [name[:4] + name[5:] for name in names[:200]]
+    hits = sum(resolver.resolve(mention) == name for mention, name in zip(mentions, names))
+    assert hits >= 185
+    assert resolver.stats.candidates_compared < 200 * 20
+
+
+def test_reasoner_drops_edges_between_unknown_events():
+    reasoner = HybridTemporalReasoner(llm_backend=MockLLM(seed=1))
+    question = "Task A must be completed before task B. Meeting D happens after all tasks. What is the order?"
+    result = reasoner.reason(question, ExtractionLevel.LEVEL_2_ORDERING)
+
+    reasoner.provenance.flush()
+    conversion, = reasoner.provenance.chains[result.provenance_id].get_nodes_by_type(ReasoningStep.SYMBOLIC_CONSTRAINT)
+    constraint = conversion.output_data["constraint"]
+    assert constraint["num_constraints"] == 0
+    assert constraint["resolution"]["dropped_relations"] == 1
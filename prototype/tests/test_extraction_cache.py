@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+from extraction_cache import (
+    CachedLLMBackend, ExtractionCache, decode_response, encode_response, extraction_key
+)
+from llm_interface import ExtractionLevel, MockLLM
+
+TEXT = "The patient was admitted, received medication treatment and was discharged. What is the order?"
+LEVEL = ExtractionLevel.LEVEL_2_ORDERING
+
+
+class CountingLLM(MockLLM):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def extract_temporal_info(self, text, level=ExtractionLevel.LEVEL_1_EXTRACTION):
+        self.calls += 1
+        return super().extract_temporal_info(text, level)
+
+
+def test_backends_sharing_a_file_do_not_see_each_others_answers(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    high = CachedLLMBackend(CountingLLM("high", seed=1), ExtractionCache(path))
+    low_cache = ExtractionCache(path)
+    low = CachedLLMBackend(CountingLLM("low", seed=2), low_cache)
+
+    high.extract_temporal_info(TEXT, LEVEL)
+    low.extract_temporal_info(TEXT, LEVEL)
+    assert low.backend.calls == 1
+    assert low_cache.stats()["disk_hits"] == 0
+    assert low_cache.stats()["disk_entries"] == 2
+
+    # The same backend in a fresh process is served from disk
+    again = CachedLLMBackend(CountingLLM("high", seed=1), ExtractionCache(path))
+    again.extract_temporal_info(TEXT, LEVEL)
+    assert again.backend.calls == 0
+    assert again.cache.stats()["disk_hits"] == 1
+    for backend in (high, low, again):
+        backend.cache.close()
+
+
+def test_cache_version_is_the_fallback_for_anonymous_backends():
+    class AnonymousLLM:
+        def extract_temporal_info(self, text, level=None):
+            return MockLLM(seed=0).extract_temporal_info(text, level)
+
+    cache = ExtractionCache(backend_version="anon-v1")
+    backend = CachedLLMBackend(AnonymousLLM(), cache)
+    assert backend.backend_version == "anon-v1"
+    backend.extract_temporal_info(TEXT, LEVEL)
+    assert cache.get(TEXT, LEVEL) is not None
+    assert cache.get(TEXT, LEVEL, MockLLM(seed=0).backend_version) is None
+
+
+def test_responses_round_trip_through_zlib_json():
+    response = MockLLM(seed=0).extract_temporal_info(TEXT, LEVEL)
+    blob = encode_response(response)
+    assert decode_response(blob).to_dict() == response.to_dict()
+    assert len(blob) < len(str(response.to_dict()))
+
+
+def test_keys_normalize_whitespace_but_not_case_level_or_version():
+    key = extraction_key(TEXT, LEVEL, "v1")
+    assert extraction_key("  " + TEXT.replace(" ", "\n "), LEVEL, "v1") == key
+    assert extraction_key(TEXT.upper(), LEVEL, "v1") != key
+    assert extraction_key(TEXT, ExtractionLevel.LEVEL_1_EXTRACTION, "v1") != key
+    assert extraction_key(TEXT, LEVEL, "v2") != key
+
+
+def test_disk_hits_are_promoted_to_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    response = MockLLM(seed=0).extract_temporal_info(TEXT, LEVEL)
+    writer = ExtractionCache(path)
+    writer.put(TEXT, LEVEL, response)
+    writer.close()
+
+    reader = ExtractionCache(path)
+    assert reader.get(TEXT, LEVEL).to_dict() == response.to_dict()
+    assert reader.get(TEXT, LEVEL) is reader.get(TEXT, LEVEL)
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 2, 0)
+    reader.close()
+
+
+def test_expired_entries_are_missed_and_purged(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ExtractionCache(path, ttl_seconds=60)
+    cache.put(TEXT, LEVEL, MockLLM(seed=0).extract_temporal_info(TEXT, LEVEL))
+    cache.put("fresh", LEVEL, MockLLM(seed=0).extract_temporal_info("fresh", LEVEL))
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE extractions SET created_at = ? WHERE key = ?",
+                   (time.time() - 120, cache.key(TEXT, LEVEL)))
+    cache.memory.clear()
+
+    assert cache.get(TEXT, LEVEL) is None
+    assert cache.purge_expired() == 1
+    assert cache.stats()["disk_entries"] == 1
+    cache.close()
+
+
+def test_invalidate_versions_keeps_only_the_given_versions(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ExtractionCache(path, backend_version="v2")
+    response = MockLLM(seed=0).extract_temporal_info(TEXT, LEVEL)
+    for version in ("v1", "v2", "v3"):
+        cache.put(TEXT, LEVEL, response, version)
+
+    assert cache.invalidate_versions(keep=["v2", "v3"]) == 1
+    assert cache.invalidate_versions() == 1
+    assert cache.stats()["disk_entries"] == 1
+    cache.memory.clear()
+    assert cache.get(TEXT, LEVEL) is not None
+    cache.close()
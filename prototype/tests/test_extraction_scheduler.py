@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from extraction_scheduler import BatchingExtractionScheduler
+from llm_interface import ExtractionLevel, LatencyModel, MockLLM
+
+TEXT = "Task A must be completed before task B."
+OTHER = "The meeting lasted 2 hours, followed by a 30 minute break."
+
+
+def test_cancelling_one_aextract_leaves_coalesced_callers_alone():
+    llm = MockLLM(seed=0, latency=LatencyModel(base_seconds=0.2))
+    with BatchingExtractionScheduler(llm, max_wait_ms=1) as scheduler:
+        async def run():
+            first = asyncio.ensure_future(scheduler.aextract(TEXT))
+            second = asyncio.ensure_future(scheduler.aextract(TEXT))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            return await second
+
+        response = asyncio.run(run())
+        assert response.events
+        assert scheduler.stats()["coalesced"] == 1
+
+
+def test_cancelled_futures_do_not_stop_the_rest_of_the_batch():
+    with BatchingExtractionScheduler(MockLLM(seed=0), max_wait_ms=200) as scheduler:
+        cancelled = scheduler.submit(TEXT, ExtractionLevel.LEVEL_2_ORDERING)
+        duplicate = scheduler.submit(TEXT, ExtractionLevel.LEVEL_2_ORDERING)
+        other = scheduler.submit(OTHER, ExtractionLevel.LEVEL_2_ORDERING)
+        assert cancelled is not duplicate
+        assert cancelled.cancel()
+
+        assert duplicate.result(timeout=5).events
+        assert other.result(timeout=5).raw_answer
+        assert cancelled.cancelled()
+        assert scheduler.stats()["batches"] == 1
+
+
+def test_backlog_waits_in_the_queue_while_batches_run():
+    llm = MockLLM(seed=0, latency=LatencyModel(base_seconds=0.3))
+    with BatchingExtractionScheduler(llm, max_batch_size=1, max_wait_ms=0,
+                                     max_concurrent_batches=1) as scheduler:
+        futures = [scheduler.submit(f"{TEXT} (case {i})") for i in range(4)]
+        time.sleep(0.1)
+        stats = scheduler.stats()
+        assert stats["batches"] == 1
+        assert stats["queue_depth"] == 3
+        assert all(future.result(timeout=5).events for future in futures)
+    assert scheduler.stats()["batches"] == 4
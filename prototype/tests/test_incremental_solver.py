@@ -0,0 +1,138 @@
+import copy
+import json
+import random
+
+from hybrid_reasoner import HybridTemporalReasoner, InconsistencyPolicy
+from llm_interface import ExtractionLevel, MockLLM
+from provenance import ReasoningStep
+from temporal_core import (
+    AllenAlgebra, AllenRelation, IncrementalConstraintSolver, TimeInterval,
+    composition_masks, mask_to_relations
+)
+
+CYCLE_QUESTION = ("The project tasks: design before coding and coding before testing "
+                  "and testing before design by the deadline. What is the order?")
+# The same cycle between tasks that are also extracted as events
+RESOLVED_CYCLE_QUESTION = ("The project has task design, task coding and task testing: design before coding and "
+                           "coding before testing and testing before design by the deadline. What is the order?")
+
+
+def test_composition_table_is_complete_and_correct():
+    relations = list(AllenRelation)
+    table = composition_masks()
+    meets, met_by = relations.index(AllenRelation.MEETS), relations.index(AllenRelation.MET_BY)
+    assert mask_to_relations(table[meets][met_by]) == {
+        AllenRelation.FINISHES, AllenRelation.FINISHED_BY, AllenRelation.EQUALS
+    }
+    assert all(row[j] for row in table for j in range(len(relations)))
+
+
+def test_relations_of_real_intervals_are_never_rejected():
+    rng = random.Random(1)
+    for _ in range(100):
+        intervals = []
+        for i in range(6):
+            start = rng.randint(0, 20)
+            intervals.append(TimeInterval(f"e{i}", start=start, end=rng.randint(start + 1, 21)))
+        solver = IncrementalConstraintSolver()
+        for _ in range(10):
+            x, y = rng.sample(intervals, 2)
+            assert solver.add_relation_checked(x.name, y.name, {AllenAlgebra.determine_relation(x, y)})
+
+
+def test_cycle_is_detected_and_rolled_back():
+    solver = IncrementalConstraintSolver()
+    for a, b in [("a", "b"), ("b", "c"), ("c", "d")]:
+        assert solver.add_relation_checked(a, b, {AllenRelation.BEFORE})
+    network, constraints = copy.deepcopy(solver._network), copy.deepcopy(solver.constraints)
+
+    assert not solver.add_relation_checked("d", "a", {AllenRelation.BEFORE})
+    assert solver.consistent
+    assert solver._network == network and solver.constraints == constraints
+    assert solver.rejected == [("d", "a", {AllenRelation.BEFORE})]
+
+    solver.add_single_relation("d", "a", AllenRelation.BEFORE)
+    assert not solver.propagate_constraints()
+    assert solver.conflict == ("d", "a", {AllenRelation.BEFORE})
+
+
+def test_cycle_between_unextracted_events_is_dropped():
+    # No events are extracted for these tasks, so entity resolution drops
+    # every relation of the cycle and there is nothing to contradict
+    llm = MockLLM(seed=1)
+    reasoner = HybridTemporalReasoner(llm_backend=llm)
+    result = reasoner.reason_stream(CYCLE_QUESTION, on_inconsistency=InconsistencyPolicy.CANCEL)
+
+    assert not result.verified_answer.startswith("Extraction stopped")
+    assert reasoner.stream_stats()["cancelled"] == 0
+    assert llm.decode_stats()["tokens_cancelled"] == 0
+    assert conversion_data(reasoner, result)["resolution"]["dropped_relations"] == 3
+
+
+def test_contradiction_cancels_stream():
+    llm = MockLLM(seed=1)
+    reasoner = HybridTemporalReasoner(llm_backend=llm)
+    result = reasoner.reason_stream(RESOLVED_CYCLE_QUESTION, on_inconsistency=InconsistencyPolicy.CANCEL)
+
+    assert result.verified_answer.startswith("Extraction stopped")
+    assert result.confidence == 0.0
+    assert reasoner.stream_stats()["cancelled"] == 1
+    assert llm.decode_stats()["tokens_cancelled"] > 0
+
+
+def test_continue_decodes_everything_and_reprompt_resamples():
+    llm = MockLLM(seed=1)
+    reasoner = HybridTemporalReasoner(llm_backend=llm)
+    reasoner.reason_stream(RESOLVED_CYCLE_QUESTION, on_inconsistency=InconsistencyPolicy.CONTINUE)
+    assert llm.decode_stats()["tokens_cancelled"] == 0
+
+    reasoner.reason_stream(RESOLVED_CYCLE_QUESTION, on_inconsistency=InconsistencyPolicy.REPROMPT, max_reprompts=2)
+    assert reasoner.stream_stats()["reprompted"] == 2
+
+
+class RelationsFirstLLM(MockLLM):
+    """Streams its document with the relations ahead of the events they refer to"""
+
+    def stream_extract(self, text, level=ExtractionLevel.LEVEL_1_EXTRACTION, token_chars=4):
+        document = self._respond(text, level).to_dict()
+        document = dict(relations=document.pop("relations"), **document)
+        data = json.dumps(document)
+        for i in range(0, len(data), token_chars):
+            yield data[i:i + token_chars]
+
+
+def conversion_data(reasoner, result):
+    chain = reasoner.provenance.chains[result.provenance_id]
+    return chain.get_nodes_by_type(ReasoningStep.SYMBOLIC_CONSTRAINT)[0].output_data["constraint"]
+
+
+def test_batch_check_uses_the_complete_table():
+    relations = list(AllenRelation)
+    table = composition_masks()
+    for i, r1 in enumerate(relations):
+        for j, r2 in enumerate(relations):
+            assert AllenAlgebra.compose(r1, r2) == mask_to_relations(table[i][j])
+
+    # a meets b, b met-by c allows a finishes c; the old partial table only allowed equals
+    constraints = {("a", "b"): {AllenRelation.MEETS}, ("b", "c"): {AllenRelation.MET_BY},
+                   ("a", "c"): {AllenRelation.FINISHES}}
+    solver = IncrementalConstraintSolver()
+    for (x, y), rels in constraints.items():
+        solver.add_constraint(x, y, rels)
+    assert AllenAlgebra.is_consistent(copy.deepcopy(constraints)) == solver.consistent == True
+
+    constraints[("a", "c")] = {AllenRelation.BEFORE}
+    assert not AllenAlgebra.is_consistent(constraints)
+
+
+def test_relations_streamed_before_their_events_are_kept():
+    question = ("A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday. "
+                "What is the order of events?")
+    batch = HybridTemporalReasoner(llm_backend=MockLLM(seed=0))
+    streamed = HybridTemporalReasoner(llm_backend=RelationsFirstLLM(seed=0))
+    expected, result = batch.reason(question), streamed.reason_stream(question)
+
+    assert conversion_data(streamed, result)["num_constraints"] == \
+        conversion_data(batch, expected)["num_constraints"] > 0
+    assert result.verified_answer == expected.verified_answer
+    assert result.used_symbolic == expected.used_symbolic
@@ -0,0 +1,36 @@
+import copy
+import pickle
+from dataclasses import asdict
+
+from hybrid_reasoner import HybridTemporalReasoner
+from provenance import LazyExplanation, ProvenanceTracker
+
+QUESTION = "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday."
+
+
+def test_copies_and_pickles_render_to_str():
+    result = HybridTemporalReasoner().reason(QUESTION)
+    assert isinstance(result.explanation, LazyExplanation)
+    text = str(result.explanation)
+
+    assert copy.copy(result.explanation) == text
+    assert copy.deepcopy(result).explanation == text
+    assert asdict(result)["explanation"] == text
+    restored = pickle.loads(pickle.dumps(result))
+    assert type(restored.explanation) is str and restored.explanation == text
+
+
+def test_private_attributes_do_not_render():
+    explanation = LazyExplanation.__new__(LazyExplanation)  # as copy/pickle build it
+    assert not hasattr(explanation, "__setstate__")
+    assert not hasattr(explanation, "_cache")
+
+
+def test_explanation_cache_is_bounded():
+    tracker = ProvenanceTracker(explanation_cache_size=2)
+    for i in range(5):
+        task_id = f"task_{i}"
+        with tracker.task(task_id, "q"):
+            tracker.end_task(task_id, "answer")
+        tracker.generate_explanation(task_id)
+    assert len(tracker._explanation_cache) == 2
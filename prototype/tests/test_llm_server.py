@@ -0,0 +1,80 @@
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from llm_interface import ExtractionLevel, MockLLM
+from llm_server import HTTPLLMBackend, LLMServer
+
+TEXT = "Task A must be completed before task B."
+
+
+def scripted_server(actions):
+    """Raw server taking one connection per action: "close" drops it unanswered, "reply" answers"""
+    listener = socket.create_server(("127.0.0.1", 0))
+    body = json.dumps(MockLLM(seed=0).extract_temporal_info(TEXT).to_dict()).encode("utf-8")
+    served = []
+
+    def serve():
+        for action in actions:
+            connection, _ = listener.accept()
+            connection.recv(65536)
+            served.append(action)
+            if action == "reply":
+                connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                                   b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+            connection.close()
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return f"http://127.0.0.1:{listener.getsockname()[1]}", served
+
+
+def test_connection_dropped_before_the_response_is_retried():
+    url, served = scripted_server(["close", "reply"])
+    client = HTTPLLMBackend(url, timeout=5)
+    try:
+        assert client.extract_temporal_info(TEXT).events
+    finally:
+        client.close()
+    assert served == ["close", "reply"]
+
+
+def test_timeouts_are_not_retried():
+    with LLMServer(latency=0.5) as server:
+        client = HTTPLLMBackend(server.url, timeout=0.1)
+        try:
+            with pytest.raises(TimeoutError):
+                client.extract_temporal_info(TEXT)
+            time.sleep(0.8)
+            assert server.requests_served == 1
+        finally:
+            client.close()
+
+
+def test_unknown_paths_are_rejected_before_the_latency():
+    with LLMServer(latency=2.0) as server:
+        client = HTTPLLMBackend(server.url)
+        try:
+            started = time.perf_counter()
+            with pytest.raises(RuntimeError, match="404"):
+                client._post("/nope", {"text": TEXT})
+            assert time.perf_counter() - started < 1.0
+        finally:
+            client.close()
+
+
+def test_close_closes_every_threads_connection():
+    with LLMServer() as server:
+        client = HTTPLLMBackend(server.url)
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            list(threads.map(lambda _: client.extract_temporal_info(TEXT, ExtractionLevel.LEVEL_2_ORDERING),
+                             range(16)))
+        connections = list(client._connections)
+        assert connections
+        client.close()
+    assert not client._connections
+    assert all(connection.sock is None for connection in connections)
@@ -0,0 +1,73 @@
+import llm_interface
+from llm_interface import ErrorModel, ExtractionLevel, LatencyModel, MockLLM
+
+ORDERING = ExtractionLevel.LEVEL_2_ORDERING
+TEXTS = [
+    "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday.",
+    "First, the team prepared the slides. Then, they held the meeting. Finally, they sent the email.",
+    "Task A must be completed before task B. Task B must be completed before task C.",
+] * 10
+
+
+def answers(llm, texts=TEXTS):
+    return [llm.extract_temporal_info(text, ORDERING).to_dict() for text in texts]
+
+
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm_interface.time, "sleep", delays.append)
+    return delays
+
+
+def test_seeded_errors_repeat_across_instances():
+    errors = ErrorModel(default_rate=0.5)
+    first = answers(MockLLM(seed=7, error_model=errors))
+    assert first == answers(MockLLM(seed=7, error_model=errors))
+    assert first != answers(MockLLM(seed=8, error_model=errors))
+    flagged = sum(bool((answer["metadata"] or {}).get("likely_error")) for answer in first)
+    assert 0 < flagged < len(first)
+
+
+def test_latency_does_not_change_which_answers_are_wrong(monkeypatch):
+    errors = ErrorModel(default_rate=0.5)
+    immediate = answers(MockLLM(seed=7, error_model=errors))
+    sleeps(monkeypatch)
+    slow = MockLLM(seed=7, error_model=errors, latency=LatencyModel(base_seconds=0.01, jitter_seconds=0.05))
+    assert answers(slow) == immediate
+
+
+def test_seeded_latencies_repeat(monkeypatch):
+    delays = sleeps(monkeypatch)
+    latency = LatencyModel(base_seconds=0.01, per_char_seconds=1e-5, jitter_seconds=0.05)
+    answers(MockLLM(seed=3, latency=latency))
+    first, delays[:] = list(delays), []
+    answers(MockLLM(seed=3, latency=latency))
+    assert delays == first
+    assert len(set(first)) > 1
+    assert all(0.01 <= delay <= 0.01 + 1e-5 * 100 + 0.05 for delay in first)
+
+
+def test_a_batch_pays_base_latency_once(monkeypatch):
+    delays = sleeps(monkeypatch)
+    MockLLM(latency=LatencyModel(base_seconds=0.2, per_char_seconds=0.001)).extract_batch(TEXTS[:3], ORDERING)
+    assert delays == [0.2 + 0.001 * sum(len(text) for text in TEXTS[:3])]
+
+
+def test_error_model_lookup_order():
+    model = ErrorModel(rates={("medical_timeline", ORDERING): 1.0, ("medical_timeline", None): 0.25},
+                       default_rate=0.1)
+    assert model.rate("medical_timeline", ORDERING) == 1.0
+    assert model.rate("medical_timeline", ExtractionLevel.LEVEL_1_EXTRACTION) == 0.25
+    assert model.rate("project_schedule", ORDERING) == 0.1
+    assert model.key() != ErrorModel(default_rate=0.1).key()
+
+
+def test_error_rates_of_zero_and_one():
+    always = MockLLM(seed=0, error_model=ErrorModel(rates={("medical_timeline", None): 1.0}))
+    response = always.extract_temporal_info(TEXTS[0], ORDERING)
+    assert response.metadata["likely_error"]
+    clean = MockLLM(seed=0, error_model=ErrorModel()).extract_temporal_info(TEXTS[0], ORDERING)
+    assert [r.relation for r in response.relations] != [r.relation for r in clean.relations]
+    assert not (clean.metadata or {}).get("likely_error")
+    # The classic accuracy model only corrupts level-3 duration calculations
+    assert answers(MockLLM("low", seed=0)) == answers(MockLLM("high", seed=0))
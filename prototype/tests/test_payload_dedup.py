@@ -0,0 +1,76 @@
+from provenance import CaptureConfig, CapturePolicy, ProvenanceTracker, ReasoningStep
+
+
+def record_task(tracker, task_id, confidence):
+    with tracker.task(task_id, "q"):
+        tracker.record_step(ReasoningStep.LLM_EXTRACTION, "extract", {"query": task_id},
+                            {"events": [task_id]}, confidence=confidence, metadata={"domain": "x"})
+        tracker.end_task(task_id, "answer")
+
+
+def record_shared(tracker, task_id):
+    with tracker.task(task_id, "q"):
+        tracker.record_step(ReasoningStep.LLM_EXTRACTION, "extract", {"query": "same question"},
+                            {"events": ["admission", "discharge"]}, metadata={"domain": "medical"})
+        tracker.end_task(task_id, "answer")
+
+
+def test_identical_payloads_are_stored_once():
+    tracker = ProvenanceTracker(deduplicate_payloads=True)
+    for i in range(4):
+        record_shared(tracker, f"task_{i}")
+
+    stats = tracker.dedup_stats()
+    assert stats["unique_blobs"] == 3
+    assert stats["total_refs"] == 12
+    assert stats["duplicate_refs"] == 9
+    assert stats["saved_bytes"] == 3 * stats["stored_bytes"]
+    first, last = tracker.chains["task_0"].nodes[0], tracker.chains["task_3"].nodes[0]
+    assert first.output_data is last.output_data
+    assert first.output_digest == last.output_digest
+
+
+def test_dedup_is_off_by_default():
+    tracker = ProvenanceTracker()
+    record_shared(tracker, "task_0")
+    assert tracker.blob_store is None
+    assert tracker.dedup_stats() == {}
+
+
+def test_archive_round_trip(tmp_path):
+    tracker = ProvenanceTracker(deduplicate_payloads=True)
+    for i in range(3):
+        record_shared(tracker, f"task_{i}")
+    path = str(tmp_path / "archive.json")
+    tracker.export_archive(path)
+
+    restored = ProvenanceTracker(deduplicate_payloads=True)
+    assert sorted(restored.import_archive(path)) == ["task_0", "task_1", "task_2"]
+    for task_id in ("task_0", "task_1", "task_2"):
+        assert restored.chains[task_id].to_dict() == tracker.chains[task_id].to_dict()
+    assert len(restored.blob_store) == 3
+
+
+def test_on_anomaly_stores_kept_payloads_once():
+    tracker = ProvenanceTracker(deduplicate_payloads=True,
+                                capture=CaptureConfig(policy=CapturePolicy.ON_ANOMALY))
+    record_task(tracker, "anomalous", confidence=0.1)
+
+    stats = tracker.dedup_stats()
+    assert stats["total_refs"] == 3  # input, output, metadata
+    assert stats["unique_blobs"] == 3
+    assert {} not in tracker.blob_store.blobs.values()
+    node = tracker.chains["anomalous"].nodes[0]
+    assert node.input_data == {"query": "anomalous"}
+    assert node.input_digest in tracker.blob_store
+
+
+def test_on_anomaly_drops_payloads_of_clean_tasks():
+    tracker = ProvenanceTracker(deduplicate_payloads=True,
+                                capture=CaptureConfig(policy=CapturePolicy.ON_ANOMALY))
+    record_task(tracker, "clean", confidence=0.9)
+
+    stats = tracker.dedup_stats()
+    assert stats["total_refs"] == 1  # metadata only
+    assert tracker.chains["clean"].nodes[0].input_digest is None
+    assert tracker.capture_counts["anomaly_dropped"] == 1
@@ -0,0 +1,76 @@
+from provenance import ProvenanceTracker, ReasoningStep
+from provenance_diff import diff_chains, diff_runs
+
+
+def record(tracker, task_id, relation="before", end=3, confidence=0.9, answer="A before B",
+           verify=True, question="Order A and B"):
+    with tracker.task(task_id, question):
+        tracker.record_step(ReasoningStep.LLM_EXTRACTION, "extract", {"query": question},
+                            {"relations": [{"event1": "A", "event2": "B", "relation": relation}]},
+                            confidence=confidence)
+        tracker.record_step(ReasoningStep.SYMBOLIC_SOLVING, "solve", {},
+                            {"solution": {"intervals": {"A": {"start": 0, "end": 1},
+                                                        "B": {"start": 2, "end": end}}}})
+        if verify:
+            tracker.record_step(ReasoningStep.VERIFICATION, "verify", {}, {"consistent": True})
+        tracker.end_task(task_id, answer)
+    return tracker.chains[task_id]
+
+
+def test_identical_chains_differ_only_in_ids_and_timing():
+    tracker = ProvenanceTracker()
+    diff = diff_chains(record(tracker, "old"), record(tracker, "new"))
+    assert diff.identical
+    assert diff.unchanged_nodes == 3
+    assert diff.to_text() == "DIFF old -> new\n  identical"
+
+
+def test_domain_changes_are_reported():
+    tracker = ProvenanceTracker()
+    old = record(tracker, "old")
+    new = record(tracker, "new", relation="after", end=5, confidence=0.4, answer="B before A")
+    diff = diff_chains(old, new)
+
+    assert diff.answer_changed
+    assert [(c.event1, c.event2, c.old_relation, c.new_relation) for c in diff.relation_changes] == \
+        [("A", "B", "before", "after")]
+    assert [(c.name, c.old["end"], c.new["end"]) for c in diff.interval_changes] == [("B", 3, 5)]
+    assert [d.key for d in diff.confidence_changes] == [("llm_extraction", 0)]
+    paths = [change.path for d in diff.node_diffs for change in d.changes]
+    assert "output_data.relations[0].relation" in paths
+    assert "output_data.solution.intervals.B.end" in paths
+    assert diff.summary()["unchanged_nodes"] == 1
+
+
+def test_added_and_removed_steps():
+    tracker = ProvenanceTracker()
+    diff = diff_chains(record(tracker, "old"), record(tracker, "new", verify=False))
+    assert [(d.key, d.status) for d in diff.node_diffs] == [(("verification", 0), "removed")]
+    assert not diff.relation_changes and not diff.interval_changes  # untouched steps are not recomputed
+    reverse = diff_chains(tracker.chains["new"], tracker.chains["old"])
+    assert [d.status for d in reverse.node_diffs] == ["added"]
+
+
+def test_runs_pair_by_question_and_report_unpaired_chains():
+    old, new = ProvenanceTracker(), ProvenanceTracker()
+    record(old, "q1", question="first")
+    record(old, "q2", question="second")
+    record(new, "n1", question="first", answer="changed")
+    record(new, "n3", question="third")
+
+    run_diff = diff_runs(old, new)
+    assert [(d.old_task_id, d.new_task_id) for d in run_diff.chain_diffs] == [("q1", "n1")]
+    assert run_diff.only_old == ["q2"] and run_diff.only_new == ["n3"]
+    assert run_diff.summary()["answer_changes"] == 1
+
+
+def test_repeated_questions_with_equal_start_times_pair_in_numeric_task_order():
+    old, new = ProvenanceTracker(), ProvenanceTracker()
+    for i in range(1, 13):
+        record(old, f"task_{i}", answer=f"answer {i}").start_time = "2024-01-01T00:00:00"
+        record(new, f"task_{i:02d}", answer=f"answer {i}").start_time = "2024-01-01T00:00:00"
+
+    run_diff = diff_runs(old, new)
+    assert len(run_diff.chain_diffs) == 12
+    assert run_diff.answer_changes == []
+    assert [d.old_task_id for d in run_diff.chain_diffs][:3] == ["task_1", "task_2", "task_3"]
@@ -0,0 +1,45 @@
+import os
+
+from provenance import ProvenanceTracker, ReasoningStep
+from provenance_export import BatchExplanationExporter
+
+
+def make_tracker(task_ids, description="q", answer="answer"):
+    tracker = ProvenanceTracker()
+    for task_id in task_ids:
+        with tracker.task(task_id, description):
+            tracker.record_step(ReasoningStep.LLM_EXTRACTION, "extract", {}, {})
+            tracker.end_task(task_id, answer)
+    return tracker
+
+
+def test_split_export_never_shares_files(tmp_path):
+    task_ids = ["task/1", "task_1", "Task_1", "task 1"]
+    exporter = BatchExplanationExporter(make_tracker(task_ids), workers=1)
+    report = exporter.export(str(tmp_path), task_ids=task_ids, split=True)
+
+    assert len({name.casefold() for name in report.files}) == len(task_ids)
+    assert os.path.join(str(tmp_path), "task_1.txt") in report.files
+    for task_id, filepath in zip(task_ids, report.files):
+        with open(filepath, encoding="utf-8") as f:
+            assert f"Task ID: {task_id}" in f.read()
+
+
+def test_bytes_written_counts_encoded_bytes(tmp_path):
+    exporter = BatchExplanationExporter(make_tracker(["t1"], description="Café résumé — ✓"), workers=1)
+    for format, split in [("text", False), ("html", False), ("html", True)]:
+        path = str(tmp_path / f"{format}-{split}")
+        report = exporter.export(path, format=format, split=split)
+        assert report.bytes_written == sum(os.path.getsize(f) for f in report.files) + (
+            os.path.getsize(os.path.join(path, "provenance.css")) if split else 0)
+
+
+def test_html_is_escaped(tmp_path):
+    tracker = make_tracker(["<t1>"], description="<script>alert(1)</script>", answer="a < b & c")
+    path = str(tmp_path / "report.html")
+    BatchExplanationExporter(tracker, workers=1).export(path, format="html")
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    assert "<script>" not in html and "&lt;script&gt;" in html
+    assert "a &lt; b &amp; c" in html
+    assert "&lt;t1&gt;" in html
@@ -0,0 +1,74 @@
+from provenance import ProvenanceTracker, ReasoningStep
+from provenance_query import ProvenanceQueryEngine
+
+
+def record_chain(tracker, task_id, length, parent=None):
+    """A linear chain of `length` steps; the first one depends on `parent`"""
+    step_ids = []
+    with tracker.task(task_id, "q"):
+        for i in range(length):
+            parents = [step_ids[-1]] if step_ids else ([parent] if parent else [])
+            step_ids.append(tracker.record_step(ReasoningStep.SYMBOLIC_PROPAGATION, f"step {i}", {}, {},
+                                                parent_ids=parents))
+        tracker.end_task(task_id, f"answer {task_id}")
+    return step_ids
+
+
+def test_refresh_only_scans_changed_chains():
+    tracker = ProvenanceTracker()
+    for i in range(3):
+        record_chain(tracker, f"task_{i}", 4)
+    engine = ProvenanceQueryEngine(tracker)
+    assert engine.refresh() == 12
+    assert engine.refresh() == 0
+    assert not engine._changes.take()
+
+    record_chain(tracker, "task_3", 2)
+    assert engine._changes.take() == {"task_3"}
+    engine._changes.add("task_3")
+    assert engine.refresh() == 2
+
+
+def test_closures_follow_incremental_growth():
+    tracker = ProvenanceTracker()
+    first = record_chain(tracker, "task_a", 3)
+    engine = ProvenanceQueryEngine(tracker)
+    assert [n.step_id for n in engine.descendants(first[0])] == first[1:]
+    assert [n.step_id for n in engine.ancestors(first[2])] == first[:2]
+
+    # A chain building on task_a's last step extends closures cached above
+    second = record_chain(tracker, "task_b", 2, parent=first[2])
+    assert [n.step_id for n in engine.descendants(first[0])] == first[1:] + second
+    assert [n.step_id for n in engine.ancestors(second[1])] == first + second[:1]
+    assert engine.depends_on(second[1], first[0])
+    assert not engine.depends_on(first[0], second[1])
+
+    report = engine.impact([first[1]])
+    assert report.summary() == {"sources": 1, "affected_steps": 3, "affected_tasks": 2}
+    assert report.affected_answers == {"task_a": "answer task_a", "task_b": "answer task_b"}
+
+
+def test_new_nodes_only_evict_connected_closures():
+    tracker = ProvenanceTracker()
+    first = record_chain(tracker, "task_a", 3)
+    other = record_chain(tracker, "task_b", 3)
+    engine = ProvenanceQueryEngine(tracker)
+    engine.descendants(first[0])
+    engine.descendants(other[0])
+    engine.ancestors(other[2])
+
+    record_chain(tracker, "task_c", 1, parent=first[2])
+    engine.refresh()
+    assert ("descendants", first[0]) not in engine._closures
+    assert ("descendants", other[0]) in engine._closures
+    assert ("ancestors", other[2]) in engine._closures
+
+
+def test_closure_cache_is_bounded():
+    tracker = ProvenanceTracker()
+    steps = record_chain(tracker, "task_a", 10)
+    engine = ProvenanceQueryEngine(tracker, closure_cache_size=4)
+    for step_id in steps:
+        engine.descendants(step_id)
+    assert len(engine._closures) == 4
+    assert [n.step_id for n in engine.descendants(steps[0])] == steps[1:]
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from provenance import AsyncProvenanceRecorder
+
+
+def test_first_sink_error_is_reraised_once():
+    applied = []
+
+    def sink(value):
+        if value < 0:
+            raise ValueError(f"bad event {value}")
+        applied.append(value)
+
+    recorder = AsyncProvenanceRecorder(sink)
+    for value in (1, -1, 2, -2):
+        recorder.submit((value,))
+    with pytest.raises(ValueError, match="bad event -1"):
+        recorder.flush()
+
+    assert applied == [1, 2]
+    assert len(recorder.errors) == 2
+    recorder.flush()  # already reported
+    recorder.close()
+
+
+def test_close_reraises_unreported_error():
+    recorder = AsyncProvenanceRecorder(lambda: 1 / 0)
+    recorder.submit(())
+    with pytest.raises(ZeroDivisionError):
+        recorder.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        recorder.submit(())
+
+
+def test_submit_racing_close_never_strands_events():
+    for _ in range(20):
+        applied = []
+        recorder = AsyncProvenanceRecorder(applied.append, max_queue_size=4)
+        accepted = []
+
+        def produce(worker):
+            for i in range(50):
+                try:
+                    recorder.submit(((worker, i),))
+                except RuntimeError:
+                    return
+                accepted.append((worker, i))
+
+        producers = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+        for producer in producers:
+            producer.start()
+        recorder.close()
+        for producer in producers:
+            producer.join()
+
+        done = threading.Thread(target=recorder.flush)
+        done.start()
+        done.join(timeout=5)
+        assert not done.is_alive()
+        assert sorted(applied) == sorted(accepted)
@@ -0,0 +1,62 @@
+import io
+
+from provenance import ProvenanceTracker
+from provenance_wire import WireDecoder, WireEncoder, decode_chains, encode_chains
+
+
+def make_chains(count):
+    tracker = ProvenanceTracker()
+    for i in range(count):
+        task_id = f"task_{i:04d}"
+        with tracker.task(task_id, f"Question number {i}"):
+            step = tracker.record_llm_extraction(
+                query=f"Query {i}", events=[{"name": f"event_{i}"}], relations=[], confidence=0.9
+            )
+            tracker.record_symbolic_constraint("constraint", {"interval": f"event_{i}"}, parent_ids=[step])
+            tracker.end_task(task_id, f"Answer {i}")
+    return list(tracker.chains.values())
+
+
+def test_stream_crossing_the_intern_cap_round_trips_with_bounded_tables():
+    chains = make_chains(60)
+    stream = io.BytesIO()
+    encoder = WireEncoder(stream, max_interned=40)
+    table_sizes = []
+    for chain in chains:
+        encoder.write_chain(chain)
+        table_sizes.append(len(encoder._strings))
+
+    assert encoder.table_resets > 5
+    assert max(table_sizes) < 40 + 20  # cap plus one chain's new strings
+
+    stream.seek(0)
+    decoder = WireDecoder(stream)
+    decoded = []
+    for chain in iter(decoder.read_chain, None):
+        decoded.append(chain)
+        assert len(decoder._strings) < 40 + 20
+    assert decoded == chains
+
+
+def test_default_cap_keeps_one_table():
+    chains = make_chains(10)
+    stream = io.BytesIO()
+    encoder = WireEncoder(stream)
+    encoder.write_chains(chains)
+    assert encoder.table_resets == 0
+    assert decode_chains(stream.getvalue()) == chains == decode_chains(encode_chains(chains))
+
+
+def test_timestamps_at_the_int64_boundary_round_trip():
+    boundary = ["2262-04-11T23:47:16.854775", "1677-09-21T00:12:43.145225",   # fit int64 nanos
+                "2262-04-11T23:47:16.854776", "1677-09-21T00:12:43.145224",   # just outside
+                "9999-12-31T23:59:59.999999", "0001-01-01T00:00:00"]
+    chains = make_chains(len(boundary))
+    for chain, timestamp in zip(chains, boundary):
+        chain.start_time = chain.end_time = timestamp
+        for node in chain.nodes:
+            node.timestamp = timestamp
+
+    decoded = decode_chains(encode_chains(chains))
+    assert decoded == chains
+    assert [chain.start_time for chain in decoded] == boundary
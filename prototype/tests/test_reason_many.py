@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+import hybrid_reasoner
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import MockLLM
+from solver_pool import propagate_network
+
+QUESTIONS = [
+    "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday. "
+    "What is the order of events?",
+    "First, the team prepared the presentation. Then, they held the meeting. Finally, they sent the "
+    "follow-up email. What is the order of events?",
+    "The meeting lasted 2 hours, followed by a 30 minute break. What was the total time?",
+]
+
+
+class SlowFirstLLM(MockLLM):
+    """MockLLM that takes longest on questions mentioning surgery"""
+
+    def extract_temporal_info(self, text, level=None):
+        time.sleep(0.2 if "surgery" in text else 0.01)
+        return super().extract_temporal_info(text, level)
+
+    async def aextract(self, text, level=None):
+        await asyncio.sleep(0.2 if "surgery" in text else 0.01)
+        return self._respond(text, level)
+
+
+def test_results_match_reason_and_name_their_chains():
+    expected = sorted(HybridTemporalReasoner(llm_accuracy="high").reason(q).verified_answer for q in QUESTIONS * 4)
+    reasoner = HybridTemporalReasoner(llm_accuracy="high")
+    results = list(reasoner.reason_many(QUESTIONS * 4, concurrency=4))
+
+    assert sorted(r.verified_answer for r in results) == expected
+    assert len({r.provenance_id for r in results}) == 12
+    reasoner.provenance.flush()
+    for result in results:
+        chain = reasoner.provenance.chains[result.provenance_id]
+        assert chain.final_answer == result.verified_answer and chain.nodes
+
+
+def test_results_stream_back_in_completion_order():
+    reasoner = HybridTemporalReasoner(llm_backend=SlowFirstLLM(accuracy_level="high"))
+    results = list(reasoner.reason_many(QUESTIONS, concurrency=3, solver_processes=0))
+    assert "surgery" in results[-1].question and "surgery" not in results[0].question
+
+
+def test_questions_are_read_lazily():
+    read = []
+
+    def questions():
+        for i in range(40):
+            read.append(i)
+            yield QUESTIONS[i % 3]
+
+    reasoner = HybridTemporalReasoner(llm_accuracy="high")
+    for count, _ in enumerate(reasoner.reason_many(questions(), concurrency=2, solver_processes=0), 1):
+        assert len(read) <= count + 4
+    assert count == 40
+
+
+def test_async_variant_overlaps_extractions():
+    reasoner = HybridTemporalReasoner(llm_backend=SlowFirstLLM(accuracy_level="high"))
+
+    async def collect():
+        return [result async for result in reasoner.areason_many(QUESTIONS * 5, concurrency=15)]
+
+    started = time.perf_counter()
+    results = asyncio.run(collect())
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 15 and "surgery" in results[-1].question
+    assert elapsed < 5 * 0.2  # the five slow extractions ran concurrently
+
+
+class RecordingPool:
+    """SolverPool stand-in recording the threads it starts and stops on"""
+
+    def __init__(self, processes):
+        self.threads = [threading.current_thread()]
+        created.append(self)
+
+    def solve(self, constraints):
+        return propagate_network(constraints)
+
+    def close(self):
+        self.threads.append(threading.current_thread())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+created = []
+
+
+def test_batches_solve_inline_by_default(monkeypatch):
+    created.clear()
+    monkeypatch.setattr(hybrid_reasoner, "SolverPool", RecordingPool)
+    reasoner = HybridTemporalReasoner(llm_accuracy="high")
+    assert len(list(reasoner.reason_many(QUESTIONS))) == 3
+
+    async def collect():
+        return [result async for result in reasoner.areason_many(QUESTIONS)]
+
+    assert len(asyncio.run(collect())) == 3
+    assert created == []
+
+
+def test_async_batch_pool_starts_and_stops_off_the_loop(monkeypatch):
+    created.clear()
+    monkeypatch.setattr(hybrid_reasoner, "SolverPool", RecordingPool)
+    reasoner = HybridTemporalReasoner(llm_accuracy="high")
+
+    async def collect():
+        results = [result async for result in reasoner.areason_many(QUESTIONS, solver_processes=2)]
+        return results, threading.current_thread()
+
+    results, loop_thread = asyncio.run(collect())
+    expected = sorted(reasoner.reason(q).verified_answer for q in QUESTIONS)
+    assert sorted(r.verified_answer for r in results) == expected
+    (pool,) = created
+    assert len(pool.threads) == 2 and loop_thread not in pool.threads
@@ -0,0 +1,63 @@
+import pytest
+
+from caching import LRUCache, fingerprint
+from extraction_cache import CachedLLMBackend, ExtractionCache
+from extraction_scheduler import BatchingExtractionScheduler
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import ErrorModel, MockLLM
+from llm_server import HTTPLLMBackend
+
+QUESTION = "Task A must be completed before task B. What is the order?"
+
+
+def cache_key(llm, **kwargs):
+    return HybridTemporalReasoner(llm_backend=llm, result_cache=LRUCache(), **kwargs)._cache_key(
+        QUESTION, HybridTemporalReasoner()._detect_reasoning_level(QUESTION))
+
+
+def test_fingerprint_keeps_case_and_collapses_whitespace():
+    assert fingerprint("  Task A   before task B ") == fingerprint("Task A before task B")
+    assert fingerprint("Task A before task B") != fingerprint("task a before task b")
+
+
+def test_mock_backends_with_different_answers_do_not_share_keys():
+    keys = {
+        cache_key(MockLLM(seed=1)),
+        cache_key(MockLLM(seed=2)),
+        cache_key(MockLLM(seed=1, error_model=ErrorModel(default_rate=0.5))),
+        cache_key(MockLLM("low", seed=1)),
+    }
+    assert len(keys) == 4
+    assert cache_key(MockLLM(seed=1)) == cache_key(MockLLM(seed=1))
+
+
+def test_wrappers_take_the_identity_of_their_backend():
+    cached = [CachedLLMBackend(MockLLM(seed=seed), ExtractionCache()) for seed in (1, 2)]
+    assert cache_key(cached[0]) != cache_key(cached[1])
+    assert cache_key(cached[0]) == cache_key(MockLLM(seed=1))
+
+    scheduler = BatchingExtractionScheduler(MockLLM(seed=3))
+    try:
+        assert cache_key(scheduler) == cache_key(MockLLM(seed=3))
+    finally:
+        scheduler.close()
+
+
+def test_http_backends_are_keyed_by_server():
+    backends = [HTTPLLMBackend("http://127.0.0.1:8001"), HTTPLLMBackend("http://127.0.0.1:8002"),
+                HTTPLLMBackend("http://127.0.0.1:8001", backend_version="model-v2")]
+    try:
+        assert len({cache_key(backend) for backend in backends}) == 3
+    finally:
+        for backend in backends:
+            backend.close()
+
+
+def test_result_cache_needs_a_backend_version():
+    class AnonymousLLM:
+        def extract_temporal_info(self, text, level=None):
+            return MockLLM(seed=0).extract_temporal_info(text, level)
+
+    with pytest.raises(ValueError):
+        HybridTemporalReasoner(llm_backend=AnonymousLLM(), result_cache=LRUCache())
+    assert "anon-v1" in cache_key(AnonymousLLM(), backend_version="anon-v1")
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from llm_interface import ExtractionLevel, LLMResponse, MockLLM, TemporalRelation
+from self_consistency import SelfConsistencyBackend, VoteTally, canonical_relation
+
+LEVEL = ExtractionLevel.LEVEL_2_ORDERING
+
+
+def response(*relations):
+    return LLMResponse(events=[], relations=[TemporalRelation(*r) for r in relations],
+                       raw_answer="", extraction_level=LEVEL, metadata={"confidence": 0.8})
+
+
+def test_opposite_spellings_are_one_vote_key():
+    assert canonical_relation(TemporalRelation("b", "a", "after")) == \
+        canonical_relation(TemporalRelation("a", "b", "before"))
+
+
+def test_minority_relation_contradicting_majority_is_dropped():
+    tally = VoteTally()
+    for _ in range(3):
+        tally.add(response(("a", "b", "before"), ("b", "c", "before")))
+    tally.add(response(("c", "a", "before")))  # contradicts a < b < c
+
+    merged = tally.resolve(LEVEL)
+    assert [(r.event1, r.relation, r.event2, r.confidence) for r in merged.relations] == [
+        ("a", "before", "b", 0.75), ("b", "before", "c", 0.75)
+    ]
+    assert merged.metadata["dropped_relations"] == ["a after c (1 votes)"]
+
+
+def test_min_votes_filters_unsupported_relations():
+    tally = VoteTally()
+    tally.add(response(("a", "b", "before")))
+    tally.add(response(("a", "b", "before"), ("x", "y", "meets")))
+    assert [r.event1 for r in tally.resolve(LEVEL, min_votes=2).relations] == ["a"]
+
+
+def test_backend_votes_across_seeded_samplers():
+    text = "The patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday."
+    with SelfConsistencyBackend.from_seeds(5) as voter:
+        merged = voter.extract_temporal_info(text, LEVEL)
+        assert merged.metadata["samples"] == 5
+        assert {(r.event1, r.event2) for r in merged.relations} == {("admission", "surgery"), ("surgery", "discharge")}
+        assert asyncio.run(voter.aextract(text, LEVEL)).relations == merged.relations
+        assert len(voter.extract_batch([text, text], LEVEL)) == 2
+
+
+def test_short_sampler_batch_is_an_error():
+    class ShortBatchLLM(MockLLM):
+        def extract_batch(self, texts, level=None):
+            return super().extract_batch(texts[:-1], level)
+
+    with SelfConsistencyBackend([MockLLM(seed=0), ShortBatchLLM(seed=1)]) as voter:
+        with pytest.raises(RuntimeError, match="1 responses for 2 texts"):
+            voter.extract_batch(["first text", "second text"], LEVEL)
+
+
+def test_identity_covers_min_votes_and_every_sampler():
+    assert SelfConsistencyBackend.from_seeds(3).backend_version != SelfConsistencyBackend.from_seeds(3, base_seed=1).backend_version
+    assert SelfConsistencyBackend.from_seeds(3).backend_version != \
+        SelfConsistencyBackend.from_seeds(3, min_votes=2).backend_version
+
+    class AnonymousLLM:
+        def extract_temporal_info(self, text, level=None):
+            return MockLLM(seed=0).extract_temporal_info(text, level)
+
+    assert SelfConsistencyBackend([MockLLM(seed=0), AnonymousLLM()]).backend_version is None
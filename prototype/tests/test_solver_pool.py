@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import MockLLM
+from solver_pool import EDGE_PRESENT, SolverPool, decode_network, encode_network, propagate_matrix
+from temporal_core import AllenAlgebra, AllenRelation
+
+B, A, M = AllenRelation.BEFORE, AllenRelation.AFTER, AllenRelation.MEETS
+
+
+def random_network(rng, n):
+    names = [f"e{i}" for i in range(n)]
+    constraints = {}
+    for _ in range(rng.randint(1, n * (n - 1))):
+        first, second = rng.sample(names, 2)
+        constraints[(first, second)] = set(rng.sample(list(AllenRelation), rng.choice([1, 2, 3, 6, 13])))
+    return constraints
+
+
+def test_matrix_encoding_keeps_both_orientations():
+    constraints = {("b", "a"): {A}, ("a", "b"): {B, M}, ("b", "c"): {B}}
+    names, matrix = encode_network(constraints)
+
+    assert names == ["a", "b", "c"]
+    assert all(entry & EDGE_PRESENT for entry in (matrix[1], matrix[3], matrix[5]))
+    assert matrix[2] == matrix[6] == 0
+    assert decode_network(constraints, names, matrix) == constraints
+
+
+def test_mask_propagation_matches_is_consistent():
+    rng = random.Random(7)
+    for _ in range(500):
+        constraints = random_network(rng, rng.randint(2, 8))
+        legacy = {key: set(value) for key, value in constraints.items()}
+        names, matrix = encode_network(constraints)
+
+        consistent = propagate_matrix(matrix, len(names))
+        assert consistent == AllenAlgebra.is_consistent(legacy)
+        if consistent:
+            assert decode_network(constraints, names, matrix) == legacy
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with SolverPool(processes=2, inline_below=5) as pool:
+        yield pool
+
+
+def test_pool_solves_large_networks_in_workers_and_small_ones_inline(pool):
+    rng = random.Random(11)
+    before = pool.stats()
+    for n in (3, 10, 10, 3):
+        constraints = random_network(rng, n)
+        legacy = {key: set(value) for key, value in constraints.items()}
+        consistent, refined = pool.solve(constraints)
+        assert consistent == AllenAlgebra.is_consistent(legacy)
+        if consistent:
+            assert refined == legacy
+    after = pool.stats()
+    assert after["pooled"] - before["pooled"] == 2
+    assert after["inline"] - before["inline"] == 2
+
+
+def test_reasoner_with_pool_answers_as_without(pool):
+    question = ("The project has task design, task coding, task review, task testing and task release: "
+                "design before coding and coding before review and review before testing and testing "
+                "before release by the deadline. What is the order?")
+    expected = HybridTemporalReasoner(llm_backend=MockLLM(seed=2)).reason(question)
+    pooled_reasoner = HybridTemporalReasoner(llm_backend=MockLLM(seed=2), solver_pool=pool)
+    before = pool.stats()["pooled"]
+    result = pooled_reasoner.reason(question)
+
+    assert result.verified_answer == expected.verified_answer
+    assert pool.stats()["pooled"] == before + 1
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from hybrid_reasoner import HybridTemporalReasoner
+from llm_interface import MockLLM
+from provenance import LatencyHistogram, ProvenanceChain, ProvenanceTracker, ReasoningStep
+
+QUESTION = ("A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged "
+            "on Friday. What is the order of events?")
+
+
+def test_histogram_buckets_are_powers_of_two():
+    histogram = LatencyHistogram()
+    for duration in (0, 1, 2, 3, 1000, 1024):
+        histogram.add(duration)
+    # bucket b holds [2^(b-1), 2^b)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[1] == 1
+    assert histogram.counts[2] == 2
+    assert histogram.counts[10] == 1 and histogram.counts[11] == 1
+
+
+def test_histogram_quantiles_stay_within_the_bucket_and_observed_range():
+    histogram = LatencyHistogram()
+    durations = list(range(1_000_000, 2_000_000, 1000))  # 1-2 ms, uniform
+    for duration in durations:
+        histogram.add(duration)
+
+    for q in (0.1, 0.5, 0.9):
+        exact = durations[int(q * len(durations)) - 1]
+        estimate = histogram.quantile(q)
+        # Every estimate lies in the exact value's power-of-two bucket
+        assert exact.bit_length() == int(estimate).bit_length()
+    assert histogram.quantile(0.0) >= min(durations)
+    assert histogram.quantile(1.0) == max(durations)
+
+    summary = histogram.to_dict()
+    assert summary["count"] == len(durations)
+    assert summary["min_ms"] == pytest.approx(1.0) and summary["max_ms"] == pytest.approx(1.999)
+    assert sum(summary["buckets"].values()) == len(durations)
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_steps_are_timed_from_started_ns_to_recording():
+    tracker = ProvenanceTracker()
+    with tracker.task("t", "q"):
+        started = time.perf_counter_ns()
+        time.sleep(0.01)
+        tracker.record_step(ReasoningStep.SYMBOLIC_SOLVING, "solve", {}, {}, started_ns=started)
+        tracker.record_step(ReasoningStep.SYMBOLIC_SOLVING, "solve again", {}, {})
+        tracker.end_task("t", "answer")
+
+    slow, instant = tracker.chains["t"].nodes
+    assert slow.start_ns == started and slow.duration_ms >= 10
+    assert instant.duration_ns == 0
+    assert tracker.get_stage_latencies("t") == {"solving": pytest.approx(slow.duration_ms)}
+    assert tracker.chains["t"].total_latency_ns() == instant.end_ns - slow.start_ns
+
+
+def test_timings_survive_serialization():
+    tracker = ProvenanceTracker()
+    with tracker.task("t", "q"):
+        tracker.record_step(ReasoningStep.VERIFICATION, "verify", {}, {}, started_ns=time.perf_counter_ns())
+        tracker.end_task("t", "answer")
+    restored = ProvenanceChain.from_dict(tracker.chains["t"].to_dict())
+    assert restored.stage_latencies() == tracker.chains["t"].stage_latencies()
+    assert ProvenanceChain("t", "q", "2024-01-01T00:00:00").total_latency_ns() is None
+
+
+def test_reasoner_reports_every_pipeline_stage():
+    reasoner = HybridTemporalReasoner(llm_backend=MockLLM("high", seed=0))
+    for _ in range(3):
+        reasoner.reason(QUESTION)
+
+    for task_id in reasoner.provenance.chains:
+        latencies = reasoner.provenance.get_stage_latencies(task_id)
+        assert {"llm_extraction", "conversion", "solving", "verification"} <= set(latencies)
+        assert all(ms >= 0 for ms in latencies.values())
+    histograms = reasoner.provenance.latency_histogram()
+    assert histograms["llm_extraction"]["count"] == 3
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from llm_interface import ExtractionLevel, LLMResponse, MockLLM, TemporalEvent, TemporalRelation
+from structured_output import (
+    StreamingResponseParser, StructuredOutputError, parse_response, parse_stream
+)
+
+ORDERING = ExtractionLevel.LEVEL_2_ORDERING
+TEXT = "A patient was admitted on Monday, underwent surgery on Tuesday, and was discharged on Friday."
+
+# Escapes, unicode, nested values and numbers in every position a split can hit
+TRICKY = json.dumps({
+    "events": [
+        {"name": "admission", "description": 'said "hi" \\ left {early} [really]', "start_time": -1.5e3},
+        {"name": "café visit", "description": "line\nbreak\ttab ☃", "tags": ["a", {"b": [1, 2]}]},
+    ],
+    "relations": [{"event1": "admission", "event2": "café visit", "relation": "before", "confidence": 0.875}],
+    "raw_answer": "admission, then café \"visit\"",
+    "extraction_level": 2,
+    "metadata": {"events": [{"name": "not an event"}], "confidence": 0.9}
+})
+
+
+def fed_in(chunks):
+    parser = StreamingResponseParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return parser, items
+
+
+def test_every_two_way_split_gives_the_non_streamed_result():
+    expected = parse_response(TRICKY)
+    assert [event.name for event in expected.events] == ["admission", "café visit"]
+    assert expected.relations[0].confidence == 0.875
+    for split in range(len(TRICKY) + 1):
+        parser, items = fed_in([TRICKY[:split], TRICKY[split:]])
+        assert parser.finish().to_dict() == expected.to_dict(), split
+        assert items == expected.events + expected.relations
+
+
+def test_character_stream_of_a_mock_response_round_trips():
+    response = MockLLM(seed=1).extract_temporal_info(TEXT, ORDERING)
+    document = json.dumps(response.to_dict())
+    parser, items = fed_in(document)
+    assert parser.finish().to_dict() == response.to_dict()
+    assert len(items) == len(response.events) + len(response.relations)
+
+    tokens = list(MockLLM(seed=1).stream_extract(TEXT, ORDERING))
+    assert len(tokens) > 1
+    parser, _ = fed_in(tokens)
+    assert parser.finish(ORDERING).to_dict() == response.to_dict()
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = StreamingResponseParser()
+    assert parser.feed('{"events": [{"name": "a"') == []
+    assert parser.feed('}, {"na') == [TemporalEvent("a", "")]
+    assert parser.feed('me": "b"}], "relations": [{"event1": "a", "event2": "b", "relation": "before"}') == \
+        [TemporalEvent("b", ""), TemporalRelation("a", "b", "before", 1.0)]
+    assert not parser.complete
+    parser.feed("]}")
+    assert parser.complete
+
+
+def test_prose_and_code_fences_around_the_object_are_ignored():
+    text = 'Sure! Here it is:\n```json\n' + TRICKY + '\n```\nLet me know {if} you need more.'
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    parser, items = fed_in(chunks)
+    assert parser.complete
+    assert parser.finish().to_dict() == parse_response(TRICKY).to_dict()
+    assert parser.feed('{"events": [{"name": "late"}]}') == []
+    assert list(parse_stream(chunks)) == items
+
+
+def test_malformed_elements_are_skipped_and_reported():
+    document = ('{"events": [{"name": "a"}, {"description": "no name"}, {"name": "b"}], '
+                '"relations": [{"event1": "a", "relation": "before"}, '
+                '{"event1": "a", "event2": "b", "relation": "meets", "confidence": "high"}]}')
+    parser, items = fed_in([document])
+    assert [item.name for item in items] == ["a", "b"]
+    assert len(parser.errors) == 3
+    assert parser.errors[0].startswith("events:") and parser.errors[1].startswith("relations:")
+    assert parser.finish() == LLMResponse(items, [], "", ExtractionLevel.LEVEL_1_EXTRACTION, {})
+
+
+@pytest.mark.parametrize("text", [
+    '{"events": [{"name": "a"}], "raw_answer": "cut off',   # truncated inside a string
+    '{"events": [{"name": "a"}]',                            # truncated between keys
+    'no JSON at all',
+    '{"events": [{"name": "a"}]]}',                          # closes early with a stray bracket
+    '{"events": [{"name": "a"}], "raw_answer": tru}',       # invalid literal
+])
+def test_invalid_documents_fail_in_finish(text):
+    parser = StreamingResponseParser()
+    parser.feed(text)
+    with pytest.raises(StructuredOutputError):
+        parser.finish()
+
@@ -0,0 +1,59 @@
+import re
+
+from llm_interface import MockLLM, TemplateDispatcher, TextView
+from test_cases import TEST_CASES
+
+
+def regex_dispatch(templates, text):
+    """The dispatch TemplateDispatcher replaced: one re.search per template, in order"""
+    for name, template in templates.items():
+        if re.search(template["pattern"], text.lower()):
+            return name
+    return None
+
+
+EDGE_CASES = [
+    "",
+    "The patient was discharged, then admitted.",               # keywords out of order
+    "The patient was admitted\nand later discharged.",          # split across lines
+    "Patient admitted.\nPatient admitted and discharged.",      # match on a later line
+    "First we ate, then we slept, and finally we left.",
+    "Finally, then, first.",
+    "The Project has a DEADLINE on Friday.",                    # case
+    "The workshop lasted 3 hours.",
+    "It lasted\n3 hours.",
+    "The talks ran simultaneously with the demos.",
+    "How long did the surgery take? Recovery took weeks.",      # several templates match
+    "Nothing temporal here.",
+]
+
+
+def texts():
+    for case in TEST_CASES:
+        yield case.question
+        yield f"{case.context} {case.question}"
+        yield f"{case.context}\n{case.question}"
+    yield from EDGE_CASES
+
+
+def test_compiled_dispatch_matches_the_regex_dispatch():
+    templates = MockLLM(seed=0).response_templates
+    dispatcher = TemplateDispatcher(templates)
+    matched = set()
+    for text in texts():
+        expected = regex_dispatch(templates, text)
+        assert dispatcher.match(TextView(text)) == expected, text
+        matched.add(expected)
+    assert matched == set(templates) | {None}
+
+
+def test_patterns_with_other_regex_syntax_fall_back_to_compiled_regexes():
+    templates = {
+        "dated": {"pattern": r"\d{4}-\d{2}-\d{2}"},
+        "plain": {"pattern": r"meeting.*room"},
+        "optional": {"pattern": r"colou?r.*change"},
+    }
+    dispatcher = TemplateDispatcher(templates)
+    for text in ["Meeting on 2024-01-05 in room 4", "meeting in room 4", "The color will change",
+                 "The colour\nwill change", "no match"]:
+        assert dispatcher.match(TextView(text)) == regex_dispatch(templates, text), text